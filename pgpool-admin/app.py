@@ -1,31 +1,52 @@
 import os
-from flask import Flask, render_template, jsonify, request, redirect, url_for, session
+from flask import Flask, Response, stream_with_context, render_template, jsonify, request, redirect, url_for, session, g, has_app_context
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from datetime import datetime, timedelta
+from decimal import Decimal
 from collections import defaultdict, Counter
 import hashlib
+import heapq
 import re
-import random
 from functools import wraps
+from itertools import chain
 from werkzeug.security import check_password_hash, generate_password_hash
 from cluster_monitor import cluster_monitor
+from connection_pool import pools
+from snapshot_collector import SnapshotCollector
+from json_provider import FastJSONProvider, compress_response
+from rate_engine import RateEngine
+from resource_collector import read_host_counters, host_resources
+from statement_history import StatementHistory, parse_window, parse_time
+from query_cache import QueryCache
+from insight_checks import InsightRunner
+from backend_fanout import BackendFanOut, succeeded, merge_rows
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-here-change-in-production')
+app.json = FastJSONProvider(app)
 
 # Initialize Flask-Login
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
+# Background collector; API handlers serve its snapshots instead of querying per request
+snapshots = SnapshotCollector(context_factory=app.app_context)
+
+# Slowly changing catalog query results, refreshed in the background once their TTL expires
+query_cache = QueryCache(max_entries=int(os.environ.get('QUERY_CACHE_MAX_ENTRIES', 128)))
+
 # Configuration from environment variables
 PGPOOL_HOST = os.environ.get('PGPOOL_HOST', 'pgpool')
 PGPOOL_PORT = os.environ.get('PGPOOL_PORT', '5432')
 PGPOOL_USER = os.environ.get('PGPOOL_USER', 'appuser')
 PGPOOL_PASSWORD = os.environ.get('PGPOOL_PASSWORD', '')
 PGPOOL_DB = os.environ.get('PGPOOL_DB', 'appdb')
+MASTER_HOST = os.environ.get('MASTER_HOST', 'pg-master')
+MASTER_PORT = os.environ.get('MASTER_PORT', '6435')
+STREAM_KEEPALIVE = int(os.environ.get('STREAM_KEEPALIVE', 15))
 
 # Admin credentials from environment
 ADMIN_USERNAME = os.environ.get('PGPOOL_ADMIN_USERNAME', 'admin')
@@ -46,36 +67,107 @@ def load_user(username):
         return User(username)
     return None
 
+def checkout_connection(pool_name, host, port):
+    """Check out a pooled connection; within a request it is returned at teardown if not closed"""
+    conn = pools.getconn(
+        pool_name,
+        host=host,
+        port=port,
+        user=PGPOOL_USER,
+        password=PGPOOL_PASSWORD,
+        database=PGPOOL_DB,
+        cursor_factory=RealDictCursor
+    )
+    if has_app_context():
+        g.setdefault('pooled_connections', []).append(conn)
+    return conn
+
+@app.teardown_appcontext
+def release_connections(exception=None):
+    """Return connections a handler left checked out, e.g. after an exception"""
+    for conn in g.pop('pooled_connections', []):
+        conn.close()
+
 def get_db_connection():
-    """Create a database connection to PgPool"""
+    """Get a pooled database connection to PgPool"""
     try:
-        return psycopg2.connect(
-            host=PGPOOL_HOST,
-            port=PGPOOL_PORT,
-            user=PGPOOL_USER,
-            password=PGPOOL_PASSWORD,
-            database=PGPOOL_DB,
-            cursor_factory=RealDictCursor
-        )
+        return checkout_connection('pgpool', PGPOOL_HOST, PGPOOL_PORT)
     except Exception as e:
         app.logger.error(f"Database connection error: {str(e)}")
         raise
 
 def get_master_connection():
-    """Create a direct connection to master"""
+    """Get a pooled direct connection to master"""
     try:
-        return psycopg2.connect(
-            host='pg-master',
-            port='6435',
-            user=PGPOOL_USER,
-            password=PGPOOL_PASSWORD,
-            database=PGPOOL_DB,
-            cursor_factory=RealDictCursor
-        )
+        return checkout_connection('master', MASTER_HOST, MASTER_PORT)
     except Exception as e:
         app.logger.error(f"Master connection error: {str(e)}")
         raise
 
+def get_backend_connection(host, port):
+    """Get a pooled direct connection to a backend node"""
+    try:
+        return checkout_connection(f"backend:{host}:{port}", host, port)
+    except Exception as e:
+        app.logger.error(f"Backend {host}:{port} connection error: {str(e)}")
+        raise
+
+def snapshot_payload(snapshot):
+    """API response body for a snapshot, shared by the JSON endpoints and the event stream"""
+    if snapshot['error'] is not None:
+        return {'status': 'error', 'message': snapshot['error']}
+    
+    return {
+        'status': 'success',
+        'data': snapshot['data'],
+        'version': snapshot['version'],
+        'timestamp': snapshot['collected_at']
+    }
+
+def snapshot_response(name):
+    """Serve a data set from its latest background snapshot"""
+    try:
+        snapshot = snapshots.get(name)
+    except Exception as e:
+        app.logger.error(f"Error getting {name} snapshot: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    
+    if snapshot['error'] is not None:
+        return jsonify(snapshot_payload(snapshot)), 500
+    
+    # Version and content digest double as ETag, so revalidation skips serialization entirely.
+    # The version is in the body too; only the timestamp may lag after a 304, as a weak ETag allows.
+    etag = f"{name}-{snapshot['version']}-{snapshot['digest']}"
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(snapshot_payload(snapshot))
+    response.set_etag(etag, weak=True)
+    return response
+
+# after_request hooks run in reverse registration order, so this compresses
+# the body only after conditional_response has hashed it for the ETag
+@app.after_request
+def compress_api_response(response):
+    """Compress large API responses with brotli or gzip"""
+    if request.path.startswith('/api/'):
+        compress_response(response, request.accept_encodings)
+    return response
+
+@app.after_request
+def conditional_response(response):
+    """Give JSON API responses an ETag and answer matching If-None-Match with 304"""
+    if (request.method == 'GET' and request.path.startswith('/api/') and response.status_code == 200
+            and response.mimetype == 'application/json'):
+        if response.get_etag()[0] is None:
+            response.add_etag(weak=True)
+        # Browsers must revalidate instead of reusing a stale payload
+        response.headers['Cache-Control'] = 'no-cache'
+        response.make_conditional(request)
+    elif response.status_code == 304:
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 def normalize_query(query):
     """Normalize query for pattern matching"""
     # Remove values from WHERE clauses
@@ -176,131 +268,126 @@ def cluster_status():
     """Cluster status monitoring page"""
     return render_template('cluster-status.html', username=current_user.id)
 
+def collect_pool_nodes():
+    """Collect pool nodes status"""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute("SHOW POOL_NODES;")
+    nodes = cur.fetchall()
+    cur.close()
+    conn.close()
+    return nodes
+
 @app.route('/api/pool_nodes')
 @login_required
 def get_pool_nodes():
     """Get pool nodes status"""
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SHOW POOL_NODES;")
-        nodes = cur.fetchall()
-        cur.close()
-        conn.close()
-        return jsonify({'status': 'success', 'data': nodes})
-    except Exception as e:
-        app.logger.error(f"Error getting pool nodes: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+    return snapshot_response('pool_nodes')
+
+def collect_pool_status():
+    """Collect pool status"""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute("SHOW POOL_STATUS;")
+    status = cur.fetchall()
+    cur.close()
+    conn.close()
+    return status
 
 @app.route('/api/pool_status')
 @login_required
 def get_pool_status():
     """Get pool status"""
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SHOW POOL_STATUS;")
-        status = cur.fetchall()
-        cur.close()
-        conn.close()
-        return jsonify({'status': 'success', 'data': status})
-    except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+    return snapshot_response('pool_status')
+
+def collect_pool_processes():
+    """Collect pool processes"""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute("SHOW POOL_PROCESSES;")
+    processes = cur.fetchall()
+    cur.close()
+    conn.close()
+    return processes
 
 @app.route('/api/pool_processes')
 @login_required
 def get_pool_processes():
     """Get pool processes"""
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SHOW POOL_PROCESSES;")
-        processes = cur.fetchall()
-        cur.close()
-        conn.close()
-        return jsonify({'status': 'success', 'data': processes})
-    except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+    return snapshot_response('pool_processes')
+
+def collect_pool_pools():
+    """Collect pool pools (connection info)"""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute("SHOW POOL_POOLS;")
+    pool_pools = cur.fetchall()
+    cur.close()
+    conn.close()
+    return pool_pools
 
 @app.route('/api/pool_pools')
 @login_required
 def get_pool_pools():
     """Get pool pools (connection info)"""
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SHOW POOL_POOLS;")
-        pools = cur.fetchall()
-        cur.close()
-        conn.close()
-        return jsonify({'status': 'success', 'data': pools})
-    except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+    return snapshot_response('pool_pools')
+
+def collect_replication_status():
+    """Collect PostgreSQL replication status from master"""
+    conn = get_master_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT 
+            client_addr,
+            state,
+            sync_state,
+            pg_wal_lsn_diff(pg_current_wal_lsn(), sent_lsn) as sent_lag_bytes,
+            pg_wal_lsn_diff(sent_lsn, flush_lsn) as flush_lag_bytes,
+            pg_wal_lsn_diff(flush_lsn, replay_lsn) as replay_lag_bytes
+        FROM pg_stat_replication;
+    """)
+    replication = cur.fetchall()
+    cur.close()
+    conn.close()
+    return replication
 
 @app.route('/api/replication_status')
 @login_required
 def get_replication_status():
     """Get PostgreSQL replication status from master"""
+    return snapshot_response('replication_status')
+
+# Rankings derived from the single pg_stat_statements read in collect_query_statistics
+TOP_QUERIES_LIMIT = 50
+SLOW_QUERIES_LIMIT = 20
+QUERY_PATTERNS_LIMIT = 20
+STATEMENT_RANK_COLUMNS = ('time_rank', 'slow_rank', 'is_slow', 'calls_rank')
+
+def collect_query_statistics(slow_threshold_ms=100, connect=get_master_connection):
+    """Collect query performance statistics from pg_stat_statements"""
+    conn = connect()
     try:
-        conn = get_master_connection()
         cur = conn.cursor()
+
+        # Activity summary and extension check in one round trip
         cur.execute("""
             SELECT 
-                client_addr,
-                state,
-                sync_state,
-                pg_wal_lsn_diff(pg_current_wal_lsn(), sent_lsn) as sent_lag_bytes,
-                pg_wal_lsn_diff(sent_lsn, flush_lsn) as flush_lag_bytes,
-                pg_wal_lsn_diff(flush_lsn, replay_lsn) as replay_lag_bytes
-            FROM pg_stat_replication;
-        """)
-        replication = cur.fetchall()
-        cur.close()
-        conn.close()
-        return jsonify({'status': 'success', 'data': replication})
-    except Exception as e:
-        app.logger.error(f"Error getting replication status: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
-
-@app.route('/api/query_statistics')
-@login_required
-def get_query_statistics():
-    """Get query performance statistics from pg_stat_statements"""
-    try:
-        conn = get_master_connection()
-        cur = conn.cursor()
-        
-        # First check if pg_stat_statements is available
-        try:
-            cur.execute("""
-                SELECT EXISTS (
+                count(*) as total_queries,
+                count(CASE WHEN state = 'active' THEN 1 END) as active_queries,
+                count(CASE WHEN state = 'idle' THEN 1 END) as idle_connections,
+                count(CASE WHEN wait_event_type IS NOT NULL THEN 1 END) as waiting_queries,
+                max(EXTRACT(EPOCH FROM (now() - query_start))) as longest_query_time,
+                EXISTS (
                     SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'
-                );
-            """)
-            
-            result = cur.fetchone()
-            extension_exists = result and result.get('exists', False)
-        except Exception as e:
-            app.logger.error(f"Error checking pg_stat_statements: {str(e)}")
-            extension_exists = False
-        
+                ) as extension_exists
+            FROM pg_stat_activity
+            WHERE datname = %s;
+        """, (PGPOOL_DB,))
+        basic_stats = cur.fetchone()
+        extension_exists = basic_stats.pop('extension_exists')
+
         if not extension_exists:
             # If not available, return basic stats from pg_stat_activity
-            cur.execute("""
-                SELECT 
-                    count(*) as total_queries,
-                    count(CASE WHEN state = 'active' THEN 1 END) as active_queries,
-                    count(CASE WHEN state = 'idle' THEN 1 END) as idle_connections,
-                    count(CASE WHEN wait_event_type IS NOT NULL THEN 1 END) as waiting_queries,
-                    max(EXTRACT(EPOCH FROM (now() - query_start))) as longest_query_time
-                FROM pg_stat_activity
-                WHERE datname = %s;
-            """, (PGPOOL_DB,))
-            basic_stats = cur.fetchone()
-            if not basic_stats:
-                basic_stats = {'total_queries': 0, 'active_queries': 0, 'idle_connections': 0, 'waiting_queries': 0, 'longest_query_time': 0}
-            
-            # Get currently running queries
             cur.execute("""
                 SELECT 
                     pid,
@@ -315,241 +402,388 @@ def get_query_statistics():
                 FROM pg_stat_activity
                 WHERE datname = %s 
                 AND state = 'active'
-                AND query NOT LIKE 'SELECT%pg_stat_activity%'
+                AND query NOT LIKE 'SELECT%%pg_stat_activity%%'
                 ORDER BY query_start;
             """, (PGPOOL_DB,))
             active_queries = cur.fetchall()
-            
+
             cur.close()
-            conn.close()
-            
-            return jsonify({
-                'status': 'success',
-                'data': {
-                    'summary': basic_stats,
-                    'active_queries': active_queries,
-                    'top_queries': [],
-                    'slow_queries': [],
-                    'query_patterns': [],
-                    'pg_stat_statements': False
-                }
-            })
-        
-        # If pg_stat_statements is available - get comprehensive query stats
-        cur.execute("""
-            SELECT 
-                userid,
-                dbid,
-                queryid,
-                query,
-                calls,
-                total_exec_time,
-                mean_exec_time,
-                min_exec_time,
-                max_exec_time,
-                stddev_exec_time,
-                rows,
-                shared_blks_hit,
-                shared_blks_read,
-                blk_read_time,
-                blk_write_time
-            FROM pg_stat_statements
-            WHERE dbid = (SELECT oid FROM pg_database WHERE datname = %s)
-            ORDER BY total_exec_time DESC
-            LIMIT 50;
-        """, (PGPOOL_DB,))
-        
-        query_stats = cur.fetchall()
-        
-        # Get slow queries
+
+            return {
+                'summary': basic_stats,
+                'active_queries': active_queries,
+                'top_queries': [],
+                'slow_queries': [],
+                'query_patterns': [],
+                'pg_stat_statements': False
+            }
+
+        # Read pg_stat_statements once and rank every entry in the same pass; only rows
+        # that make at least one of the three lists are sent back
         cur.execute("""
-            SELECT 
-                query,
-                calls,
-                mean_exec_time,
-                max_exec_time,
-                total_exec_time,
-                (shared_blks_hit / NULLIF(shared_blks_hit + shared_blks_read, 0))::float * 100 as cache_hit_ratio
-            FROM pg_stat_statements
-            WHERE dbid = (SELECT oid FROM pg_database WHERE datname = %s)
-            AND mean_exec_time > 100  -- queries averaging over 100ms
-            ORDER BY mean_exec_time DESC
-            LIMIT 20;
-        """, (PGPOOL_DB,))
-        
-        slow_queries = cur.fetchall()
-        
-        # Get query patterns (normalized queries)
+            WITH ranked AS (
+                SELECT 
+                    userid,
+                    dbid,
+                    queryid,
+                    query,
+                    calls,
+                    total_exec_time,
+                    mean_exec_time,
+                    min_exec_time,
+                    max_exec_time,
+                    stddev_exec_time,
+                    rows,
+                    shared_blks_hit,
+                    shared_blks_read,
+                    blk_read_time,
+                    blk_write_time,
+                    (shared_blks_hit / NULLIF(shared_blks_hit + shared_blks_read, 0))::float * 100 as cache_hit_ratio,
+                    row_number() OVER (ORDER BY total_exec_time DESC) as time_rank,
+                    row_number() OVER (PARTITION BY mean_exec_time > %(slow)s ORDER BY mean_exec_time DESC) as slow_rank,
+                    mean_exec_time > %(slow)s as is_slow,
+                    row_number() OVER (ORDER BY calls DESC) as calls_rank
+                FROM pg_stat_statements
+                WHERE dbid = (SELECT oid FROM pg_database WHERE datname = %(db)s)
+            )
+            SELECT * FROM ranked
+            WHERE time_rank <= %(top)s
+            OR (is_slow AND slow_rank <= %(slow_limit)s)
+            OR calls_rank <= %(patterns)s;
+        """, {
+            'db': PGPOOL_DB,
+            'slow': slow_threshold_ms,
+            'top': TOP_QUERIES_LIMIT,
+            'slow_limit': SLOW_QUERIES_LIMIT,
+            'patterns': QUERY_PATTERNS_LIMIT
+        })
+        candidates = cur.fetchall()
+
+        cur.close()
+    finally:
+        conn.close()
+
+    def ranking(rank, include=lambda row: True, limit=None):
+        rows = sorted((row for row in candidates if include(row) and row[rank] <= limit), key=lambda row: row[rank])
+        return [{name: value for name, value in row.items() if name not in STATEMENT_RANK_COLUMNS} for row in rows]
+
+    statistics = {
+        'summary': basic_stats,
+        'top_queries': ranking('time_rank', limit=TOP_QUERIES_LIMIT),
+        'slow_queries': ranking('slow_rank', lambda row: row['is_slow'], SLOW_QUERIES_LIMIT),
+        'query_patterns': ranking('calls_rank', limit=QUERY_PATTERNS_LIMIT),
+        'pg_stat_statements': True
+    }
+
+    # What is expensive right now, from stored deltas rather than totals since the last reset;
+    # the history follows the master only
+    if connect is get_master_connection:
+        statement_history.start()
+        statistics['recent_top_queries'] = statement_history.top(window=STATEMENT_RECENT_WINDOW)
+
+    return statistics
+
+@app.route('/api/query_statistics')
+@login_required
+def get_query_statistics():
+    """Get query performance statistics from pg_stat_statements"""
+    return snapshot_response('query_statistics')
+
+def sample_statements(connect=get_master_connection):
+    """Read cumulative pg_stat_statements counters per queryid for the statement history"""
+    conn = connect()
+    try:
+        cur = conn.cursor()
         cur.execute("""
             SELECT 
-                query,
-                calls,
-                total_exec_time,
-                mean_exec_time,
-                rows
+                queryid,
+                min(query) as query,
+                sum(calls) as calls,
+                sum(total_exec_time) as total_exec_time,
+                sum(rows) as rows,
+                sum(shared_blks_hit) as shared_blks_hit,
+                sum(shared_blks_read) as shared_blks_read
             FROM pg_stat_statements
             WHERE dbid = (SELECT oid FROM pg_database WHERE datname = %s)
-            ORDER BY calls DESC
-            LIMIT 20;
-        """, (PGPOOL_DB,))
-        
-        query_patterns = cur.fetchall()
-        
-        # Get basic activity stats
-        cur.execute("""
-            SELECT 
-                count(*) as total_queries,
-                count(CASE WHEN state = 'active' THEN 1 END) as active_queries,
-                count(CASE WHEN state = 'idle' THEN 1 END) as idle_connections,
-                count(CASE WHEN wait_event_type IS NOT NULL THEN 1 END) as waiting_queries,
-                max(EXTRACT(EPOCH FROM (now() - query_start))) as longest_query_time
-            FROM pg_stat_activity
-            WHERE datname = %s;
+            GROUP BY queryid;
         """, (PGPOOL_DB,))
-        
-        basic_stats = cur.fetchone()
-        if not basic_stats:
-            basic_stats = {'total_queries': 0, 'active_queries': 0, 'idle_connections': 0, 'waiting_queries': 0, 'longest_query_time': 0}
-        
+        rows = cur.fetchall()
         cur.close()
+        return rows
+    finally:
         conn.close()
-        
-        return jsonify({
-            'status': 'success',
-            'data': {
-                'summary': basic_stats,
-                'top_queries': query_stats,
-                'slow_queries': slow_queries,
-                'query_patterns': query_patterns,
-                'pg_stat_statements': True
-            }
-        })
-        
+
+statement_history = StatementHistory(
+    sample_statements,
+    interval=float(os.environ.get('STATEMENT_SAMPLE_INTERVAL', 60)),
+    retention=parse_window(os.environ.get('STATEMENT_HISTORY_RETENTION', '6h'))
+)
+STATEMENT_RECENT_WINDOW = parse_window(os.environ.get('STATEMENT_RECENT_WINDOW', '5m'))
+
+@app.route('/api/query_statistics/window')
+@login_required
+def get_query_statistics_window():
+    """Top statements over a recent window (?window=5m) or a time range (?start=&end=)"""
+    try:
+        statement_history.start()
+        window = parse_window(request.args.get('window', '5m'))
+        start = parse_time(request.args['start']) if request.args.get('start') else None
+        end = parse_time(request.args['end']) if request.args.get('end') else None
+        limit = min(int(request.args.get('limit', 20)), 500)
+        order_by = request.args.get('order_by', 'total_exec_time')
+        data = statement_history.top(window=window, start=start, end=end, order_by=order_by, limit=limit)
+        data['history'] = statement_history.stats()
+        return jsonify({'status': 'success', 'data': data})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+def collect_performance_metrics():
+    """Collect comprehensive performance metrics for real-time monitoring"""
+    metrics = {}
+
+    # Get database metrics
+    conn = get_master_connection()
+    cur = conn.cursor()
+
+    # Database size and statistics
+    cur.execute("""
+        SELECT 
+            pg_database_size(current_database()) as database_size,
+            xact_commit as commits,
+            xact_rollback as rollbacks,
+            blks_read as blocks_read,
+            blks_hit as blocks_hit,
+            numbackends as connections,
+            CASE 
+                WHEN blks_hit + blks_read > 0 
+                THEN blks_hit::float / (blks_hit + blks_read) * 100
+                ELSE 0 
+            END as cache_hit_ratio,
+            stats_reset::text
+        FROM pg_stat_database
+        WHERE datname = current_database();
+    """)
+
+    db_stats = cur.fetchone()
+    metrics['database'] = db_stats if db_stats else {}
+
+    # Query performance stats
+    cur.execute("""
+        SELECT 
+            COUNT(*) as total_connections,
+            COUNT(CASE WHEN state = 'active' THEN 1 END) as active_queries,
+            COUNT(CASE WHEN state = 'idle' THEN 1 END) as idle_connections,
+            COUNT(CASE WHEN state = 'idle in transaction' THEN 1 END) as idle_in_transaction,
+            COUNT(CASE WHEN wait_event_type IS NOT NULL THEN 1 END) as waiting_queries,
+            AVG(EXTRACT(EPOCH FROM (now() - query_start))) FILTER (WHERE state = 'active') as avg_query_time,
+            MAX(EXTRACT(EPOCH FROM (now() - query_start))) FILTER (WHERE state = 'active') as max_query_time
+        FROM pg_stat_activity
+        WHERE pid != pg_backend_pid();
+    """)
+
+    activity_stats = cur.fetchone()
+    metrics['activity'] = activity_stats if activity_stats else {}
+
+    # Replication metrics
+    try:
+        cur.execute("""
+            SELECT 
+                application_name,
+                client_addr::text,
+                state,
+                sync_state,
+                pg_wal_lsn_diff(pg_current_wal_lsn(), sent_lsn) as sent_lag_bytes,
+                pg_wal_lsn_diff(sent_lsn, flush_lsn) as flush_lag_bytes,
+                pg_wal_lsn_diff(flush_lsn, replay_lsn) as replay_lag_bytes,
+                EXTRACT(EPOCH FROM (now() - backend_start)) as connection_time
+            FROM pg_stat_replication;
+        """)
+
+        replication = cur.fetchall()
+        metrics['replication'] = replication if replication else []
     except Exception as e:
-        app.logger.error(f"Error getting query statistics: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        app.logger.error(f"Error getting replication stats: {str(e)}")
+        metrics['replication'] = []
+
+    # Resource usage of the admin host, from deltas between background /proc samples
+    host_engine.start()
+    metrics['resources'] = host_resources(host_engine)
+
+    # Error metrics - Use more reliable approach
+    # Instead of looking for 'ERROR' in query text, we'll check for connection errors
+    # and failed queries from database statistics
+    cur.execute("""
+        SELECT 
+            COALESCE(xact_rollback, 0) as rollback_count,
+            COALESCE(xact_commit, 0) as commit_count,
+            COALESCE(deadlocks, 0) as deadlock_count,
+            COALESCE(temp_files, 0) as temp_file_count
+        FROM pg_stat_database
+        WHERE datname = current_database();
+    """)
+
+    error_stats = cur.fetchone()
+    if error_stats and (error_stats['rollback_count'] + error_stats['commit_count']) > 0:
+        total_transactions = error_stats['rollback_count'] + error_stats['commit_count']
+        error_rate = (error_stats['rollback_count'] / total_transactions) * 100
+    else:
+        error_rate = 0
+
+    metrics['error_rate'] = error_rate
+
+    # Throughput from sampled counters; queries come from the most precise source available
+    rate_engine.start()
+    rates = rate_engine.rates(RATE_COUNTERS, RATE_WINDOWS)
+    
+    # Database I/O from pg_stat_io and the background writer, sampled with the throughput counters
+    metrics['database_io'] = {}
+    for label, (names, scale) in DATABASE_IO_RATES.items():
+        name = next((name for name in names if rate_engine.has(name)), names[-1])
+        rate = rate_engine.rate(name)
+        metrics['database_io'][label] = round(rate * scale, 2) if rate is not None else None
+    query_source = next((name for name in ('calls', 'select_cnt') if rate_engine.has(name)), 'transactions')
+    metrics['rates'] = {
+        'counters': rates,
+        'windows': RATE_WINDOWS,
+        'query_source': query_source,
+        'engine': rate_engine.stats()
+    }
+    
+    # Performance summary
+    metrics['summary'] = {
+        'queries_per_second': round(rates[query_source]['current'] or 0, 1),
+        'queries_per_second_5m': round(rates[query_source]['5m'] or 0, 1),
+        'transactions_per_second': round(rates['transactions']['current'] or 0, 1),
+        'rows_read_per_second': round(rates['rows_read']['current'] or 0, 1),
+        'rows_written_per_second': round(rates['rows_written']['current'] or 0, 1),
+        'total_queries_today': int(rate_engine.today(query_source)),
+        'performance_score': calculate_performance_score(metrics)
+    }
+
+    cur.close()
+    conn.close()
+
+    return metrics
 
 @app.route('/api/performance_metrics')
 @login_required
 def get_performance_metrics():
     """Get comprehensive performance metrics for real-time monitoring"""
+    return snapshot_response('performance_metrics')
+
+def sample_counters():
+    """Read the monotonic counters tracked by the rate engine; sums over statements and nodes are read per part"""
+    counters = {}
+    
+    conn = get_master_connection()
     try:
-        metrics = {}
-        
-        # Get database metrics
-        conn = get_master_connection()
         cur = conn.cursor()
-        
-        # Database size and statistics
         cur.execute("""
             SELECT 
-                pg_database_size(current_database()) as database_size,
-                xact_commit as commits,
-                xact_rollback as rollbacks,
-                blks_read as blocks_read,
-                blks_hit as blocks_hit,
-                numbackends as connections,
-                CASE 
-                    WHEN blks_hit + blks_read > 0 
-                    THEN blks_hit::float / (blks_hit + blks_read) * 100
-                    ELSE 0 
-                END as cache_hit_ratio,
-                stats_reset::text
+                xact_commit,
+                xact_rollback,
+                tup_returned,
+                tup_fetched,
+                tup_inserted,
+                tup_updated,
+                tup_deleted
             FROM pg_stat_database
             WHERE datname = current_database();
         """)
+        row = cur.fetchone()
+        if row:
+            counters.update({name: float(value or 0) for name, value in row.items()})
+            counters['transactions'] = counters['xact_commit'] + counters['xact_rollback']
+            counters['rows_read'] = counters['tup_returned'] + counters['tup_fetched']
+            counters['rows_written'] = counters['tup_inserted'] + counters['tup_updated'] + counters['tup_deleted']
         
-        db_stats = cur.fetchone()
-        metrics['database'] = db_stats if db_stats else {}
-        
-        # Query performance stats
-        cur.execute("""
-            SELECT 
-                COUNT(*) as total_connections,
-                COUNT(CASE WHEN state = 'active' THEN 1 END) as active_queries,
-                COUNT(CASE WHEN state = 'idle' THEN 1 END) as idle_connections,
-                COUNT(CASE WHEN state = 'idle in transaction' THEN 1 END) as idle_in_transaction,
-                COUNT(CASE WHEN wait_event_type IS NOT NULL THEN 1 END) as waiting_queries,
-                AVG(EXTRACT(EPOCH FROM (now() - query_start))) FILTER (WHERE state = 'active') as avg_query_time,
-                MAX(EXTRACT(EPOCH FROM (now() - query_start))) FILTER (WHERE state = 'active') as max_query_time
-            FROM pg_stat_activity
-            WHERE pid != pg_backend_pid();
-        """)
-        
-        activity_stats = cur.fetchone()
-        metrics['activity'] = activity_stats if activity_stats else {}
-        
-        # Replication metrics
+        try:
+            # Per statement, since entries are evicted and reset individually
+            cur.execute("""
+                SELECT userid, queryid, sum(calls) as calls
+                FROM pg_stat_statements
+                WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+                GROUP BY userid, queryid;
+            """)
+            rows = cur.fetchall()
+            if rows:
+                counters['calls'] = {(row['userid'], row['queryid']): float(row['calls'] or 0) for row in rows}
+        except psycopg2.Error:
+            # pg_stat_statements is not installed
+            pass
+        
+        # Cluster-wide I/O (PostgreSQL 16+); op_bytes converts block counts to bytes
         try:
             cur.execute("""
                 SELECT 
-                    application_name,
-                    client_addr::text,
-                    state,
-                    sync_state,
-                    pg_wal_lsn_diff(pg_current_wal_lsn(), sent_lsn) as sent_lag_bytes,
-                    pg_wal_lsn_diff(sent_lsn, flush_lsn) as flush_lag_bytes,
-                    pg_wal_lsn_diff(flush_lsn, replay_lsn) as replay_lag_bytes,
-                    EXTRACT(EPOCH FROM (now() - backend_start)) as connection_time
-                FROM pg_stat_replication;
+                    sum(reads * op_bytes) as io_read_bytes,
+                    sum(writes * op_bytes) as io_write_bytes,
+                    sum(extends * op_bytes) as io_extend_bytes,
+                    sum(hits) as io_hits,
+                    sum(read_time) as io_read_time,
+                    sum(write_time) as io_write_time,
+                    sum(fsyncs) as io_fsyncs
+                FROM pg_stat_io;
             """)
-            
-            replication = cur.fetchall()
-            metrics['replication'] = replication if replication else []
-        except Exception as e:
-            app.logger.error(f"Error getting replication stats: {str(e)}")
-            metrics['replication'] = []
-        
-        # Resource usage (simplified - in production would use system metrics)
-        metrics['resources'] = {
-            'cpu_percent': round(random.uniform(20, 60), 2),
-            'memory_percent': round(random.uniform(30, 70), 2),
-            'disk_io_percent': round(random.uniform(10, 40), 2),
-            'network_io_mbps': round(random.uniform(5, 25), 2)
-        }
-        
-        # Error metrics - Use more reliable approach
-        # Instead of looking for 'ERROR' in query text, we'll check for connection errors
-        # and failed queries from database statistics
-        cur.execute("""
-            SELECT 
-                COALESCE(xact_rollback, 0) as rollback_count,
-                COALESCE(xact_commit, 0) as commit_count,
-                COALESCE(deadlocks, 0) as deadlock_count,
-                COALESCE(temp_files, 0) as temp_file_count
-            FROM pg_stat_database
-            WHERE datname = current_database();
-        """)
-        
-        error_stats = cur.fetchone()
-        if error_stats and (error_stats['rollback_count'] + error_stats['commit_count']) > 0:
-            total_transactions = error_stats['rollback_count'] + error_stats['commit_count']
-            error_rate = (error_stats['rollback_count'] / total_transactions) * 100
-        else:
-            error_rate = 0
-            
-        metrics['error_rate'] = error_rate
-        
-        # Performance summary
-        qps = random.randint(500, 1500)  # In production, calculate from actual metrics
-        metrics['summary'] = {
-            'queries_per_second': qps,
-            'total_queries_today': qps * 3600 * 8,  # Approximate for 8 hours
-            'performance_score': calculate_performance_score(metrics)
-        }
+            row = cur.fetchone()
+            counters.update({name: float(value) for name, value in row.items() if value is not None})
+        except psycopg2.Error:
+            pass
         
+        # Background writer and checkpoints; columns vary across versions, so take every counter present
+        for view, prefix in (('pg_stat_bgwriter', 'bgwriter_'), ('pg_stat_checkpointer', 'checkpointer_')):
+            try:
+                cur.execute(f"SELECT * FROM {view};")
+                row = cur.fetchone()
+                counters.update({
+                    prefix + name: float(value) for name, value in row.items()
+                    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+                })
+            except psycopg2.Error:
+                # pg_stat_checkpointer only exists from PostgreSQL 17
+                pass
         cur.close()
+    finally:
         conn.close()
-        
-        return jsonify({
-            'status': 'success',
-            'data': metrics,
-            'timestamp': datetime.utcnow().isoformat()
-        })
-        
+    
+    # Reads PgPool routed to each backend
+    try:
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("SHOW POOL_NODES;")
+            # Per node, since each backend's count restarts on its own when it is reattached
+            counters['select_cnt'] = {
+                node.get('node_id'): float(node.get('select_cnt') or 0) for node in cur.fetchall()
+            }
+            cur.close()
+        finally:
+            conn.close()
     except Exception as e:
-        app.logger.error(f"Error getting performance metrics: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+        app.logger.error(f"Error sampling PgPool counters: {str(e)}")
+    
+    return counters
+
+rate_engine = RateEngine(sample_counters, interval=float(os.environ.get('RATE_SAMPLE_INTERVAL', 5)))
+RATE_COUNTERS = ['transactions', 'xact_commit', 'xact_rollback', 'rows_read', 'rows_written', 'calls', 'select_cnt']
+RATE_WINDOWS = {'1m': 60, '5m': 300, '15m': 900}
+# Reported database I/O rates: label -> (counters in order of preference, multiplier for the per-second rate)
+# Checkpoint counters moved from pg_stat_bgwriter to pg_stat_checkpointer in PostgreSQL 17
+DATABASE_IO_RATES = {
+    'read_bytes_per_sec': (('io_read_bytes',), 1),
+    'write_bytes_per_sec': (('io_write_bytes',), 1),
+    'extend_bytes_per_sec': (('io_extend_bytes',), 1),
+    'buffer_hits_per_sec': (('io_hits',), 1),
+    'read_time_ms_per_sec': (('io_read_time',), 1),
+    'write_time_ms_per_sec': (('io_write_time',), 1),
+    'fsyncs_per_sec': (('io_fsyncs',), 1),
+    'buffers_alloc_per_sec': (('bgwriter_buffers_alloc',), 1),
+    'buffers_clean_per_sec': (('bgwriter_buffers_clean',), 1),
+    'checkpoints_timed_per_hour': (('checkpointer_num_timed', 'bgwriter_checkpoints_timed'), 3600),
+    'checkpoints_requested_per_hour': (('checkpointer_num_requested', 'bgwriter_checkpoints_req'), 3600)
+}
+
+host_engine = RateEngine(read_host_counters, interval=float(os.environ.get('HOST_SAMPLE_INTERVAL', 5)))
 
 def calculate_performance_score(metrics):
     """Calculate overall performance score based on metrics"""
@@ -562,10 +796,10 @@ def calculate_performance_score(metrics):
     if metrics.get('activity', {}).get('waiting_queries', 0) > 5:
         score -= 5
         
-    if metrics.get('resources', {}).get('cpu_percent', 0) > 80:
+    if (metrics.get('resources', {}).get('cpu_percent') or 0) > 80:
         score -= 15
         
-    if metrics.get('resources', {}).get('memory_percent', 0) > 85:
+    if (metrics.get('resources', {}).get('memory_percent') or 0) > 85:
         score -= 10
         
     if metrics.get('error_rate', 0) > 1:
@@ -578,203 +812,128 @@ def calculate_performance_score(metrics):
 def get_query_statistics_old():
     """Get query performance statistics from pg_stat_statements (old version)"""
     try:
-        conn = get_master_connection()
-        cur = conn.cursor()
-        
-        # First check if pg_stat_statements is available
-        try:
-            cur.execute("""
-                SELECT EXISTS (
-                    SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'
-                );
-            """)
-            
-            result = cur.fetchone()
-            extension_exists = result and result.get('exists', False)
-        except Exception as e:
-            app.logger.error(f"Error checking pg_stat_statements: {str(e)}")
-            extension_exists = False
-        
-        if not extension_exists:
-            # If not available, return basic stats from pg_stat_activity
-            cur.execute("""
-                SELECT 
-                    count(*) as total_queries,
-                    count(CASE WHEN state = 'active' THEN 1 END) as active_queries,
-                    count(CASE WHEN state = 'idle' THEN 1 END) as idle_connections,
-                    count(CASE WHEN wait_event_type IS NOT NULL THEN 1 END) as waiting_queries,
-                    max(EXTRACT(EPOCH FROM (now() - query_start))) as longest_query_time
-                FROM pg_stat_activity
-                WHERE datname = %s;
-            """, (PGPOOL_DB,))
-            basic_stats = cur.fetchone()
-            if not basic_stats:
-                basic_stats = {'total_queries': 0, 'active_queries': 0, 'idle_connections': 0, 'waiting_queries': 0, 'longest_query_time': 0}
-            
-            # Get currently running queries
-            cur.execute("""
-                SELECT 
-                    pid,
-                    usename,
-                    application_name,
-                    client_addr,
-                    state,
-                    wait_event_type,
-                    wait_event,
-                    EXTRACT(EPOCH FROM (now() - query_start)) as query_duration,
-                    LEFT(query, 100) as query_preview
-                FROM pg_stat_activity
-                WHERE datname = %s 
-                AND state = 'active'
-                AND query NOT LIKE 'SELECT%pg_stat_activity%'
-                ORDER BY query_start;
-            """, (PGPOOL_DB,))
-            active_queries = cur.fetchall()
-            
-            cur.close()
-            conn.close()
-            
-            return jsonify({
-                'status': 'success',
-                'data': {
-                    'summary': basic_stats,
-                    'active_queries': active_queries,
-                    'pg_stat_statements': False
-                }
-            })
-        
-        # If pg_stat_statements is available
-        cur.execute("""
-            SELECT 
-                userid,
-                dbid,
-                queryid,
-                query,
-                calls,
-                total_exec_time,
-                mean_exec_time,
-                min_exec_time,
-                max_exec_time,
-                stddev_exec_time,
-                rows,
-                shared_blks_hit,
-                shared_blks_read,
-                blk_read_time,
-                blk_write_time
-            FROM pg_stat_statements
-            WHERE dbid = (SELECT oid FROM pg_database WHERE datname = %s)
-            ORDER BY total_exec_time DESC
-            LIMIT 50;
-        """, (PGPOOL_DB,))
-        
-        query_stats = cur.fetchall()
-        
-        # Get slow queries
-        cur.execute("""
-            SELECT 
-                query,
-                calls,
-                mean_exec_time,
-                max_exec_time,
-                total_exec_time,
-                (shared_blks_hit / NULLIF(shared_blks_hit + shared_blks_read, 0))::float * 100 as cache_hit_ratio
-            FROM pg_stat_statements
-            WHERE dbid = (SELECT oid FROM pg_database WHERE datname = %s)
-            AND mean_exec_time > 1000  -- queries averaging over 1 second
-            ORDER BY mean_exec_time DESC
-            LIMIT 20;
-        """, (PGPOOL_DB,))
-        
-        slow_queries = cur.fetchall()
-        
-        cur.close()
-        conn.close()
-        
-        return jsonify({
-            'status': 'success',
-            'data': {
-                'top_queries': query_stats,
-                'slow_queries': slow_queries,
-                'pg_stat_statements': True
-            }
-        })
-        
+        # Same single-pass collection; the old view flagged queries averaging over 1 second
+        return jsonify({'status': 'success', 'data': collect_query_statistics(slow_threshold_ms=1000)})
     except Exception as e:
         app.logger.error(f"Error getting query statistics: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
-@app.route('/api/database_statistics')
-@login_required
-def get_database_statistics():
-    """Get comprehensive database statistics"""
+CATALOG_QUERIES = {}
+
+def run_catalog_query(key, connect=get_master_connection):
+    """Run a registered catalog query directly, bypassing the cache"""
+    sql, params, one = CATALOG_QUERIES[key]
+    conn = connect()
     try:
-        conn = get_master_connection()
         cur = conn.cursor()
-        
-        # Database size and growth
-        cur.execute("""
-            SELECT 
-                pg_database_size(%s) as database_size,
-                pg_size_pretty(pg_database_size(%s)) as database_size_pretty,
-                (SELECT count(*) FROM pg_stat_user_tables) as table_count,
-                (SELECT count(*) FROM pg_stat_user_indexes) as index_count
-        """, (PGPOOL_DB, PGPOOL_DB))
-        db_info = cur.fetchone()
-        
-        # Table statistics
-        cur.execute("""
-            SELECT 
-                schemaname,
-                relname as tablename,
-                pg_size_pretty(pg_total_relation_size(schemaname||'.'||relname)) as total_size,
-                pg_size_pretty(pg_relation_size(schemaname||'.'||relname)) as table_size,
-                pg_size_pretty(pg_indexes_size(schemaname||'.'||relname)) as indexes_size,
-                n_tup_ins as inserts,
-                n_tup_upd as updates,
-                n_tup_del as deletes,
-                n_live_tup as live_tuples,
-                n_dead_tup as dead_tuples,
-                last_vacuum,
-                last_autovacuum,
-                last_analyze,
-                last_autoanalyze
-            FROM pg_stat_user_tables
-            ORDER BY pg_total_relation_size(schemaname||'.'||relname) DESC
-            LIMIT 20;
-        """)
-        table_stats = cur.fetchall()
-        
-        # Index usage statistics
-        cur.execute("""
-            SELECT 
-                schemaname,
-                relname as tablename,
-                indexrelname,
-                pg_size_pretty(pg_relation_size(indexrelid)) as index_size,
-                idx_scan as index_scans,
-                idx_tup_read as tuples_read,
-                idx_tup_fetch as tuples_fetched,
-                CASE 
-                    WHEN idx_scan = 0 THEN 'UNUSED'
-                    WHEN idx_scan < 10 THEN 'RARELY USED'
-                    ELSE 'ACTIVE'
-                END as usage_status
-            FROM pg_stat_user_indexes
-            ORDER BY idx_scan
-            LIMIT 20;
-        """)
-        index_stats = cur.fetchall()
-        
-        # Cache hit ratios
-        cur.execute("""
-            SELECT 
-                sum(heap_blks_read) as heap_read,
-                sum(heap_blks_hit) as heap_hit,
-                (sum(heap_blks_hit) / NULLIF(sum(heap_blks_hit) + sum(heap_blks_read), 0))::float * 100 as cache_hit_ratio
-            FROM pg_statio_user_tables;
-        """)
-        cache_stats = cur.fetchone()
-        
+        cur.execute(sql, params)
+        result = cur.fetchone() if one else cur.fetchall()
+        cur.close()
+        return result
+    finally:
+        conn.close()
+
+def catalog_query(key, connect=get_master_connection):
+    """Result of a registered catalog query; cached for the master, read live on other backends"""
+    if connect is get_master_connection:
+        return query_cache.get(key)
+    return run_catalog_query(key, connect)
+
+def register_catalog_query(key, ttl, sql, params=None, one=False):
+    """Cache a read-only query on the master under key for ttl seconds"""
+    CATALOG_QUERIES[key] = (sql, params, one)
+    query_cache.register(key, lambda: run_catalog_query(key), ttl)
+
+# Database size and growth
+register_catalog_query('database_size', 60, """
+    SELECT 
+        pg_database_size(%s) as database_size,
+        pg_size_pretty(pg_database_size(%s)) as database_size_pretty,
+        (SELECT count(*) FROM pg_stat_user_tables) as table_count,
+        (SELECT count(*) FROM pg_stat_user_indexes) as index_count
+""", (PGPOOL_DB, PGPOOL_DB), one=True)
+
+# Table statistics; each size is computed once per table, and only the top 20 are formatted
+register_catalog_query('table_stats', 300, """
+    SELECT 
+        schemaname,
+        tablename,
+        pg_size_pretty(total_bytes) as total_size,
+        pg_size_pretty(table_bytes) as table_size,
+        pg_size_pretty(indexes_bytes) as indexes_size,
+        inserts,
+        updates,
+        deletes,
+        live_tuples,
+        dead_tuples,
+        last_vacuum,
+        last_autovacuum,
+        last_analyze,
+        last_autoanalyze
+    FROM (
+        SELECT 
+            schemaname,
+            relname as tablename,
+            pg_total_relation_size(relid) as total_bytes,
+            pg_relation_size(relid) as table_bytes,
+            pg_indexes_size(relid) as indexes_bytes,
+            n_tup_ins as inserts,
+            n_tup_upd as updates,
+            n_tup_del as deletes,
+            n_live_tup as live_tuples,
+            n_dead_tup as dead_tuples,
+            last_vacuum,
+            last_autovacuum,
+            last_analyze,
+            last_autoanalyze
+        FROM pg_stat_user_tables
+        ORDER BY total_bytes DESC
+        LIMIT 20
+    ) largest
+    ORDER BY total_bytes DESC;
+""")
+
+# Index usage statistics
+register_catalog_query('index_stats', 300, """
+    SELECT 
+        schemaname,
+        relname as tablename,
+        indexrelname,
+        pg_size_pretty(pg_relation_size(indexrelid)) as index_size,
+        idx_scan as index_scans,
+        idx_tup_read as tuples_read,
+        idx_tup_fetch as tuples_fetched,
+        CASE 
+            WHEN idx_scan = 0 THEN 'UNUSED'
+            WHEN idx_scan < 10 THEN 'RARELY USED'
+            ELSE 'ACTIVE'
+        END as usage_status
+    FROM pg_stat_user_indexes
+    ORDER BY idx_scan
+    LIMIT 20;
+""")
+
+# Cache hit ratios
+register_catalog_query('table_cache_stats', 60, """
+    SELECT 
+        sum(heap_blks_read) as heap_read,
+        sum(heap_blks_hit) as heap_hit,
+        (sum(heap_blks_hit) / NULLIF(sum(heap_blks_hit) + sum(heap_blks_read), 0))::float * 100 as cache_hit_ratio
+    FROM pg_statio_user_tables;
+""", one=True)
+
+def collect_database_statistics(connect=get_master_connection):
+    """Collect comprehensive database statistics"""
+    db_info = catalog_query('database_size', connect)
+    table_stats = catalog_query('table_stats', connect)
+    index_stats = catalog_query('index_stats', connect)
+    cache_stats = catalog_query('table_cache_stats', connect)
+
+    # Connections and locks change by the second and are always read live
+    conn = connect()
+    try:
+        cur = conn.cursor()
+
         # Connection statistics
         cur.execute("""
             SELECT 
@@ -788,7 +947,7 @@ def get_database_statistics():
             WHERE datname = %s;
         """, (PGPOOL_DB,))
         connection_stats = cur.fetchone()
-        
+
         # Lock statistics
         cur.execute("""
             SELECT 
@@ -800,184 +959,144 @@ def get_database_statistics():
             ORDER BY count DESC;
         """, (PGPOOL_DB,))
         lock_stats = cur.fetchall()
-        
+
         cur.close()
+    finally:
         conn.close()
-        
-        return jsonify({
-            'status': 'success',
-            'data': {
-                'database': db_info,
-                'tables': table_stats,
-                'indexes': index_stats,
-                'cache': cache_stats,
-                'connections': connection_stats,
-                'locks': lock_stats
-            }
-        })
-        
-    except Exception as e:
-        app.logger.error(f"Error getting database statistics: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+    return {
+        'database': db_info,
+        'tables': table_stats,
+        'indexes': index_stats,
+        'cache': cache_stats,
+        'connections': connection_stats,
+        'locks': lock_stats
+    }
+
+@app.route('/api/database_statistics')
+@login_required
+def get_database_statistics():
+    """Get comprehensive database statistics"""
+    return snapshot_response('database_statistics')
+
+# Diagnostic checks run in parallel on pooled master connections, catalog results cached
+insight_runner = InsightRunner(
+    get_master_connection,
+    cache=query_cache,
+    max_workers=int(os.environ.get('INSIGHT_CHECK_WORKERS', 4))
+)
+
+def collect_performance_insights(connect=get_master_connection):
+    """Collect performance insights and recommendations"""
+    if connect is get_master_connection:
+        return insight_runner.run()
+    return insight_runner.run(connect=connect)
 
 @app.route('/api/performance_insights')
 @login_required
 def get_performance_insights():
     """Get performance insights and recommendations"""
-    try:
-        conn = get_master_connection()
-        cur = conn.cursor()
-        
-        insights = []
-        
-        # Check for missing indexes
-        cur.execute("""
-            SELECT 
-                schemaname,
-                tablename,
-                attname,
-                n_distinct,
-                correlation
-            FROM pg_stats
-            WHERE schemaname NOT IN ('pg_catalog', 'information_schema')
-            AND n_distinct > 100
-            AND correlation < 0.1
-            LIMIT 10;
-        """)
-        poor_correlation = cur.fetchall()
-        if poor_correlation:
-            insights.append({
-                'type': 'index',
-                'severity': 'medium',
-                'message': f'Found {len(poor_correlation)} columns with poor correlation that might benefit from indexes',
-                'details': poor_correlation
-            })
-        
-        # Check for bloated tables
-        cur.execute("""
-            SELECT 
-                schemaname,
-                relname as tablename,
-                n_dead_tup,
-                n_live_tup,
-                round(n_dead_tup::numeric / NULLIF(n_live_tup, 0) * 100, 2) as dead_tuple_percent
-            FROM pg_stat_user_tables
-            WHERE n_dead_tup > 1000
-            AND n_dead_tup::float / NULLIF(n_live_tup, 0) > 0.2
-            ORDER BY n_dead_tup DESC
-            LIMIT 10;
-        """)
-        bloated_tables = cur.fetchall()
-        if bloated_tables:
-            insights.append({
-                'type': 'maintenance',
-                'severity': 'high',
-                'message': f'Found {len(bloated_tables)} tables with significant bloat (>20% dead tuples)',
-                'details': bloated_tables,
-                'recommendation': 'Consider running VACUUM on these tables'
-            })
-        
-        # Check for unused indexes
-        cur.execute("""
-            SELECT 
-                schemaname,
-                relname as tablename,
-                indexrelname,
-                pg_size_pretty(pg_relation_size(indexrelid)) as index_size,
-                idx_scan
-            FROM pg_stat_user_indexes
-            WHERE idx_scan = 0
-            AND indexrelname NOT LIKE '%_pkey'
-            ORDER BY pg_relation_size(indexrelid) DESC
-            LIMIT 10;
-        """)
-        unused_indexes = cur.fetchall()
-        if unused_indexes:
-            insights.append({
-                'type': 'optimization',
-                'severity': 'low',
-                'message': f'Found {len(unused_indexes)} unused indexes that could be dropped',
-                'details': unused_indexes,
-                'recommendation': 'Consider dropping these unused indexes to save space and improve write performance'
-            })
-        
-        # Check for long-running queries
-        cur.execute("""
-            SELECT 
-                pid,
-                usename,
-                EXTRACT(EPOCH FROM (now() - query_start)) as duration_seconds,
-                state,
-                LEFT(query, 100) as query_preview
-            FROM pg_stat_activity
-            WHERE state = 'active'
-            AND query_start < now() - interval '5 minutes'
-            AND query NOT LIKE '%pg_stat_activity%'
-            ORDER BY query_start;
-        """)
-        long_queries = cur.fetchall()
-        if long_queries:
-            insights.append({
-                'type': 'performance',
-                'severity': 'high',
-                'message': f'Found {len(long_queries)} queries running for over 5 minutes',
-                'details': long_queries,
-                'recommendation': 'Investigate these long-running queries for optimization opportunities'
-            })
-        
-        # Check cache hit ratio
-        cur.execute("""
-            SELECT 
-                (sum(heap_blks_hit) / NULLIF(sum(heap_blks_hit) + sum(heap_blks_read), 0))::float * 100 as cache_hit_ratio
-            FROM pg_statio_user_tables;
-        """)
-        result = cur.fetchone()
-        cache_ratio = result['cache_hit_ratio'] if result and result['cache_hit_ratio'] else 0
-        if cache_ratio and cache_ratio < 90:
-            insights.append({
-                'type': 'performance',
-                'severity': 'medium',
-                'message': f'Cache hit ratio is {cache_ratio:.1f}%, which is below optimal',
-                'recommendation': 'Consider increasing shared_buffers or adding more RAM'
-            })
-        
-        # Check for tables without primary keys
-        cur.execute("""
-            SELECT 
-                n.nspname as schema,
-                c.relname as table
-            FROM pg_class c
-            JOIN pg_namespace n ON n.oid = c.relnamespace
-            WHERE c.relkind = 'r'
-            AND n.nspname NOT IN ('pg_catalog', 'information_schema')
-            AND NOT EXISTS (
-                SELECT 1 FROM pg_constraint
-                WHERE conrelid = c.oid
-                AND contype = 'p'
-            )
-            LIMIT 10;
-        """)
-        no_pk_tables = cur.fetchall()
-        if no_pk_tables:
-            insights.append({
-                'type': 'design',
-                'severity': 'medium',
-                'message': f'Found {len(no_pk_tables)} tables without primary keys',
-                'details': no_pk_tables,
-                'recommendation': 'Consider adding primary keys for better performance and replication'
-            })
-        
-        cur.close()
-        conn.close()
-        
-        return jsonify({
-            'status': 'success',
-            'data': insights
-        })
-        
-    except Exception as e:
-        app.logger.error(f"Error getting performance insights: {str(e)}")
-        return jsonify({'status': 'error', 'message': str(e)}), 500
+    return snapshot_response('performance_insights')
+
+# Runs a collector on every backend in SHOW POOL_NODES, so replicas serving load-balanced reads show up too
+backend_fanout = BackendFanOut(
+    collect_pool_nodes,
+    get_backend_connection,
+    max_workers=int(os.environ.get('FANOUT_WORKERS', 4)),
+    timeout=float(os.environ.get('FANOUT_TIMEOUT', 30))
+)
+STATEMENT_SUM_FIELDS = ('calls', 'total_exec_time', 'rows', 'shared_blks_hit', 'shared_blks_read')
+
+def statement_rankings(statements, limit, slow_threshold_ms=100):
+    """Top, slow and most frequent statements from per-queryid rows"""
+    for row in statements:
+        row['mean_exec_time'] = float(row['total_exec_time'] or 0) / float(row['calls']) if row['calls'] else 0
+    return {
+        'top_queries': heapq.nlargest(limit, statements, key=lambda row: row['total_exec_time']),
+        'slow_queries': heapq.nlargest(
+            SLOW_QUERIES_LIMIT, (row for row in statements if row['mean_exec_time'] > slow_threshold_ms),
+            key=lambda row: row['mean_exec_time']
+        ),
+        'query_patterns': heapq.nlargest(QUERY_PATTERNS_LIMIT, statements, key=lambda row: row['calls'])
+    }
+
+def collect_cluster_query_statistics():
+    """Collect pg_stat_statements from every backend, merged by queryid across the cluster"""
+    fanout = backend_fanout.run(sample_statements)
+    per_node = succeeded(fanout)
+
+    # Each node reads pg_stat_statements once; its rankings and the merged view derive from that read
+    for name, statements in per_node.items():
+        fanout['nodes'][name]['data'] = {
+            'statements': len(statements),
+            'calls': sum(row['calls'] or 0 for row in statements),
+            'total_exec_time': sum(row['total_exec_time'] or 0 for row in statements),
+            **statement_rankings([dict(row) for row in statements], 10)
+        }
+
+    merged = merge_rows(per_node, key=lambda row: row['queryid'], sum_fields=STATEMENT_SUM_FIELDS, breakdown='calls')
+    fanout['merged'] = {'statements': len(merged), **statement_rankings(merged, TOP_QUERIES_LIMIT)}
+    return fanout
+
+def collect_cluster_database_statistics():
+    """Collect database statistics from every backend with cluster-wide connection, cache and lock totals"""
+    fanout = backend_fanout.run(collect_database_statistics)
+    per_node = succeeded(fanout)
+
+    connections = [stats['connections'] for stats in per_node.values() if stats['connections']]
+    caches = [stats['cache'] for stats in per_node.values() if stats['cache']]
+    heap_read = sum(cache['heap_read'] or 0 for cache in caches)
+    heap_hit = sum(cache['heap_hit'] or 0 for cache in caches)
+
+    fanout['merged'] = {
+        'connections': {
+            **{field: sum(stats[field] or 0 for stats in connections)
+               for field in ('total_connections', 'active_connections', 'idle_connections',
+                             'idle_in_transaction', 'waiting_connections')},
+            'oldest_connection_age': max((stats['oldest_connection_age'] or 0 for stats in connections), default=None)
+        },
+        'cache': {
+            'heap_read': heap_read,
+            'heap_hit': heap_hit,
+            'cache_hit_ratio': float(heap_hit) / float(heap_hit + heap_read) * 100 if heap_hit + heap_read else None
+        },
+        'locks': sorted(
+            merge_rows({name: stats['locks'] for name, stats in per_node.items()},
+                       key=lambda row: row['mode'], sum_fields=('count',), breakdown='count'),
+            key=lambda row: row['count'], reverse=True
+        )
+    }
+    return fanout
+
+def collect_cluster_performance_insights():
+    """Collect performance insights from every backend, tagged with the node they were found on"""
+    fanout = backend_fanout.run(collect_performance_insights)
+    fanout['merged'] = {
+        'insights': [
+            {**insight, 'node': name}
+            for name, result in succeeded(fanout).items()
+            for insight in result['insights']
+        ]
+    }
+    return fanout
+
+@app.route('/api/cluster_query_statistics')
+@login_required
+def get_cluster_query_statistics():
+    """Get query statistics from every backend node with a merged cluster view"""
+    return snapshot_response('cluster_query_statistics')
+
+@app.route('/api/cluster_database_statistics')
+@login_required
+def get_cluster_database_statistics():
+    """Get database statistics from every backend node with a merged cluster view"""
+    return snapshot_response('cluster_database_statistics')
+
+@app.route('/api/cluster_performance_insights')
+@login_required
+def get_cluster_performance_insights():
+    """Get performance insights from every backend node"""
+    return snapshot_response('cluster_performance_insights')
 
 @app.route('/api/query_analysis', methods=['POST'])
 @login_required
@@ -990,7 +1109,6 @@ def analyze_query():
             return jsonify({'status': 'error', 'message': 'No query provided'}), 400
         
         conn = get_master_connection()
-        cur = conn.cursor()
         
         # Get query execution plan - Use parameterized queries to prevent SQL injection
         try:
@@ -1029,16 +1147,25 @@ def analyze_query():
             
             # Execute with proper escaping - still vulnerable but more controlled
             escaped_query = query.replace("'", "''")  # Basic SQL escaping
-            cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {escaped_query}")
-            plan = cur.fetchone()[0][0]
+            # ANALYZE really executes the statement, so writes must fail in a read-only transaction
+            with conn.read_only():
+                cur = conn.cursor()
+                cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {escaped_query}")
+                plan = cur.fetchone()[0][0]
+                cur.close()
         except Exception as e:
-            # If EXPLAIN ANALYZE fails, try just EXPLAIN
+            # If EXPLAIN ANALYZE fails, try just EXPLAIN in a fresh transaction
             try:
                 escaped_query = query.replace("'", "''")  # Basic SQL escaping
-                cur.execute(f"EXPLAIN (FORMAT JSON) {escaped_query}")
-                plan = cur.fetchone()[0][0]
+                with conn.read_only():
+                    cur = conn.cursor()
+                    cur.execute(f"EXPLAIN (FORMAT JSON) {escaped_query}")
+                    plan = cur.fetchone()[0][0]
+                    cur.close()
             except Exception as e2:
                 return jsonify({'status': 'error', 'message': f'Could not analyze query: {str(e2)}'}), 400
+        finally:
+            conn.close()
         
         # Analyze the plan for issues
         recommendations = []
@@ -1064,9 +1191,6 @@ def analyze_query():
                 'message': 'Large hash join detected. Ensure statistics are up to date and consider join order.'
             })
         
-        cur.close()
-        conn.close()
-        
         return jsonify({
             'status': 'success',
             'data': {
@@ -1079,10 +1203,108 @@ def analyze_query():
         app.logger.error(f"Error analyzing query: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+# Console result limits; memory stays flat because rows are fetched and sent in chunks
+QUERY_FETCH_SIZE = int(os.environ.get('QUERY_FETCH_SIZE', 500))
+QUERY_MAX_ROWS = int(os.environ.get('QUERY_MAX_ROWS', 10000))
+QUERY_MAX_BYTES = int(os.environ.get('QUERY_MAX_BYTES', 20 * 1024 * 1024))
+
+def record_query_execution(query, execution_time):
+    """Track console query statistics and slow queries"""
+    normalized = normalize_query(query)
+    query_hash = hashlib.md5(normalized.encode()).hexdigest()
+    stats = query_stats[query_hash]
+    stats['count'] += 1
+    stats['total_time'] += execution_time
+    stats['min_time'] = min(stats['min_time'], execution_time)
+    stats['max_time'] = max(stats['max_time'], execution_time)
+    query_patterns[normalized] += 1
+    
+    # Track slow queries
+    if execution_time > 1.0:  # Queries over 1 second
+        slow_queries.append({
+            'query': query,
+            'execution_time': execution_time,
+            'timestamp': datetime.now().isoformat()
+        })
+        # Keep only last 100 slow queries
+        if len(slow_queries) > 100:
+            slow_queries.pop(0)
+
+# Comments, quoted strings and dollar-quoted bodies, which may hide keywords and semicolons
+SQL_OPAQUE_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|(\$[A-Za-z_]*\$).*?\1", re.DOTALL)
+
+def is_single_select(query):
+    """Whether the query is exactly one SELECT, WITH or VALUES statement, the only shape DECLARE can wrap"""
+    code = SQL_OPAQUE_PATTERN.sub(lambda m: ' ' if m.group(0)[0] in '-/' else "''", query)
+    code = re.sub(r'[\s;]+$', '', code).lstrip()
+    return ';' not in code and re.match(r'(SELECT|WITH|VALUES)\b', code, re.IGNORECASE) is not None
+
+def query_result_events(conn, query, max_rows, max_bytes):
+    """Execute a console query and yield (event, encoded JSON line) for its columns, row chunks and end.
+    Runs read-only and rolled back; SELECTs use a named server-side cursor, so only one chunk is held in memory."""
+    start_time = datetime.now()
+    row_count, byte_count, truncated = 0, 0, None
+    
+    # DECLARE only accepts a single SELECT/VALUES; SHOW, EXPLAIN and multi-statement input use a client cursor
+    server_side = is_single_select(query)
+    
+    try:
+        # Every statement runs in one read-only transaction that is rolled back, which also hosts the named cursor
+        with conn.read_only():
+            if server_side:
+                cur = conn.raw.cursor(name=f"console_{os.getpid()}_{id(conn.raw)}", cursor_factory=RealDictCursor)
+                cur.itersize = QUERY_FETCH_SIZE
+            else:
+                cur = conn.cursor()
+            
+            try:
+                cur.execute(query)
+                rows = cur.fetchmany(QUERY_FETCH_SIZE)
+                
+                # Check if query returns results
+                if cur.description:
+                    event = {'type': 'columns', 'columns': [desc[0] for desc in cur.description]}
+                    yield event, app.json.dumps(event)
+                    while rows and truncated is None:
+                        if row_count + len(rows) > max_rows:
+                            rows = rows[:max_rows - row_count]
+                            truncated = 'row_limit'
+                        chunk = {'type': 'rows', 'rows': rows}
+                        line = app.json.dumps(chunk)
+                        # Over the byte cap: send the share of the chunk that still fits, then stop
+                        while byte_count + len(line) > max_bytes and rows:
+                            truncated = 'byte_limit'
+                            rows = rows[:min(len(rows) - 1, len(rows) * (max_bytes - byte_count) // len(line))]
+                            chunk = {'type': 'rows', 'rows': rows}
+                            line = app.json.dumps(chunk)
+                        if not rows:
+                            break
+                        row_count += len(rows)
+                        byte_count += len(line)
+                        yield chunk, line
+                        if truncated is None:
+                            rows = cur.fetchmany(QUERY_FETCH_SIZE)
+                
+                execution_time = (datetime.now() - start_time).total_seconds()
+                record_query_execution(query, execution_time)
+                event = {
+                    'type': 'end',
+                    'row_count': row_count,
+                    'execution_time': execution_time,
+                    'truncated': truncated is not None,
+                    'truncated_reason': truncated,
+                    'message': None if cur.description else 'Query executed successfully'
+                }
+                yield event, app.json.dumps(event)
+            finally:
+                cur.close()
+    finally:
+        conn.close()
+
 @app.route('/api/execute_query', methods=['POST'])
 @login_required
 def execute_query():
-    """Execute a custom query (read-only)"""
+    """Execute a custom query (read-only); streams NDJSON when the client accepts application/x-ndjson"""
     try:
         query = request.json.get('query', '')
         
@@ -1118,85 +1340,162 @@ def execute_query():
             if re.search(pattern, query_upper, re.IGNORECASE):
                 return jsonify({'status': 'error', 'message': 'Query contains potentially dangerous patterns'}), 400
         
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        # Track query execution time
-        start_time = datetime.now()
-        cur.execute(query)
-        execution_time = (datetime.now() - start_time).total_seconds()
+        # Clients may ask for tighter limits, never looser ones
+        max_rows = min(int(request.json.get('max_rows') or QUERY_MAX_ROWS), QUERY_MAX_ROWS)
+        max_bytes = min(int(request.json.get('max_bytes') or QUERY_MAX_BYTES), QUERY_MAX_BYTES)
         
-        # Check if query returns results
-        if cur.description:
-            results = cur.fetchall()
-            columns = [desc[0] for desc in cur.description]
-            data = {
-                'columns': columns,
-                'rows': results,
-                'execution_time': execution_time,
-                'row_count': len(results)
-            }
-        else:
-            data = {
-                'message': 'Query executed successfully',
-                'execution_time': execution_time
-            }
-        
-        # Track query statistics
-        normalized = normalize_query(query)
-        query_hash = hashlib.md5(normalized.encode()).hexdigest()
-        stats = query_stats[query_hash]
-        stats['count'] += 1
-        stats['total_time'] += execution_time
-        stats['min_time'] = min(stats['min_time'], execution_time)
-        stats['max_time'] = max(stats['max_time'], execution_time)
-        query_patterns[normalized] += 1
-        
-        # Track slow queries
-        if execution_time > 1.0:  # Queries over 1 second
-            slow_queries.append({
-                'query': query,
-                'execution_time': execution_time,
-                'timestamp': datetime.now().isoformat()
-            })
-            # Keep only last 100 slow queries
-            if len(slow_queries) > 100:
-                slow_queries.pop(0)
-        
-        cur.close()
-        conn.close()
+        conn = get_db_connection()
+        events = query_result_events(conn, query, max_rows, max_bytes)
+        
+        # Execute before answering, so syntax and permission errors still return a plain JSON error
+        first = next(events)
+        
+        if request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson':
+            def generate():
+                yield first[1] + '\n'
+                try:
+                    for _, line in events:
+                        yield line + '\n'
+                except Exception as e:
+                    app.logger.error(f"Error streaming query results: {str(e)}")
+                    yield app.json.dumps({'type': 'error', 'message': str(e)}) + '\n'
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        
+        # Buffered JSON for other clients, bounded by the same row and byte limits
+        data = {'rows': []} if first[0]['type'] == 'columns' else {}
+        for event, _ in chain([first], events):
+            if event['type'] == 'columns':
+                data['columns'] = event['columns']
+            elif event['type'] == 'rows':
+                data['rows'].extend(event['rows'])
+            else:
+                data.update({key: value for key, value in event.items() if key != 'type' and value is not None})
         return jsonify({'status': 'success', 'data': data})
     except Exception as e:
         app.logger.error(f"Error executing query: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+def combined_stats(resolved):
+    """Combine the pool_nodes and pool_processes snapshots into the /api/stats shape"""
+    stats = {}
+    
+    # Shares the pool snapshots with /api/pool_nodes and /api/pool_processes
+    for name in ('pool_nodes', 'pool_processes'):
+        snapshot = resolved[name]
+        if snapshot['error'] is not None:
+            app.logger.error(f"Error getting pool stats: {snapshot['error']}")
+            stats['error'] = snapshot['error']
+            break
+        stats[name] = snapshot['data']
+    
+    return stats
+
 @app.route('/api/stats')
 @login_required
 def get_stats():
     """Get combined statistics for dashboard"""
     try:
-        stats = {}
-        
-        # Get pool nodes
-        try:
-            conn = get_db_connection()
-            cur = conn.cursor()
-            cur.execute("SHOW POOL_NODES;")
-            stats['pool_nodes'] = cur.fetchall()
-            
-            # Get pool processes
-            cur.execute("SHOW POOL_PROCESSES;")
-            stats['pool_processes'] = cur.fetchall()
+        return jsonify(combined_stats(snapshots.get_many(['pool_nodes', 'pool_processes'])))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Refresh intervals in seconds; override per data set with SNAPSHOT_<NAME>_INTERVAL
+snapshots.register('pool_nodes', collect_pool_nodes, 5)
+snapshots.register('pool_status', collect_pool_status, 5)
+snapshots.register('pool_processes', collect_pool_processes, 5)
+snapshots.register('pool_pools', collect_pool_pools, 5)
+snapshots.register('replication_status', collect_replication_status, 5)
+snapshots.register('performance_metrics', collect_performance_metrics, 5)
+snapshots.register('query_statistics', collect_query_statistics, 10)
+snapshots.register('database_statistics', collect_database_statistics, 30)
+snapshots.register('cluster_status', cluster_monitor.get_cluster_status, 2)
+# Insight runs and fan-outs can take up to their timeouts, so they get their own workers
+snapshots.register('performance_insights', collect_performance_insights, 60, slow=True)
+snapshots.register('cluster_query_statistics', collect_cluster_query_statistics, 30, slow=True)
+snapshots.register('cluster_database_statistics', collect_cluster_database_statistics, 30, slow=True)
+snapshots.register('cluster_performance_insights', collect_cluster_performance_insights, 60, slow=True)
+
+@app.route('/api/stream')
+@login_required
+def stream():
+    """Server-Sent Events stream of snapshot updates for the requested topics"""
+    topics = [topic for topic in request.args.get('topics', '').split(',') if topic]
+    unknown = [topic for topic in topics if topic not in snapshots.datasets]
+    if not topics or unknown:
+        return jsonify({
+            'status': 'error',
+            'message': f"Unknown topics: {', '.join(unknown)}" if unknown else 'No topics requested',
+            'topics': sorted(snapshots.datasets)
+        }), 400
+    
+    def generate():
+        versions = {}
+        for topic in topics:
+            snapshots.refresh(topic)
+        
+        while True:
+            # Only topics whose version moved since the last push are sent
+            for topic in topics:
+                try:
+                    snapshot = snapshots.get(topic)
+                except Exception as e:
+                    app.logger.error(f"Error streaming {topic}: {str(e)}")
+                    continue
+                if versions.get(topic) != snapshot['version']:
+                    versions[topic] = snapshot['version']
+                    yield f"event: {topic}\ndata: {app.json.dumps(snapshot_payload(snapshot))}\n\n"
             
-            cur.close()
-            conn.close()
-        except Exception as e:
-            app.logger.error(f"Error getting pool stats: {str(e)}")
-            stats['error'] = str(e)
+            if not snapshots.wait_for_change(versions, timeout=STREAM_KEEPALIVE):
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+# Batch resources built from other data sets: name -> (data sets needed, builder)
+BATCH_COMPOSITES = {
+    'stats': (('pool_nodes', 'pool_processes'), combined_stats)
+}
+
+@app.route('/api/batch')
+@login_required
+def get_batch():
+    """Resolve several API resources in one round trip"""
+    resources = list(dict.fromkeys(name for name in request.args.get('r', '').split(',') if name))
+    unknown = [name for name in resources if name not in snapshots.datasets and name not in BATCH_COMPOSITES]
+    if not resources or unknown:
+        return jsonify({
+            'status': 'error',
+            'message': f"Unknown resources: {', '.join(unknown)}" if unknown else 'No resources requested',
+            'resources': sorted(list(snapshots.datasets) + list(BATCH_COMPOSITES))
+        }), 400
+    
+    try:
+        # Every underlying data set is resolved once, however many resources share it,
+        # and data sets without a snapshot yet are collected concurrently
+        names = []
+        for name in resources:
+            for dataset in BATCH_COMPOSITES[name][0] if name in BATCH_COMPOSITES else (name,):
+                if dataset not in names:
+                    names.append(dataset)
+        resolved = snapshots.get_many(names)
+        
+        data = {}
+        for name in resources:
+            if name in BATCH_COMPOSITES:
+                data[name] = BATCH_COMPOSITES[name][1](resolved)
+            else:
+                data[name] = snapshot_payload(resolved[name])
+        
+        return jsonify({'status': 'success', 'data': data})
         
-        return jsonify(stats)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        app.logger.error(f"Error resolving batch: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
 
 @app.route('/api/cluster_status')
 @login_required
@@ -1221,12 +1520,14 @@ def get_cluster_history():
     try:
         component_name = request.args.get('component')
         hours = int(request.args.get('hours', 24))
+        max_points = int(request.args.get('points', 500))
         
-        history = cluster_monitor.get_historical_data(component_name, hours)
+        history = cluster_monitor.get_history(component_name, hours, max_points)
         
         return jsonify({
             'status': 'success',
-            'data': history
+            'data': history['points'],
+            'resolution': history['resolution']
         })
         
     except Exception as e:
@@ -1249,6 +1550,65 @@ def trigger_cluster_check():
         app.logger.error(f"Error checking cluster: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+@app.route('/api/cluster_retention')
+@login_required
+def get_cluster_retention():
+    """Get progress and timing of the monitor database retention worker"""
+    try:
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'config': cluster_monitor.retention,
+                'last_run': cluster_monitor.retention_status
+            }
+        })
+        
+    except Exception as e:
+        app.logger.error(f"Error getting retention status: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@app.route('/api/connection_pools')
+@login_required
+def get_connection_pools():
+    """Get usage metrics for the database connection pools"""
+    try:
+        return jsonify({
+            'status': 'success',
+            'data': pools.stats()
+        })
+        
+    except Exception as e:
+        app.logger.error(f"Error getting connection pool stats: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@app.route('/api/query_cache')
+@login_required
+def get_query_cache():
+    """Get hit/miss counters and entry ages of the catalog query cache"""
+    try:
+        return jsonify({
+            'status': 'success',
+            'data': query_cache.stats()
+        })
+        
+    except Exception as e:
+        app.logger.error(f"Error getting query cache stats: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@app.route('/api/snapshots')
+@login_required
+def get_snapshots():
+    """Get versions and timing of the background data set snapshots"""
+    try:
+        return jsonify({
+            'status': 'success',
+            'data': snapshots.stats()
+        })
+        
+    except Exception as e:
+        app.logger.error(f"Error getting snapshot stats: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
 @app.route('/api/health_check')
 def health_check():
     """Comprehensive health check endpoint"""
@@ -1318,9 +1678,20 @@ def health_check():
 if __name__ == '__main__':
     # Start cluster monitoring when app starts
     cluster_monitor.start_monitoring(interval=30)
+    snapshots.start()
+    rate_engine.start()
+    host_engine.start()
+    statement_history.start()
     
     try:
         app.run(host='0.0.0.0', port=9000, debug=True)
     finally:
         # Stop monitoring on shutdown
+        snapshots.stop()
+        rate_engine.stop()
+        host_engine.stop()
+        statement_history.stop()
+        query_cache.stop()
+        insight_runner.stop()
+        backend_fanout.stop()
         cluster_monitor.stop_monitoring()
\ No newline at end of file
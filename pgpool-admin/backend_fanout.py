@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Backend Fan-Out Executor
+OPENSEWAVE PgPool Admin Dashboard
+
+Runs the same collector against every backend PgPool reports in SHOW POOL_NODES, in parallel,
+and returns per-node results. Helpers merge per-node rows into a cluster-wide view.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Iterable, List, Optional, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+# PgPool reports detached or unreachable backends with these statuses
+DOWN_STATUSES = ('down', 'unused')
+
+
+class BackendFanOut:
+    def __init__(self, discover: Callable[[], List[Dict[str, Any]]], connect: Callable[[str, Any], Any],
+                 max_workers: int = 4, timeout: float = 30):
+        # discover returns SHOW POOL_NODES rows; connect(host, port) returns a pooled connection
+        self.discover = discover
+        self.connect = connect
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fanout')
+
+    def nodes(self) -> List[Dict[str, Any]]:
+        """Backends that are up, named by hostname, or host:port when several share a hostname"""
+        rows = [row for row in self.discover() if row.get('hostname') and row.get('port')]
+        hostnames = [row['hostname'] for row in rows]
+        nodes = []
+        for row in rows:
+            if str(row.get('status', '')).lower() in DOWN_STATUSES:
+                continue
+            name = row['hostname'] if hostnames.count(row['hostname']) == 1 else f"{row['hostname']}:{row['port']}"
+            nodes.append({
+                'name': name,
+                'node_id': row.get('node_id'),
+                'host': row['hostname'],
+                'port': row['port'],
+                'role': row.get('role')
+            })
+        return nodes
+
+    def collect_node(self, node: Dict[str, Any], collect: Callable[[Callable[[], Any]], Any]) -> Dict[str, Any]:
+        start_time = time.time()
+        result = {key: node[key] for key in ('node_id', 'host', 'port', 'role')}
+        try:
+            result['data'] = collect(lambda: self.connect(node['host'], node['port']))
+            result['status'] = 'ok'
+        except Exception as e:
+            logger.error(f"Collection on {node['name']} failed: {e}")
+            result['data'] = None
+            result['status'] = 'error'
+            result['error'] = str(e).strip()
+        result['duration_ms'] = round((time.time() - start_time) * 1000, 1)
+        return result
+
+    def run(self, collect: Callable[[Callable[[], Any]], Any]) -> Dict[str, Any]:
+        """Run collect(connect) on every backend at once; failures and timeouts are reported per node"""
+        start_time = time.time()
+        nodes = self.nodes()
+        futures = {node['name']: (node, self.executor.submit(self.collect_node, node, collect)) for node in nodes}
+
+        results = {}
+        deadline = time.time() + self.timeout
+        for name, (node, future) in futures.items():
+            try:
+                results[name] = future.result(timeout=max(0, deadline - time.time()))
+            except FutureTimeout:
+                results[name] = {key: node[key] for key in ('node_id', 'host', 'port', 'role')}
+                results[name].update({'data': None, 'status': 'timeout',
+                                      'error': f"No result within {self.timeout}s"})
+
+        return {
+            'nodes': results,
+            'partial': any(result['status'] != 'ok' for result in results.values()),
+            'duration_ms': round((time.time() - start_time) * 1000, 1)
+        }
+
+    def stop(self):
+        self.executor.shutdown(wait=False)
+
+
+def succeeded(fanout: Dict[str, Any]) -> Dict[str, Any]:
+    """Data of every node whose collection succeeded, by node name"""
+    return {name: result['data'] for name, result in fanout['nodes'].items() if result['status'] == 'ok'}
+
+
+def merge_rows(rows_by_node: Dict[str, Iterable[Dict[str, Any]]], key: Callable[[Dict[str, Any]], Any],
+               sum_fields: Iterable[str], breakdown: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Merge rows sharing a key across nodes, summing sum_fields; other fields come from the first node.
+    breakdown names a summed field whose per-node values are kept under 'nodes'."""
+    sum_fields = tuple(sum_fields)
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for node, rows in rows_by_node.items():
+        for row in rows:
+            row_key = key(row)
+            target = merged.get(row_key)
+            if target is None:
+                target = merged[row_key] = dict(row)
+                for field in sum_fields:
+                    target[field] = 0
+                if breakdown:
+                    target['nodes'] = {}
+            for field in sum_fields:
+                target[field] += row.get(field) or 0
+            if breakdown:
+                target['nodes'][node] = target['nodes'].get(node, 0) + (row.get(breakdown) or 0)
+    return list(merged.values())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for API response serialization and compression
+Compares Flask's default JSON provider with json_provider.dumps_bytes (used by FastJSONProvider),
+and gzip/brotli sizes, on synthetic payloads shaped like the dashboard API responses.
+"""
+
+import gzip
+import time
+import random
+from decimal import Decimal
+from datetime import datetime, timedelta
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import json_provider
+
+ITERATIONS = 20
+
+def query_text(length):
+    """Generate a realistic-looking SQL statement of roughly the given length"""
+    columns = ', '.join(f"t.column_{i}" for i in range(length // 14))
+    return f"SELECT {columns} FROM public.orders t WHERE t.customer_id = $1 AND t.created_at > $2"
+
+def statement_row(i):
+    return {
+        'userid': 10,
+        'dbid': 16384,
+        'queryid': random.getrandbits(63),
+        'query': query_text(random.randint(200, 2000)),
+        'calls': random.randint(1, 10_000_000),
+        'total_exec_time': random.uniform(1, 1e7),
+        'mean_exec_time': random.uniform(0.01, 5000),
+        'min_exec_time': random.uniform(0.01, 10),
+        'max_exec_time': random.uniform(10, 60000),
+        'stddev_exec_time': random.uniform(0, 1000),
+        'rows': random.randint(0, 10_000_000),
+        'shared_blks_hit': random.randint(0, 10**9),
+        'shared_blks_read': random.randint(0, 10**7),
+        'blk_read_time': random.uniform(0, 1000),
+        'blk_write_time': random.uniform(0, 1000)
+    }
+
+def build_payloads():
+    now = datetime.now()
+    return {
+        'pool_nodes': {'status': 'success', 'data': [{
+            'node_id': str(i),
+            'hostname': f"pg-node-{i}",
+            'port': '6435',
+            'status': 'up',
+            'lb_weight': '0.500000',
+            'role': 'primary' if i == 0 else 'standby',
+            'select_cnt': str(random.randint(0, 10**6)),
+            'replication_delay': '0',
+            'last_status_change': now.strftime('%Y-%m-%d %H:%M:%S')
+        } for i in range(3)]},
+        'replication_status': {'status': 'success', 'data': [{
+            'client_addr': f"10.0.0.{i}",
+            'state': 'streaming',
+            'sync_state': 'async',
+            'sent_lag_bytes': Decimal(random.randint(0, 10**6)),
+            'flush_lag_bytes': Decimal(random.randint(0, 10**6)),
+            'replay_lag_bytes': Decimal(random.randint(0, 10**6))
+        } for i in range(2)]},
+        'query_statistics': {'status': 'success', 'data': {
+            'summary': {'total_queries': 120, 'active_queries': 4, 'idle_connections': 100,
+                        'waiting_queries': 1, 'longest_query_time': Decimal('12.345678')},
+            'top_queries': [statement_row(i) for i in range(50)],
+            'slow_queries': [statement_row(i) for i in range(20)],
+            'query_patterns': [statement_row(i) for i in range(20)],
+            'pg_stat_statements': True
+        }},
+        'execute_query (5000 rows)': {'status': 'success', 'data': {
+            'columns': ['id', 'customer', 'amount', 'created_at', 'age'],
+            'rows': [{
+                'id': i,
+                'customer': f"customer-{random.randint(1, 10**5)}",
+                'amount': Decimal(random.randint(0, 10**7)) / 100,
+                'created_at': now - timedelta(minutes=i),
+                'age': timedelta(minutes=i)
+            } for i in range(5000)],
+            'execution_time': 0.042,
+            'row_count': 5000
+        }}
+    }
+
+def measure(func, *args):
+    """Average milliseconds per call and the last result"""
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        result = func(*args)
+    return (time.perf_counter() - start) * 1000 / ITERATIONS, result
+
+def main():
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+
+    print(f"orjson: {'yes' if json_provider.orjson else 'no (stdlib fallback)'}, "
+          f"brotli: {'yes' if json_provider.brotli else 'no'}, {ITERATIONS} iterations\n")
+    print(f"{'payload':<28}{'bytes':>10}{'default ms':>12}{'fast ms':>10}{'speedup':>9}"
+          f"{'gzip bytes':>12}{'gzip ms':>9}{'br bytes':>10}{'br ms':>8}")
+
+    for name, payload in build_payloads().items():
+        # Flask's provider cannot encode timedelta, so it borrows the same default hook
+        default_ms, _ = measure(lambda: default_provider.dumps(payload, default=json_provider.default).encode())
+        fast_ms, body = measure(json_provider.dumps_bytes, payload)
+        gzip_ms, gzipped = measure(gzip.compress, body, json_provider.GZIP_LEVEL)
+
+        br_bytes, br_ms = '-', '-'
+        if json_provider.brotli:
+            br_time, compressed = measure(json_provider.compress, body, 'br')
+            br_bytes, br_ms = len(compressed), f"{br_time:.2f}"
+
+        print(f"{name:<28}{len(body):>10}{default_ms:>12.2f}{fast_ms:>10.2f}{default_ms / fast_ms:>8.1f}x"
+              f"{len(gzipped):>12}{gzip_ms:>9.2f}{br_bytes:>10}{br_ms:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -8,69 +8,352 @@ This service monitors PostgreSQL cluster components and tracks their status in S
 
 import sqlite3
 import time
+import queue
+import math
+import heapq
+import random
 import psycopg2
 import subprocess
+import shutil
 import json
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 import os
 import logging
+from pathlib import Path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ProbeConnection:
+    """Long-lived, auto-reconnecting connection used to probe a single component"""
+    
+    def __init__(self, config: Dict[str, Any], connect_timeout: int, query_timeout: int,
+                 min_backoff: float = 5, max_backoff: float = 60):
+        self.config = dict(config)
+        self.connect_timeout = connect_timeout
+        self.query_timeout = query_timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.conn = None
+        self.lock = threading.Lock()
+        self.backoff = 0
+        self.retry_at = 0.0
+        self.last_error = None
+    
+    def connect(self) -> Optional[int]:
+        """Ensure a usable connection; returns connect latency in ms, or None when reused"""
+        if self.conn is not None and not self.conn.closed:
+            return None
+        
+        now = time.time()
+        if now < self.retry_at:
+            raise psycopg2.OperationalError(
+                f"reconnect backoff ({self.retry_at - now:.0f}s left), last error: {self.last_error}"
+            )
+        
+        start_time = time.time()
+        try:
+            conn = psycopg2.connect(
+                host=self.config['host'],
+                port=self.config['port'],
+                user=self.config['user'],
+                password=self.config['password'],
+                database=self.config['database'],
+                connect_timeout=self.connect_timeout,
+                options=f"-c statement_timeout={self.query_timeout * 1000}"
+            )
+        except psycopg2.Error as e:
+            self.last_error = str(e).strip()
+            self.backoff = min(self.backoff * 2, self.max_backoff) if self.backoff else self.min_backoff
+            self.retry_at = time.time() + self.backoff
+            raise
+        
+        # Probes are read-only; autocommit keeps the session from idling in a transaction
+        conn.autocommit = True
+        self.conn = conn
+        self.backoff = 0
+        self.retry_at = 0.0
+        self.last_error = None
+        return int((time.time() - start_time) * 1000)
+    
+    def run(self, probe: Callable[[Any], Any]) -> Tuple[Any, Dict[str, Any]]:
+        """Run probe(cursor) on the persistent connection, reconnecting once if it went stale"""
+        with self.lock:
+            for attempt in range(2):
+                reused = self.conn is not None and not self.conn.closed
+                connect_time = self.connect()
+                start_time = time.time()
+                try:
+                    with self.conn.cursor() as cursor:
+                        result = probe(cursor)
+                except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                    self.close()
+                    # A reused connection may have been dropped server-side; retry on a fresh one
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                return result, {
+                    'connect_time_ms': connect_time or 0,
+                    'query_time_ms': int((time.time() - start_time) * 1000),
+                    'connection_reused': connect_time is None
+                }
+    
+    def close(self):
+        """Close the underlying connection, if any"""
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+
+
+class SQLiteWriter:
+    """Owns the only write connection to the monitor database and commits queued batches"""
+    
+    def __init__(self, db_path: str, max_batch: int = 200):
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.queue = queue.Queue()
+        
+        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        # Incremental vacuum takes effect right away on a new file; an existing one is converted
+        # later by the retention worker (ClusterMonitor.convert_to_incremental_vacuum)
+        self.conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        self.incremental_vacuum = self.conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA busy_timeout=5000')
+        # Not every SQLite build ships the math functions
+        self.conn.create_function('sqrt', 1, math.sqrt, deterministic=True)
+        
+        self.thread = threading.Thread(target=self.run, name='monitor-db-writer', daemon=True)
+        self.thread.start()
+    
+    def submit(self, statements: List[Tuple[str, tuple]], wait: bool = False,
+               timeout: Optional[float] = 30, exclusive: bool = False) -> Optional[List[int]]:
+        """Queue statements to be committed together; with wait=True returns their rowcounts.
+        exclusive statements (e.g. VACUUM) run on their own, outside any transaction."""
+        request = {
+            'statements': list(statements),
+            'exclusive': exclusive,
+            'done': threading.Event(),
+            'rowcounts': None,
+            'error': None
+        }
+        self.queue.put(request)
+        
+        if not wait:
+            return None
+        if not request['done'].wait(timeout):
+            raise TimeoutError(f"SQLite write not committed within {timeout}s")
+        if request['error']:
+            raise request['error']
+        return request['rowcounts']
+    
+    def flush(self, timeout: float = 30):
+        """Block until everything queued so far has been committed"""
+        self.submit([], wait=True, timeout=timeout)
+    
+    def close(self):
+        """Commit outstanding writes and stop the writer thread"""
+        self.queue.put(None)
+        self.thread.join(timeout=10)
+    
+    def run(self):
+        stopping = False
+        held = None
+        while not stopping or held:
+            request, held = held or self.queue.get(), None
+            if request is None:
+                break
+            
+            # Coalesce whatever else is already queued into the same transaction
+            batch = [request]
+            while len(batch) < self.max_batch and not request['exclusive']:
+                try:
+                    request = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                if request['exclusive']:
+                    held = request
+                    break
+                batch.append(request)
+            
+            try:
+                self.apply(batch)
+            except sqlite3.Error:
+                # Retry one by one so a single bad statement does not drop the rest
+                for request in batch:
+                    try:
+                        self.apply([request])
+                    except sqlite3.Error as e:
+                        request['error'] = e
+                        logger.error(f"SQLite write failed: {e}")
+            
+            for request in batch:
+                request['done'].set()
+        
+        self.conn.close()
+    
+    def apply(self, batch: List[Dict[str, Any]]):
+        cursor = self.conn.cursor()
+        if batch[0]['exclusive']:
+            request = batch[0]
+            request['rowcounts'] = []
+            for sql, params in request['statements']:
+                cursor.execute(sql, params)
+                request['rowcounts'].append(cursor.rowcount)
+            return
+        
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            for request in batch:
+                rowcounts = []
+                for sql, params in request['statements']:
+                    cursor.execute(sql, params)
+                    rowcounts.append(cursor.rowcount)
+                request['rowcounts'] = rowcounts
+            cursor.execute('COMMIT')
+        except sqlite3.Error:
+            cursor.execute('ROLLBACK')
+            raise
+
+
 class ClusterMonitor:
     def __init__(self, db_path: str = "cluster_status.db"):
         self.db_path = db_path
+        self.writer = SQLiteWriter(db_path)
+        self.read_uri = Path(db_path).resolve().as_uri() + '?mode=ro'
+        self.readers = threading.local()
         self.init_database()
         self.monitoring = False
         self.monitor_thread = None
         
-        # Configuration
+        # Configuration: PgPool is the discovery source; backends come from SHOW POOL_NODES
+        self.credentials = {
+            'user': os.environ.get('PGPOOL_USER', 'appuser'),
+            'password': os.environ.get('PGPOOL_PASSWORD', ''),
+            'database': os.environ.get('PGPOOL_DB', 'appdb')
+        }
+        self.pgpool_component = {
+            'type': 'pgpool',
+            'host': os.environ.get('PGPOOL_HOST', 'pgpool'),
+            'port': int(os.environ.get('PGPOOL_PORT', 5432)),
+            **self.credentials
+        }
+        # Seed backends probed until the first successful discovery replaces them
         self.components = {
-            'pg-master': {
-                'type': 'postgres',
-                'host': 'pg-master',
-                'port': 6435,
-                'user': os.environ.get('PGPOOL_USER', 'appuser'),
-                'password': os.environ.get('PGPOOL_PASSWORD', ''),
-                'database': os.environ.get('PGPOOL_DB', 'appdb')
-            },
-            'pg-replica': {
-                'type': 'postgres',
-                'host': 'pg-replica',
-                'port': 6435,
-                'user': os.environ.get('PGPOOL_USER', 'appuser'),
-                'password': os.environ.get('PGPOOL_PASSWORD', ''),
-                'database': os.environ.get('PGPOOL_DB', 'appdb')
-            },
-            'pgpool': {
-                'type': 'pgpool',
-                'host': 'pgpool',
-                'port': 5432,
-                'user': os.environ.get('PGPOOL_USER', 'appuser'),
-                'password': os.environ.get('PGPOOL_PASSWORD', ''),
-                'database': os.environ.get('PGPOOL_DB', 'appdb')
-            }
+            'pg-master': {'type': 'postgres', 'host': 'pg-master', 'port': 6435, **self.credentials},
+            'pg-replica': {'type': 'postgres', 'host': 'pg-replica', 'port': 6435, **self.credentials},
+            'pgpool': self.pgpool_component
         }
+        self.pool_nodes: Dict[str, Dict[str, Any]] = {}
         
         # Status thresholds
         self.thresholds = {
             'connection_timeout': 5,  # seconds
-            'query_timeout': 10,      # seconds
+            'query_timeout': 5,       # seconds, below probe_timeout so abandoned probes release their connection
             'max_response_time': 1000,  # milliseconds
+            'probe_timeout': 8,       # seconds, per component probe
+            'sweep_timeout': 15,      # seconds, whole check_all_components sweep
+            'summary_flush_interval': 300,  # seconds between daily summary flushes
+            # Consecutive sweeps a condition must hold before an event opens, or closes
+            'event_raise_after': {'component_down': 1, 'component_error': 2, 'slow_response': 3},
+            'event_clear_after': 2,
+            # Adaptive probe cadence around the monitoring interval
+            'probe_interval_min': 5,        # seconds, used while a component is unhealthy
+            'probe_interval_max_factor': 4, # stable components back off to at most this x interval
+            'probe_stable_after': 10,       # healthy probes before each back-off step
+            'probe_jitter': 0.1,            # +/- fraction applied to every interval
+            'deep_probe_interval': int(os.environ.get('MONITOR_DEEP_PROBE_INTERVAL', 300)),  # seconds
+            # statement_timeout of the deep metadata connection; pg_database_size is slow on large databases
+            'deep_probe_timeout': int(os.environ.get('MONITOR_DEEP_PROBE_TIMEOUT', 120)),  # seconds
             'critical_errors': ['connection refused', 'timeout', 'authentication failed']
         }
+        
+        # History tiers, finest first; raw rows arrive at the adaptive probe cadence
+        self.monitor_interval = 30
+        self.rollup_resolutions = {'1m': 60, '15m': 900, '1h': 3600}
+        self.rollup_watermarks: Dict[int, datetime] = {}
+        self.rollup_max_span = timedelta(hours=6)  # raw history rolled up per tier per pass
+        
+        # Retention runs in small batches on its own schedule so it never stalls the monitor loop
+        self.retention = {
+            'status_days': int(os.environ.get('MONITOR_RETENTION_DAYS', 30)),
+            'events_days': int(os.environ.get('MONITOR_RETENTION_DAYS', 30)),
+            'rollup_days': {60: 7, 900: 90, 3600: 365},
+            'batch_size': 500,
+            'batch_pause': 0.05,   # seconds between delete batches
+            'vacuum_pages': 256,   # pages reclaimed per incremental vacuum step
+            'interval': 3600       # seconds between retention runs
+        }
+        self.retention_status = {
+            'running': False,
+            'last_run': None,
+            'duration_ms': 0,
+            'batches': 0,
+            'deleted': {},
+            'reclaimed_pages': 0
+        }
+        self.retention_lock = threading.Lock()
+        self.vacuum_conversion_attempted = False
+        self.retention_stop = threading.Event()
+        self.retention_thread = None
+        
+        # Probe schedule: heap of (next due time, component name), one entry per component
+        self.probe_schedule: List[Tuple[float, str]] = []
+        self.stable_streaks: Dict[str, int] = {}
+        self.last_checked: Dict[str, float] = {}
+        self.monitor_stop = threading.Event()
+        
+        # Per-component event state; events are written on transitions, not every sweep
+        self.event_states: Dict[str, Dict[str, Any]] = {}
+        self.event_lock = threading.Lock()
+        self.load_event_states()
+        
+        # Daily statistics accumulate in memory and are flushed periodically
+        self.summary_accumulator: Dict[Tuple[Any, str], Dict[str, Any]] = {}
+        self.summary_lock = threading.Lock()
+        self.summary_flushed_at = time.time()
+        self.summary_flushed_date = datetime.now().date()
+        
+        # Cached deep metadata per component, refreshed every deep_probe_interval off the liveness path.
+        # Attempts are (started at, is_in_recovery), so a failing collection also waits a full interval.
+        self.deep_metadata: Dict[str, Dict[str, Any]] = {}
+        self.deep_attempts: Dict[str, Tuple[float, bool]] = {}
+        self.deep_in_flight: set = set()
+        self.deep_lock = threading.Lock()
+        
+        # One persistent connection per probed component, plus a separate one for its deep metadata
+        self.probe_connections: Dict[str, ProbeConnection] = {}
+        self.deep_probe_connections: Dict[str, ProbeConnection] = {}
+        self.probe_connections_lock = threading.Lock()
+        
+        # Probes run concurrently so a sweep takes as long as the slowest probe
+        self.probe_executor = ThreadPoolExecutor(
+            max_workers=int(os.environ.get('MONITOR_PROBE_WORKERS', 8)),
+            thread_name_prefix='cluster-probe'
+        )
+        # Deep metadata has its own workers so a slow pg_database_size never delays a sweep
+        self.deep_executor = ThreadPoolExecutor(
+            max_workers=int(os.environ.get('MONITOR_DEEP_PROBE_WORKERS', 2)),
+            thread_name_prefix='cluster-deep-probe'
+        )
     
     def init_database(self):
         """Initialize SQLite database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        statements = []
         
         # Create cluster_status table
-        cursor.execute('''
+        statements.append(('''
             CREATE TABLE IF NOT EXISTS cluster_status (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 component_name TEXT NOT NULL,
@@ -82,10 +365,23 @@ class ClusterMonitor:
                 metadata TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-        ''')
+        ''', ()))
+        
+        # Create component_latest table holding one row per component, kept in step with cluster_status
+        statements.append(('''
+            CREATE TABLE IF NOT EXISTS component_latest (
+                component_name TEXT PRIMARY KEY,
+                component_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                response_time_ms INTEGER,
+                last_check TIMESTAMP NOT NULL,
+                error_message TEXT,
+                metadata TEXT
+            )
+        ''', ()))
         
         # Create cluster_events table for significant events
-        cursor.execute('''
+        statements.append(('''
             CREATE TABLE IF NOT EXISTS cluster_events (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 event_type TEXT NOT NULL,
@@ -97,10 +393,10 @@ class ClusterMonitor:
                 resolved BOOLEAN DEFAULT FALSE,
                 resolved_at TIMESTAMP
             )
-        ''')
+        ''', ()))
         
         # Create cluster_summary table for daily statistics
-        cursor.execute('''
+        statements.append(('''
             CREATE TABLE IF NOT EXISTS cluster_summary (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 date DATE NOT NULL,
@@ -111,53 +407,127 @@ class ClusterMonitor:
                 avg_response_time_ms REAL DEFAULT 0,
                 max_response_time_ms INTEGER DEFAULT 0,
                 downtime_seconds INTEGER DEFAULT 0,
+                sum_response_time_ms REAL DEFAULT 0,
+                sum_sq_response_time_ms REAL DEFAULT 0,
+                stddev_response_time_ms REAL DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 UNIQUE(date, component_name)
             )
-        ''')
+        ''', ()))
+        
+        # Create cluster_rollup table holding per-bucket aggregates for each history tier
+        statements.append(('''
+            CREATE TABLE IF NOT EXISTS cluster_rollup (
+                resolution INTEGER NOT NULL,
+                bucket TIMESTAMP NOT NULL,
+                component_name TEXT NOT NULL,
+                component_type TEXT NOT NULL,
+                samples INTEGER NOT NULL,
+                up_samples INTEGER NOT NULL,
+                min_response_time_ms INTEGER,
+                max_response_time_ms INTEGER,
+                avg_response_time_ms REAL,
+                p95_response_time_ms INTEGER,
+                PRIMARY KEY (resolution, component_name, bucket)
+            )
+        ''', ()))
         
         # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cluster_status_component ON cluster_status(component_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cluster_status_timestamp ON cluster_status(last_check)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cluster_events_component ON cluster_events(component_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cluster_events_timestamp ON cluster_events(timestamp)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cluster_summary_date ON cluster_summary(date)')
-        
-        conn.commit()
-        conn.close()
+        statements.append(('CREATE INDEX IF NOT EXISTS idx_cluster_status_component ON cluster_status(component_name)', ()))
+        statements.append(('CREATE INDEX IF NOT EXISTS idx_cluster_status_timestamp ON cluster_status(last_check)', ()))
+        statements.append(('CREATE INDEX IF NOT EXISTS idx_cluster_events_component ON cluster_events(component_name)', ()))
+        statements.append(('CREATE INDEX IF NOT EXISTS idx_cluster_events_timestamp ON cluster_events(timestamp)', ()))
+        statements.append(('CREATE INDEX IF NOT EXISTS idx_cluster_events_open ON cluster_events(component_name, resolved)', ()))
+        statements.append(('CREATE INDEX IF NOT EXISTS idx_cluster_summary_date ON cluster_summary(date)', ()))
+        statements.append(('CREATE INDEX IF NOT EXISTS idx_cluster_rollup_bucket ON cluster_rollup(resolution, bucket)', ()))
+        
+        self.writer.submit(statements, wait=True)
+        self.migrate_database()
         logger.info(f"Database initialized: {self.db_path}")
     
-    def check_postgres_component(self, name: str, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Check PostgreSQL component status"""
-        start_time = time.time()
-        status = {
-            'name': name,
-            'type': config['type'],
-            'status': 'unknown',
-            'response_time_ms': 0,
-            'error_message': None,
-            'metadata': {}
-        }
+    def migrate_database(self):
+        """Add columns introduced after a database file was first created"""
+        cursor = self.read_connection().cursor()
+        cursor.execute('PRAGMA table_info(cluster_summary)')
+        summary_columns = {row[1] for row in cursor.fetchall()}
+        cursor.execute('SELECT EXISTS (SELECT 1 FROM component_latest)')
+        has_latest = cursor.fetchone()[0]
+        cursor.close()
         
-        try:
-            # Test connection
-            conn = psycopg2.connect(
-                host=config['host'],
-                port=config['port'],
-                user=config['user'],
-                password=config['password'],
-                database=config['database'],
-                connect_timeout=self.thresholds['connection_timeout']
-            )
-            
-            cursor = conn.cursor()
+        statements = []
+        if 'sum_response_time_ms' not in summary_columns:
+            statements.extend([
+                ('ALTER TABLE cluster_summary ADD COLUMN sum_response_time_ms REAL DEFAULT 0', ()),
+                ('ALTER TABLE cluster_summary ADD COLUMN sum_sq_response_time_ms REAL DEFAULT 0', ()),
+                ('ALTER TABLE cluster_summary ADD COLUMN stddev_response_time_ms REAL DEFAULT 0', ()),
+                # Seed the running sums from the stored average so existing days keep merging sensibly
+                ('''
+                    UPDATE cluster_summary
+                    SET sum_response_time_ms = avg_response_time_ms * total_checks,
+                        sum_sq_response_time_ms = avg_response_time_ms * avg_response_time_ms * total_checks
+                ''', ())
+            ])
+        
+        if not has_latest:
+            # Backfill the latest-status table from history kept before it existed
+            statements.append(('''
+                INSERT OR REPLACE INTO component_latest
+                (component_name, component_type, status, response_time_ms, last_check, error_message, metadata)
+                SELECT component_name, component_type, status, response_time_ms,
+                       last_check, error_message, metadata
+                FROM cluster_status
+                WHERE (component_name, last_check) IN (
+                    SELECT component_name, MAX(last_check)
+                    FROM cluster_status
+                    GROUP BY component_name
+                )
+            ''', ()))
+        
+        if statements:
+            self.writer.submit(statements, wait=True)
+            logger.info(f"Database migrated: {len(statements)} statements applied")
+    
+    def read_connection(self) -> sqlite3.Connection:
+        """Per-thread read-only connection; under WAL it never blocks on the writer"""
+        conn = getattr(self.readers, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.read_uri, uri=True, isolation_level=None)
+            self.readers.conn = conn
+        return conn
+    
+    def get_probe_connection(self, name: str, config: Dict[str, Any], deep: bool = False) -> ProbeConnection:
+        """Return the persistent probe connection for a component, replacing it if its config changed"""
+        connections = self.deep_probe_connections if deep else self.probe_connections
+        with self.probe_connections_lock:
+            probe_conn = connections.get(name)
+            if probe_conn is None or probe_conn.config != config:
+                if probe_conn is not None:
+                    probe_conn.close()
+                probe_conn = ProbeConnection(
+                    config,
+                    connect_timeout=self.thresholds['connection_timeout'],
+                    query_timeout=self.thresholds['deep_probe_timeout' if deep else 'query_timeout']
+                )
+                connections[name] = probe_conn
+            return probe_conn
+    
+    def close_probe_connections(self):
+        """Close all persistent probe connections"""
+        with self.probe_connections_lock:
+            for probe_conn in [*self.probe_connections.values(), *self.deep_probe_connections.values()]:
+                probe_conn.close()
+            self.probe_connections.clear()
+            self.deep_probe_connections.clear()
+    
+    def collect_deep_metadata(self, name: str, config: Dict[str, Any]):
+        """Refresh a component's deep metadata on its own connection; failures keep the previous snapshot"""
+        def probe(cursor):
+            cursor.execute("SELECT pg_is_in_recovery()")
+            is_in_recovery = cursor.fetchone()[0]
             
-            # Test basic query
-            cursor.execute("SELECT version(), pg_is_in_recovery(), current_database(), current_user")
+            cursor.execute("SELECT version(), current_database(), current_user")
             result = cursor.fetchone()
             
-            response_time = int((time.time() - start_time) * 1000)
-            
             # Get additional metrics
             cursor.execute('''
                 SELECT 
@@ -169,11 +539,11 @@ class ClusterMonitor:
             
             # Check replication status if not in recovery
             replication_info = {}
-            if not result[1]:  # Not in recovery (master)
-                cursor.execute("SELECT * FROM pg_stat_replication")
+            if not is_in_recovery:  # Not in recovery (master)
+                cursor.execute("SELECT count(*) FROM pg_stat_replication")
                 replication_info = {
                     'is_master': True,
-                    'replicas': len(cursor.fetchall())
+                    'replicas': cursor.fetchone()[0]
                 }
             else:  # In recovery (replica)
                 cursor.execute("SELECT pg_last_wal_receive_lsn(), pg_last_wal_replay_lsn()")
@@ -184,23 +554,91 @@ class ClusterMonitor:
                     'replay_lsn': str(wal_info[1]) if wal_info[1] else None
                 }
             
+            return is_in_recovery, {
+                'version': result[0],
+                'database': result[1],
+                'user': result[2],
+                'database_size': metrics[0],
+                'active_connections': metrics[1],
+                'total_connections': metrics[2],
+                'replication': replication_info
+            }
+        
+        try:
+            (is_in_recovery, data), _ = self.get_probe_connection(name, config, deep=True).run(probe)
+            with self.deep_lock:
+                self.deep_metadata[name] = {
+                    'collected_at': time.time(),
+                    'is_in_recovery': is_in_recovery,
+                    'data': data
+                }
+        except Exception as e:
+            logger.warning(f"Deep metadata collection for {name} failed: {e}")
+        finally:
+            with self.deep_lock:
+                self.deep_in_flight.discard(name)
+    
+    def schedule_deep_metadata(self, name: str, config: Dict[str, Any], is_in_recovery: bool):
+        """Queue a deep metadata refresh when it is due or the node changed role; never waits for it"""
+        now = time.time()
+        with self.deep_lock:
+            attempt = self.deep_attempts.get(name)
+            if name in self.deep_in_flight:
+                return
+            if (attempt is not None
+                    and now - attempt[0] < self.thresholds['deep_probe_interval']
+                    and attempt[1] == is_in_recovery):
+                return
+            self.deep_attempts[name] = (now, is_in_recovery)
+            self.deep_in_flight.add(name)
+        try:
+            self.deep_executor.submit(self.collect_deep_metadata, name, config)
+        except RuntimeError:
+            # Executor already shut down
+            with self.deep_lock:
+                self.deep_in_flight.discard(name)
+    
+    def check_postgres_component(self, name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Check PostgreSQL component status"""
+        start_time = time.time()
+        status = {
+            'name': name,
+            'type': config['type'],
+            'status': 'unknown',
+            'response_time_ms': 0,
+            'error_message': None,
+            'metadata': {}
+        }
+        
+        def probe(cursor):
+            # Liveness only; deep metadata is refreshed in the background and served from cache
+            liveness_start = time.time()
+            cursor.execute("SELECT pg_is_in_recovery()")
+            is_in_recovery = cursor.fetchone()[0]
+            liveness_time = int((time.time() - liveness_start) * 1000)
+            return {
+                'is_in_recovery': is_in_recovery,
+                'liveness_time_ms': liveness_time
+            }
+        
+        try:
+            liveness, timings = self.get_probe_connection(name, config).run(probe)
+            self.schedule_deep_metadata(name, config, liveness['is_in_recovery'])
+            
+            with self.deep_lock:
+                cached = self.deep_metadata.get(name)
+            metadata = dict(cached['data']) if cached else {}
+            metadata.update(liveness)
+            metadata.update(timings)
+            metadata['deep_metadata_at'] = (datetime.fromtimestamp(cached['collected_at']).isoformat()
+                                            if cached else None)
+            
             status.update({
                 'status': 'online',
-                'response_time_ms': response_time,
-                'metadata': {
-                    'version': result[0],
-                    'is_in_recovery': result[1],
-                    'database': result[2],
-                    'user': result[3],
-                    'database_size': metrics[0],
-                    'active_connections': metrics[1],
-                    'total_connections': metrics[2],
-                    'replication': replication_info
-                }
+                'response_time_ms': metadata['liveness_time_ms'],
+                'metadata': metadata
             })
             
-            conn.close()
-            
         except psycopg2.OperationalError as e:
             response_time = int((time.time() - start_time) * 1000)
             status.update({
@@ -233,53 +671,45 @@ class ClusterMonitor:
             'metadata': {}
         }
         
-        try:
-            # Test connection through PgPool
-            conn = psycopg2.connect(
-                host=config['host'],
-                port=config['port'],
-                user=config['user'],
-                password=config['password'],
-                database=config['database'],
-                connect_timeout=self.thresholds['connection_timeout']
-            )
-            
-            cursor = conn.cursor()
-            
+        def probe(cursor):
             # Test basic query
             cursor.execute("SELECT version(), current_database()")
             result = cursor.fetchone()
             
-            response_time = int((time.time() - start_time) * 1000)
-            
             # Get PgPool specific information
             try:
                 cursor.execute("SHOW pool_nodes")
-                pool_nodes = cursor.fetchall()
-            except:
+                columns = [desc[0] for desc in cursor.description]
+                pool_nodes = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            except psycopg2.DatabaseError:
                 pool_nodes = []
             
             # Get connection pool stats
             try:
                 cursor.execute("SELECT count(*) FROM pg_stat_activity")
                 connection_count = cursor.fetchone()[0]
-            except:
+            except psycopg2.DatabaseError:
                 connection_count = 0
             
+            return {
+                'version': result[0],
+                'database': result[1],
+                'pool_nodes': len(pool_nodes),
+                'active_connections': connection_count,
+                'nodes_info': [self.parse_pool_node(node) for node in pool_nodes]
+            }
+        
+        try:
+            # Test connection through PgPool
+            metadata, timings = self.get_probe_connection(name, config).run(probe)
+            metadata.update(timings)
+            
             status.update({
                 'status': 'online',
-                'response_time_ms': response_time,
-                'metadata': {
-                    'version': result[0],
-                    'database': result[1],
-                    'pool_nodes': len(pool_nodes),
-                    'active_connections': connection_count,
-                    'nodes_info': [{'node_id': i, 'status': 'active'} for i in range(len(pool_nodes))]
-                }
+                'response_time_ms': timings['query_time_ms'],
+                'metadata': metadata
             })
             
-            conn.close()
-            
         except psycopg2.OperationalError as e:
             response_time = int((time.time() - start_time) * 1000)
             status.update({
@@ -300,6 +730,66 @@ class ClusterMonitor:
         
         return status
     
+    def parse_pool_node(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize one SHOW POOL_NODES row; column sets differ between PgPool versions"""
+        def number(value):
+            try:
+                return float(value) if '.' in str(value) else int(value)
+            except (TypeError, ValueError):
+                return value
+        
+        return {
+            'node_id': number(node.get('node_id')),
+            'hostname': node.get('hostname'),
+            'port': number(node.get('port')),
+            'status': node.get('status'),
+            'pg_status': node.get('pg_status'),
+            'role': node.get('role'),
+            'pg_role': node.get('pg_role'),
+            'lb_weight': number(node.get('lb_weight')),
+            'select_cnt': number(node.get('select_cnt')),
+            'load_balance_node': node.get('load_balance_node') == 'true',
+            'replication_delay': number(node.get('replication_delay')),
+            'replication_state': node.get('replication_state'),
+            'last_status_change': node.get('last_status_change')
+        }
+    
+    def update_backends(self, nodes_info: List[Dict[str, Any]]) -> List[str]:
+        """Replace the probed backends with the set PgPool currently reports; returns removed names"""
+        hostnames = [node['hostname'] for node in nodes_info]
+        backends = {}
+        pool_nodes = {}
+        for node in nodes_info:
+            if not node['hostname'] or not node['port']:
+                continue
+            # Fall back to host:port only when several backends share a hostname
+            name = node['hostname'] if hostnames.count(node['hostname']) == 1 else f"{node['hostname']}:{node['port']}"
+            backends[name] = {'type': 'postgres', 'host': node['hostname'], 'port': node['port'], **self.credentials}
+            pool_nodes[name] = node
+        
+        if not backends:
+            return []
+        
+        removed = [name for name, config in self.components.items()
+                   if config['type'] == 'postgres' and name not in backends]
+        added = [name for name in backends if name not in self.components]
+        
+        self.pool_nodes = pool_nodes
+        self.components = {**backends, 'pgpool': self.pgpool_component}
+        
+        if added or removed:
+            logger.info(f"Backend discovery: added {added or 'none'}, removed {removed or 'none'}")
+        for name in removed:
+            with self.probe_connections_lock:
+                probe_conns = [self.probe_connections.pop(name, None), self.deep_probe_connections.pop(name, None)]
+            for probe_conn in probe_conns:
+                if probe_conn is not None:
+                    probe_conn.close()
+            with self.deep_lock:
+                self.deep_metadata.pop(name, None)
+                self.deep_attempts.pop(name, None)
+        return removed
+    
     def check_component(self, name: str, config: Dict[str, Any]) -> Dict[str, Any]:
         """Check individual component status"""
         if config['type'] == 'postgres':
@@ -316,16 +806,9 @@ class ClusterMonitor:
                 'metadata': {}
             }
     
-    def save_status(self, status: Dict[str, Any]):
-        """Save component status to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO cluster_status 
-            (component_name, component_type, status, response_time_ms, last_check, error_message, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
+    def status_statements(self, status: Dict[str, Any]) -> List[Tuple[str, tuple]]:
+        """Build the history INSERT and latest-status UPSERT recording one component status"""
+        params = (
             status['name'],
             status['type'],
             status['status'],
@@ -333,100 +816,312 @@ class ClusterMonitor:
             datetime.now(),
             status['error_message'],
             json.dumps(status['metadata'])
-        ))
-        
-        conn.commit()
-        conn.close()
+        )
+        return [('''
+            INSERT INTO cluster_status 
+            (component_name, component_type, status, response_time_ms, last_check, error_message, metadata)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', params), ('''
+            INSERT OR REPLACE INTO component_latest
+            (component_name, component_type, status, response_time_ms, last_check, error_message, metadata)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', params)]
     
-    def log_event(self, event_type: str, component_name: str, severity: str, message: str, details: str = None):
-        """Log significant cluster events"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+    def save_status(self, status: Dict[str, Any]):
+        """Save component status to database"""
+        self.writer.submit(self.status_statements(status))
+    
+    def event_statement(self, event_type: str, component_name: str, severity: str, message: str,
+                        details: str = None) -> Tuple[str, tuple]:
+        """Build the INSERT recording one cluster event"""
+        logger.info(f"Event logged: {severity} - {component_name} - {message}")
+        return ('''
             INSERT INTO cluster_events 
             (event_type, component_name, severity, message, details)
             VALUES (?, ?, ?, ?, ?)
         ''', (event_type, component_name, severity, message, details))
-        
-        conn.commit()
-        conn.close()
-        logger.info(f"Event logged: {severity} - {component_name} - {message}")
     
-    def update_daily_summary(self, status: Dict[str, Any]):
-        """Update daily statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+    def log_event(self, event_type: str, component_name: str, severity: str, message: str, details: str = None):
+        """Log significant cluster events"""
+        self.writer.submit([self.event_statement(event_type, component_name, severity, message, details)])
+    
+    def update_daily_summary(self, status: Dict[str, Any], interval: float = None):
+        """Fold one check into the in-memory daily statistics"""
+        interval = interval if interval is not None else self.monitor_interval
         today = datetime.now().date()
-        component_name = status['name']
         is_successful = status['status'] == 'online'
+        response_time = status['response_time_ms'] or 0
         
+        with self.summary_lock:
+            acc = self.summary_accumulator.get((today, status['name']))
+            if acc is None:
+                acc = self.summary_accumulator[(today, status['name'])] = {
+                    'total_checks': 0,
+                    'successful_checks': 0,
+                    'failed_checks': 0,
+                    'sum_response_time_ms': 0.0,
+                    'sum_sq_response_time_ms': 0.0,
+                    'max_response_time_ms': 0,
+                    'downtime_seconds': 0
+                }
+            acc['total_checks'] += 1
+            acc['successful_checks'] += 1 if is_successful else 0
+            acc['failed_checks'] += 0 if is_successful else 1
+            acc['sum_response_time_ms'] += response_time
+            acc['sum_sq_response_time_ms'] += response_time * response_time
+            acc['max_response_time_ms'] = max(acc['max_response_time_ms'], response_time)
+            # A failed check accounts for the time since the previous check of that component
+            acc['downtime_seconds'] += 0 if is_successful else int(round(interval))
+    
+    def summary_flush_statements(self, force: bool = False) -> List[Tuple[str, tuple]]:
+        """Drain the daily statistics accumulator into UPSERTs when the flush interval or day has rolled over"""
+        today = datetime.now().date()
+        with self.summary_lock:
+            due = (force
+                   or today != self.summary_flushed_date
+                   or time.time() - self.summary_flushed_at >= self.thresholds['summary_flush_interval'])
+            if not due or not self.summary_accumulator:
+                return []
+            pending = self.summary_accumulator
+            self.summary_accumulator = {}
+            self.summary_flushed_at = time.time()
+            self.summary_flushed_date = today
+        
+        statements = []
+        for (date, component_name), acc in pending.items():
+            statements.append(('''
+                INSERT INTO cluster_summary 
+                (date, component_name, total_checks, successful_checks, failed_checks,
+                 sum_response_time_ms, sum_sq_response_time_ms, avg_response_time_ms,
+                 stddev_response_time_ms, max_response_time_ms, downtime_seconds)
+                VALUES (:date, :component_name, :total_checks, :successful_checks, :failed_checks,
+                        :sum_response_time_ms, :sum_sq_response_time_ms,
+                        :sum_response_time_ms / :total_checks, 0,
+                        :max_response_time_ms, :downtime_seconds)
+                ON CONFLICT(date, component_name) DO UPDATE SET
+                    total_checks = total_checks + excluded.total_checks,
+                    successful_checks = successful_checks + excluded.successful_checks,
+                    failed_checks = failed_checks + excluded.failed_checks,
+                    sum_response_time_ms = sum_response_time_ms + excluded.sum_response_time_ms,
+                    sum_sq_response_time_ms = sum_sq_response_time_ms + excluded.sum_sq_response_time_ms,
+                    avg_response_time_ms = (sum_response_time_ms + excluded.sum_response_time_ms)
+                                           / (total_checks + excluded.total_checks),
+                    max_response_time_ms = MAX(max_response_time_ms, excluded.max_response_time_ms),
+                    downtime_seconds = downtime_seconds + excluded.downtime_seconds
+            ''', dict(acc, date=date, component_name=component_name)))
+            # Population stddev from the merged running sums
+            statements.append(('''
+                UPDATE cluster_summary
+                SET stddev_response_time_ms = sqrt(MAX(
+                    sum_sq_response_time_ms / total_checks
+                    - (sum_response_time_ms / total_checks) * (sum_response_time_ms / total_checks), 0))
+                WHERE date = ? AND component_name = ? AND total_checks > 0
+            ''', (date, component_name)))
+        return statements
+    
+    def flush_daily_summary(self):
+        """Write accumulated daily statistics to the database now"""
+        statements = self.summary_flush_statements(force=True)
+        if statements:
+            self.writer.submit(statements, wait=True)
+    
+    def classify_status(self, status: Dict[str, Any]) -> Optional[str]:
+        """Map a check result to the problem it indicates, or None when healthy"""
+        if status['status'] == 'offline':
+            return 'component_down'
+        if status['status'] == 'error':
+            return 'component_error'
+        if status['response_time_ms'] > self.thresholds['max_response_time']:
+            return 'slow_response'
+        return None
+    
+    def load_event_states(self):
+        """Resume tracking problems that were still open when the monitor last stopped"""
+        cursor = self.read_connection().cursor()
         cursor.execute('''
-            INSERT OR REPLACE INTO cluster_summary 
-            (date, component_name, total_checks, successful_checks, failed_checks, 
-             avg_response_time_ms, max_response_time_ms, downtime_seconds)
-            VALUES (?, ?, 
-                COALESCE((SELECT total_checks FROM cluster_summary WHERE date = ? AND component_name = ?), 0) + 1,
-                COALESCE((SELECT successful_checks FROM cluster_summary WHERE date = ? AND component_name = ?), 0) + ?,
-                COALESCE((SELECT failed_checks FROM cluster_summary WHERE date = ? AND component_name = ?), 0) + ?,
-                (COALESCE((SELECT avg_response_time_ms FROM cluster_summary WHERE date = ? AND component_name = ?), 0) + ?) / 2,
-                MAX(COALESCE((SELECT max_response_time_ms FROM cluster_summary WHERE date = ? AND component_name = ?), 0), ?),
-                COALESCE((SELECT downtime_seconds FROM cluster_summary WHERE date = ? AND component_name = ?), 0) + ?
-            )
-        ''', (
-            today, component_name,
-            today, component_name,
-            today, component_name, 1 if is_successful else 0,
-            today, component_name, 0 if is_successful else 1,
-            today, component_name, status['response_time_ms'],
-            today, component_name, status['response_time_ms'],
-            today, component_name, 0 if is_successful else 30  # 30 seconds downtime per failed check
-        ))
-        
-        conn.commit()
-        conn.close()
+            SELECT component_name, event_type
+            FROM cluster_events
+            WHERE resolved = 0 AND event_type IN ('component_down', 'component_error', 'slow_response')
+            ORDER BY timestamp
+        ''')
+        for component_name, event_type in cursor.fetchall():
+            self.event_states[component_name] = {'active': event_type, 'candidate': event_type, 'streak': 0}
+        cursor.close()
+    
+    def transition_statements(self, status: Dict[str, Any]) -> List[Tuple[str, tuple]]:
+        """Advance a component's event state and build statements for any transition it makes"""
+        name = status['name']
+        observed = self.classify_status(status)
+        
+        with self.event_lock:
+            state = self.event_states.setdefault(name, {'active': None, 'candidate': None, 'streak': 0})
+            if observed == state['candidate']:
+                state['streak'] += 1
+            else:
+                state['candidate'] = observed
+                state['streak'] = 1
+            
+            # Hysteresis: a new condition must persist before it replaces the active one
+            if observed == state['active']:
+                return []
+            required = (self.thresholds['event_clear_after'] if observed is None
+                        else self.thresholds['event_raise_after'][observed])
+            if state['streak'] < required:
+                return []
+            
+            previous = state['active']
+            state['active'] = observed
+        
+        statements = []
+        if previous is not None:
+            statements.append(('''
+                UPDATE cluster_events
+                SET resolved = 1, resolved_at = CURRENT_TIMESTAMP
+                WHERE component_name = ? AND event_type = ? AND resolved = 0
+            ''', (name, previous)))
+        
+        if observed == 'component_down':
+            statements.append(self.event_statement('component_down', name, 'critical', 
+                              f"Component {name} is offline", status['error_message']))
+        elif observed == 'component_error':
+            statements.append(self.event_statement('component_error', name, 'warning', 
+                              f"Component {name} has errors", status['error_message']))
+        elif observed == 'slow_response':
+            statements.append(self.event_statement('slow_response', name, 'warning', 
+                              f"Component {name} response time is high: {status['response_time_ms']}ms"))
+        else:
+            statements.append(self.event_statement('component_recovered', name, 'info', 
+                              f"Component {name} recovered", f"Resolved {previous}"))
+        return statements
+    
+    def probe_timeout_status(self, name: str, config: Dict[str, Any], elapsed: float) -> Dict[str, Any]:
+        """Build the status reported for a probe that missed its deadline"""
+        return {
+            'name': name,
+            'type': config['type'],
+            'status': 'offline',
+            'response_time_ms': int(elapsed * 1000),
+            'error_message': f"Probe timed out after {elapsed:.1f}s",
+            'metadata': {}
+        }
+    
+    def probe_components(self, components: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Probe components concurrently; each probe gets probe_timeout from its own start, the sweep sweep_timeout"""
+        sweep_start = time.time()
+        sweep_deadline = sweep_start + self.thresholds['sweep_timeout']
+        probe_timeout = self.thresholds['probe_timeout']
+        # Probes queued behind busy workers only start their clock once they run
+        started: Dict[str, float] = {}
+        
+        def run_probe(name, config):
+            started[name] = time.time()
+            return self.check_component(name, config)
+        
+        futures = {
+            name: self.probe_executor.submit(run_probe, name, config)
+            for name, config in components.items()
+        }
+        
+        statuses: Dict[str, Dict[str, Any]] = {}
+        pending = dict(futures)
+        while pending:
+            now = time.time()
+            for name in list(pending):
+                future = pending[name]
+                if future.done():
+                    del pending[name]
+                    try:
+                        statuses[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Probe for {name} raised: {e}")
+                        statuses[name] = {
+                            'name': name,
+                            'type': components[name]['type'],
+                            'status': 'error',
+                            'response_time_ms': int((now - started.get(name, sweep_start)) * 1000),
+                            'error_message': str(e),
+                            'metadata': {}
+                        }
+                else:
+                    probe_expired = name in started and now - started[name] >= probe_timeout
+                    if not (probe_expired or now >= sweep_deadline):
+                        continue
+                    # Leave the straggler running; its connect/statement timeouts will reap it
+                    del pending[name]
+                    future.cancel()
+                    limit = f"{probe_timeout}s probe" if probe_expired else f"{self.thresholds['sweep_timeout']}s sweep"
+                    logger.warning(f"Probe for {name} exceeded the {limit} deadline")
+                    statuses[name] = self.probe_timeout_status(name, components[name],
+                                                               now - started.get(name, sweep_start))
+            if not pending:
+                break
+            
+            next_deadline = min([sweep_deadline] + [started[name] + probe_timeout for name in pending if name in started])
+            # Wake on the next completion or deadline; probes start asynchronously, so re-check often
+            wait(pending.values(), timeout=max(0.0, min(next_deadline - time.time(), 0.5)),
+                 return_when=FIRST_COMPLETED)
+        
+        results = [statuses[name] for name in futures]
+        logger.info(f"Sweep of {len(results)} components finished in {int((time.time() - sweep_start) * 1000)}ms")
+        return results
     
     def check_all_components(self) -> List[Dict[str, Any]]:
         """Check all cluster components"""
-        results = []
+        return self.check_components(self.components)
+    
+    def check_components(self, components: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Probe the given components and record the results"""
+        results = self.probe_components(components)
+        now = time.time()
+        
+        # PgPool's view of its backends drives which nodes get probed from here on
+        removed = []
+        for status in results:
+            if status['type'] == 'pgpool' and status['status'] == 'online':
+                removed = self.update_backends(status['metadata'].get('nodes_info', []))
+        max_interval = self.monitor_interval * self.thresholds['probe_interval_max_factor']
         
-        for name, config in self.components.items():
-            status = self.check_component(name, config)
-            results.append(status)
+        # The whole sweep is committed as a single transaction
+        statements = []
+        for status in results:
+            name = status['name']
+            if name in self.pool_nodes:
+                status['metadata']['pool_node'] = self.pool_nodes[name]
+            elapsed = min(now - self.last_checked.get(name, now - self.monitor_interval), max_interval)
+            self.last_checked[name] = now
             
             # Save to database
-            self.save_status(status)
-            self.update_daily_summary(status)
+            statements.extend(self.status_statements(status))
+            self.update_daily_summary(status, elapsed)
             
-            # Log significant events
-            if status['status'] == 'offline':
-                self.log_event('component_down', name, 'critical', 
-                             f"Component {name} is offline", status['error_message'])
-            elif status['status'] == 'error':
-                self.log_event('component_error', name, 'warning', 
-                             f"Component {name} has errors", status['error_message'])
-            elif status['response_time_ms'] > self.thresholds['max_response_time']:
-                self.log_event('slow_response', name, 'warning', 
-                             f"Component {name} response time is high: {status['response_time_ms']}ms")
+            # Log significant events on state transitions only
+            statements.extend(self.transition_statements(status))
+        
+        # Backends PgPool no longer reports drop out of the current status view
+        for name in removed:
+            statements.append(('DELETE FROM component_latest WHERE component_name = ?', (name,)))
+            statements.append(('''
+                UPDATE cluster_events
+                SET resolved = 1, resolved_at = CURRENT_TIMESTAMP
+                WHERE component_name = ? AND resolved = 0
+            ''', (name,)))
+            with self.event_lock:
+                self.event_states.pop(name, None)
+        
+        statements.extend(self.summary_flush_statements())
+        self.writer.submit(statements)
         
         return results
     
     def get_cluster_status(self) -> Dict[str, Any]:
         """Get current cluster status summary"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.read_connection().cursor()
         
         # Get latest status for each component
         cursor.execute('''
             SELECT component_name, component_type, status, response_time_ms, 
                    last_check, error_message, metadata
-            FROM cluster_status
-            WHERE (component_name, last_check) IN (
-                SELECT component_name, MAX(last_check)
-                FROM cluster_status
-                GROUP BY component_name
-            )
+            FROM component_latest
             ORDER BY component_name
         ''')
         
@@ -444,7 +1139,8 @@ class ClusterMonitor:
         
         # Get recent events
         cursor.execute('''
-            SELECT event_type, component_name, severity, message, details, timestamp
+            SELECT event_type, component_name, severity, message, details, timestamp,
+                   resolved, resolved_at
             FROM cluster_events
             WHERE timestamp > datetime('now', '-1 day')
             ORDER BY timestamp DESC
@@ -459,10 +1155,12 @@ class ClusterMonitor:
                 'severity': row[2],
                 'message': row[3],
                 'details': row[4],
-                'timestamp': row[5]
+                'timestamp': row[5],
+                'resolved': bool(row[6]),
+                'resolved_at': row[7]
             })
         
-        conn.close()
+        cursor.close()
         
         # Calculate overall cluster health
         online_count = sum(1 for c in components if c['status'] == 'online')
@@ -477,23 +1175,23 @@ class ClusterMonitor:
                 'total_components': total_count,
                 'online_components': online_count,
                 'offline_components': total_count - online_count,
-                'last_check': datetime.now().isoformat()
+                # Newest probe rather than now(), so an unchanged cluster yields an unchanged snapshot
+                'last_check': max((c['last_check'] for c in components if c['last_check']), default=None)
             }
         }
     
     def get_historical_data(self, component_name: str = None, hours: int = 24) -> List[Dict[str, Any]]:
         """Get historical status data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.read_connection().cursor()
         
         query = '''
             SELECT component_name, component_type, status, response_time_ms, 
                    last_check, error_message
             FROM cluster_status
-            WHERE last_check > datetime('now', '-{} hours')
-        '''.format(hours)
+            WHERE last_check > ?
+        '''
         
-        params = []
+        params = [datetime.now() - timedelta(hours=hours)]
         if component_name:
             query += ' AND component_name = ?'
             params.append(component_name)
@@ -513,51 +1211,416 @@ class ClusterMonitor:
                 'error_message': row[5]
             })
         
-        conn.close()
+        cursor.close()
         return history
     
+    def select_resolution(self, hours: float, max_points: int, component_name: str = None) -> str:
+        """Pick the finest history tier that keeps a component's series within max_points"""
+        window = hours * 3600
+        # Adaptive probing makes the raw row rate vary, so raw history is sized by counting it
+        if self.count_raw_points(hours, component_name) <= max_points:
+            return 'raw'
+        for label, seconds in self.rollup_resolutions.items():
+            if window / seconds <= max_points:
+                return label
+        return list(self.rollup_resolutions)[-1]
+    
+    def count_raw_points(self, hours: float, component_name: str = None) -> int:
+        """Largest number of raw history rows any one component has within the window"""
+        cursor = self.read_connection().cursor()
+        
+        query = '''
+            SELECT component_name, COUNT(*) AS points
+            FROM cluster_status
+            WHERE last_check > ?
+        '''
+        
+        params = [datetime.now() - timedelta(hours=hours)]
+        if component_name:
+            query += ' AND component_name = ?'
+            params.append(component_name)
+        
+        query += ' GROUP BY component_name'
+        
+        cursor.execute(f'SELECT MAX(points) FROM ({query})', params)
+        points = cursor.fetchone()[0]
+        cursor.close()
+        return points or 0
+    
+    def get_rollup_data(self, resolution: str, component_name: str = None, hours: int = 24) -> List[Dict[str, Any]]:
+        """Get aggregated history from one rollup tier, shaped like get_historical_data rows.
+        Buckets the tier does not cover yet (the open one, or a backfill still in progress) come from raw history."""
+        seconds = self.rollup_resolutions[resolution]
+        since = datetime.now() - timedelta(hours=hours)
+        cursor = self.read_connection().cursor()
+        covered_until = self.rollup_covered_until(cursor, seconds)
+        
+        query = '''
+            SELECT component_name, component_type, bucket, samples, up_samples,
+                   min_response_time_ms, max_response_time_ms, avg_response_time_ms, p95_response_time_ms
+            FROM cluster_rollup
+            WHERE resolution = ? AND bucket > ?
+        '''
+        
+        params = [seconds, since]
+        if component_name:
+            query += ' AND component_name = ?'
+            params.append(component_name)
+        
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        
+        tail_start = covered_until if covered_until is not None and covered_until > since else since
+        rows.extend(self.aggregate_raw(cursor, seconds, tail_start, component_name=component_name))
+        cursor.close()
+        
+        history = []
+        for row in sorted(rows, key=lambda row: str(row[2]), reverse=True):
+            up_ratio = row[4] / row[3] if row[3] else 0
+            history.append({
+                'component': row[0],
+                'type': row[1],
+                'status': 'online' if up_ratio == 1 else 'offline' if up_ratio == 0 else 'degraded',
+                'response_time_ms': round(row[7]) if row[7] is not None else None,
+                'timestamp': str(row[2]),
+                'error_message': None,
+                'samples': row[3],
+                'up_ratio': up_ratio,
+                'min_response_time_ms': row[5],
+                'max_response_time_ms': row[6],
+                'p95_response_time_ms': row[8]
+            })
+        
+        return history
+    
+    def get_history(self, component_name: str = None, hours: int = 24, max_points: int = 500) -> Dict[str, Any]:
+        """Get history at the resolution that keeps the payload around max_points per component"""
+        resolution = self.select_resolution(hours, max_points, component_name)
+        if resolution == 'raw':
+            points = self.get_historical_data(component_name, hours)
+        else:
+            points = self.get_rollup_data(resolution, component_name, hours)
+        return {'resolution': resolution, 'points': points}
+    
+    def bucket_start(self, timestamp: datetime, seconds: int) -> datetime:
+        """Floor a timestamp to its rollup bucket; tier sizes divide an hour"""
+        into_hour = timestamp.minute * 60 + timestamp.second
+        return (timestamp.replace(minute=0, second=0, microsecond=0)
+                + timedelta(seconds=into_hour - into_hour % seconds))
+    
+    def rollup_covered_until(self, cursor: sqlite3.Cursor, seconds: int) -> Optional[datetime]:
+        """End of the history a rollup tier already holds, or None before its first pass"""
+        watermark = self.rollup_watermarks.get(seconds)
+        if watermark is not None:
+            return watermark
+        cursor.execute('SELECT MAX(bucket) FROM cluster_rollup WHERE resolution = ?', (seconds,))
+        last_bucket = cursor.fetchone()[0]
+        return datetime.fromisoformat(last_bucket) + timedelta(seconds=seconds) if last_bucket else None
+    
+    def aggregate_raw(self, cursor: sqlite3.Cursor, seconds: int, start: datetime, end: datetime = None,
+                      component_name: str = None) -> List[Tuple]:
+        """Aggregate raw history from start (up to end) into rows shaped like cluster_rollup:
+        (component, type, bucket, samples, up samples, min, max, avg, p95 response time)"""
+        query = '''
+            SELECT component_name, component_type, status, response_time_ms, last_check
+            FROM cluster_status
+            WHERE last_check >= ?
+        '''
+        
+        params = [start]
+        if end is not None:
+            query += ' AND last_check < ?'
+            params.append(end)
+        if component_name:
+            query += ' AND component_name = ?'
+            params.append(component_name)
+        
+        cursor.execute(query, params)
+        
+        buckets: Dict[Tuple[str, datetime], Dict[str, Any]] = {}
+        for name, component_type, status, response_time, last_check in cursor.fetchall():
+            key = (name, self.bucket_start(datetime.fromisoformat(last_check), seconds))
+            bucket = buckets.setdefault(key, {'type': component_type, 'up': 0, 'times': []})
+            bucket['up'] += 1 if status == 'online' else 0
+            bucket['times'].append(response_time or 0)
+        
+        rows = []
+        for (name, bucket_time), bucket in buckets.items():
+            times = sorted(bucket['times'])
+            rows.append((
+                name, bucket['type'], bucket_time, len(times), bucket['up'],
+                times[0], times[-1], sum(times) / len(times),
+                times[math.ceil(0.95 * len(times)) - 1]  # nearest-rank p95
+            ))
+        return rows
+    
+    def rollup_history(self):
+        """Aggregate closed buckets of raw history into every rollup tier"""
+        # Make sure the latest sweep is visible before reading it back
+        self.writer.flush()
+        cursor = self.read_connection().cursor()
+        now = datetime.now()
+        
+        for label, seconds in self.rollup_resolutions.items():
+            start = self.rollup_covered_until(cursor, seconds)
+            if start is None:
+                cursor.execute('SELECT MIN(last_check) FROM cluster_status')
+                first_check = cursor.fetchone()[0]
+                if not first_check:
+                    continue
+                start = self.bucket_start(datetime.fromisoformat(first_check), seconds)
+            
+            # Only closed buckets, and a bounded slice of history per pass
+            end = min(self.bucket_start(now, seconds), self.bucket_start(start + self.rollup_max_span, seconds))
+            if end <= start:
+                continue
+            
+            statements = [('''
+                INSERT OR REPLACE INTO cluster_rollup
+                (component_name, component_type, bucket, samples, up_samples, min_response_time_ms,
+                 max_response_time_ms, avg_response_time_ms, p95_response_time_ms, resolution)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (*row, seconds)) for row in self.aggregate_raw(cursor, seconds, start, end)]
+            
+            if statements:
+                self.writer.submit(statements, wait=True)
+            self.rollup_watermarks[seconds] = end
+            logger.debug(f"Rolled up {len(statements)} {label} buckets up to {end}")
+        
+        cursor.close()
+    
+    def next_probe_interval(self, status: Dict[str, Any]) -> float:
+        """Pick when to probe a component next: faster while unhealthy, slower while stable"""
+        name = status['name']
+        base = self.monitor_interval
+        
+        if self.classify_status(status) is not None or self.event_states.get(name, {}).get('active'):
+            self.stable_streaks[name] = 0
+            interval = min(self.thresholds['probe_interval_min'], base)
+        else:
+            streak = self.stable_streaks[name] = self.stable_streaks.get(name, 0) + 1
+            steps = streak // self.thresholds['probe_stable_after']
+            interval = min(base * (1 + 0.5 * steps), base * self.thresholds['probe_interval_max_factor'])
+        
+        # Jitter keeps components from being probed in lockstep
+        jitter = self.thresholds['probe_jitter']
+        return interval * random.uniform(1 - jitter, 1 + jitter)
+    
+    def due_components(self) -> Dict[str, Dict[str, Any]]:
+        """Pop every component whose next probe is due, scheduling newly added ones"""
+        now = time.time()
+        scheduled = {name for _, name in self.probe_schedule}
+        for name in self.components:
+            if name not in scheduled:
+                # Stagger first probes slightly instead of firing them all at once
+                heapq.heappush(self.probe_schedule, (now + random.uniform(0, 2), name))
+        
+        due = {}
+        while self.probe_schedule and self.probe_schedule[0][0] <= now:
+            _, name = heapq.heappop(self.probe_schedule)
+            # Components removed since they were scheduled simply drop out
+            if name in self.components:
+                due[name] = self.components[name]
+        return due
+    
     def start_monitoring(self, interval: int = 30):
         """Start continuous monitoring"""
         self.monitoring = True
+        self.monitor_interval = interval
+        self.monitor_stop.clear()
         
         def monitor_loop():
+            next_rollup = 0.0
             while self.monitoring:
                 try:
-                    logger.info("Checking cluster components...")
-                    self.check_all_components()
-                    time.sleep(interval)
+                    due = self.due_components()
+                    if due:
+                        logger.info(f"Checking cluster components: {', '.join(due)}")
+                        for status in self.check_components(due):
+                            heapq.heappush(self.probe_schedule,
+                                           (time.time() + self.next_probe_interval(status), status['name']))
+                    
+                    if time.time() >= next_rollup:
+                        self.rollup_history()
+                        next_rollup = time.time() + 60
+                    
+                    # Sleep until the next probe is due
+                    wait_time = self.probe_schedule[0][0] - time.time() if self.probe_schedule else interval
+                    self.monitor_stop.wait(min(max(wait_time, 0.5), interval))
                 except Exception as e:
                     logger.error(f"Error in monitoring loop: {e}")
-                    time.sleep(interval)
+                    self.monitor_stop.wait(interval)
         
         self.monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
         self.monitor_thread.start()
+        self.start_retention()
         logger.info(f"Cluster monitoring started with {interval}s interval")
     
     def stop_monitoring(self):
         """Stop continuous monitoring"""
         self.monitoring = False
+        self.monitor_stop.set()
+        self.retention_stop.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
+        if self.retention_thread:
+            self.retention_thread.join(timeout=5)
+        self.close_probe_connections()
+        self.flush_daily_summary()
+        self.writer.flush()
         logger.info("Cluster monitoring stopped")
     
-    def cleanup_old_data(self, days: int = 30):
-        """Clean up old data from database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def purge_in_batches(self, table: str, key: str, where: str, params: tuple) -> int:
+        """Delete matching rows in small keyset-ordered batches, one short transaction each"""
+        cursor = self.read_connection().cursor()
+        deleted = 0
+        try:
+            while not self.retention_stop.is_set():
+                cursor.execute(
+                    f'SELECT {key} FROM {table} WHERE {where} ORDER BY {key} LIMIT ?',
+                    params + (self.retention['batch_size'],)
+                )
+                keys = [row[0] for row in cursor.fetchall()]
+                if not keys:
+                    break
+                
+                rowcount = self.writer.submit([(
+                    f'DELETE FROM {table} WHERE {key} BETWEEN ? AND ? AND {where}',
+                    (keys[0], keys[-1]) + params
+                )], wait=True)[0]
+                deleted += rowcount
+                
+                self.retention_status['batches'] += 1
+                self.retention_status['deleted'][table] = self.retention_status['deleted'].get(table, 0) + rowcount
+                time.sleep(self.retention['batch_pause'])
+        finally:
+            cursor.close()
+        return deleted
+    
+    def convert_to_incremental_vacuum(self) -> bool:
+        """One-time VACUUM switching a database created before incremental auto_vacuum to it.
+        Runs from the retention worker, at most once per process, and only with room for the copy."""
+        if self.writer.incremental_vacuum or self.vacuum_conversion_attempted:
+            return self.writer.incremental_vacuum
+        self.vacuum_conversion_attempted = True
         
-        cutoff_date = datetime.now() - timedelta(days=days)
+        # VACUUM writes a full temporary copy of the database before replacing it
+        db_size = sum(os.path.getsize(path) for path in (self.db_path, f"{self.db_path}-wal") if os.path.exists(path))
+        free_space = shutil.disk_usage(Path(self.db_path).resolve().parent).free
+        if free_space < 2 * db_size:
+            logger.warning(f"{self.db_path} is not in incremental auto_vacuum mode and converting it needs "
+                           f"{2 * db_size} bytes free ({free_space} available); disk space will not be reclaimed")
+            return False
         
-        # Clean old status records
-        cursor.execute('DELETE FROM cluster_status WHERE created_at < ?', (cutoff_date,))
-        deleted_status = cursor.rowcount
+        start_time = time.time()
+        logger.info(f"Converting {self.db_path} to incremental auto_vacuum; this rewrites the file once")
+        try:
+            self.writer.submit([('PRAGMA auto_vacuum=INCREMENTAL', ()), ('VACUUM', ())],
+                               wait=True, timeout=None, exclusive=True)
+        except sqlite3.Error as e:
+            logger.error(f"Could not convert {self.db_path} to incremental auto_vacuum: {e}")
+            return False
         
-        # Clean old events
-        cursor.execute('DELETE FROM cluster_events WHERE timestamp < ?', (cutoff_date,))
-        deleted_events = cursor.rowcount
+        # A fresh connection, since the cached readers keep the header they first read
+        conn = sqlite3.connect(self.read_uri, uri=True)
+        try:
+            self.writer.incremental_vacuum = conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+        finally:
+            conn.close()
+        logger.info(f"Converted {self.db_path} to incremental auto_vacuum in {int((time.time() - start_time) * 1000)}ms")
+        return self.writer.incremental_vacuum
+    
+    def reclaim_space(self) -> int:
+        """Return free pages to the filesystem a few at a time"""
+        if not self.convert_to_incremental_vacuum():
+            return 0
+        
+        cursor = self.read_connection().cursor()
+        reclaimed = 0
+        try:
+            while not self.retention_stop.is_set():
+                cursor.execute('PRAGMA freelist_count')
+                free_pages = cursor.fetchone()[0]
+                if not free_pages:
+                    break
+                pages = min(free_pages, self.retention['vacuum_pages'])
+                # sqlite3 steps a PRAGMA only once, and each step frees a single page
+                self.writer.submit([('PRAGMA incremental_vacuum', ())] * pages, wait=True)
+                reclaimed += pages
+                time.sleep(self.retention['batch_pause'])
+        finally:
+            cursor.close()
+        return reclaimed
+    
+    def run_retention(self, status_days: int = None, events_days: int = None) -> Dict[str, Any]:
+        """Expire old history, events and rollups incrementally and report what was removed"""
+        if not self.retention_lock.acquire(blocking=False):
+            logger.info("Retention already running, skipping")
+            return dict(self.retention_status)
+        
+        try:
+            start_time = time.time()
+            status_days = status_days if status_days is not None else self.retention['status_days']
+            events_days = events_days if events_days is not None else self.retention['events_days']
+            self.retention_status.update({'running': True, 'batches': 0, 'deleted': {}, 'reclaimed_pages': 0})
+            
+            deleted = {
+                # last_check is written in local time by the monitor
+                'cluster_status': self.purge_in_batches(
+                    'cluster_status', 'id', 'last_check < ?',
+                    (datetime.now() - timedelta(days=status_days),)
+                ),
+                # Event timestamps come from CURRENT_TIMESTAMP (UTC)
+                'cluster_events': self.purge_in_batches(
+                    'cluster_events', 'id', "timestamp < datetime('now', ?)",
+                    (f'-{events_days} days',)
+                ),
+                'cluster_rollup': sum(
+                    self.purge_in_batches(
+                        'cluster_rollup', 'rowid', 'resolution = ? AND bucket < ?',
+                        (seconds, datetime.now() - timedelta(days=days))
+                    )
+                    for seconds, days in self.retention['rollup_days'].items()
+                )
+            }
+            reclaimed = self.reclaim_space()
+            
+            self.retention_status.update({
+                'running': False,
+                'last_run': datetime.now().isoformat(),
+                'duration_ms': int((time.time() - start_time) * 1000),
+                'deleted': deleted,
+                'reclaimed_pages': reclaimed
+            })
+            logger.info(
+                f"Retention completed in {self.retention_status['duration_ms']}ms: "
+                f"{deleted} removed in {self.retention_status['batches']} batches, {reclaimed} pages reclaimed"
+            )
+            return dict(self.retention_status)
+        finally:
+            self.retention_status['running'] = False
+            self.retention_lock.release()
+    
+    def start_retention(self):
+        """Run retention in the background every retention['interval'] seconds"""
+        self.retention_stop.clear()
         
-        conn.commit()
-        conn.close()
+        def retention_loop():
+            while not self.retention_stop.is_set():
+                try:
+                    self.run_retention()
+                except Exception as e:
+                    logger.error(f"Error in retention worker: {e}")
+                self.retention_stop.wait(self.retention['interval'])
+        
+        self.retention_thread = threading.Thread(target=retention_loop, name='monitor-retention', daemon=True)
+        self.retention_thread.start()
+    
+    def cleanup_old_data(self, days: int = 30):
+        """Clean up old data from database"""
+        result = self.run_retention(status_days=days, events_days=days)
+        deleted_status = result['deleted'].get('cluster_status', 0)
+        deleted_events = result['deleted'].get('cluster_events', 0)
         
         logger.info(f"Cleanup completed: {deleted_status} status records, {deleted_events} events removed")
         return {'deleted_status': deleted_status, 'deleted_events': deleted_events}
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Database Connection Pooling
+OPENSEWAVE PgPool Admin Dashboard
+
+Thread-safe psycopg2 connection pools, one per target (PgPool, master, each backend),
+so API handlers stop paying a connection handshake per request.
+"""
+
+import time
+import threading
+import psycopg2
+from contextlib import contextmanager
+from typing import Dict, List, Any, Tuple
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class PooledConnection:
+    """Wraps a psycopg2 connection; close() hands it back to its pool instead of closing it"""
+
+    def __init__(self, pool: 'ConnectionPool', conn):
+        self._pool = pool
+        self._conn = conn
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    @property
+    def raw(self):
+        return self._conn
+
+    def close(self):
+        """Return the connection to its pool"""
+        if not self._released:
+            self._released = True
+            self._pool.putconn(self)
+
+    def discard(self):
+        """Close the underlying connection for good, e.g. after a protocol error"""
+        if not self._released:
+            self._released = True
+            self._pool.putconn(self, discard=True)
+
+    @contextmanager
+    def read_only(self):
+        """Run user-supplied SQL in a READ ONLY transaction that is always rolled back"""
+        conn = self._conn
+        conn.autocommit = False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SET TRANSACTION READ ONLY')
+            yield self
+        finally:
+            try:
+                conn.rollback()
+                conn.autocommit = True
+            except psycopg2.Error:
+                # putconn drops connections it cannot reset
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """Bounded pool of connections to one database target"""
+
+    def __init__(self, name: str, connect_kwargs: Dict[str, Any], min_size: int = 1, max_size: int = 8,
+                 max_idle: float = 300, validate_after: float = 30, checkout_timeout: float = 10):
+        self.name = name
+        self.connect_kwargs = connect_kwargs
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.validate_after = validate_after
+        self.checkout_timeout = checkout_timeout
+
+        # Idle entries are (connection, last used timestamp), oldest first
+        self.idle: List[Tuple[Any, float]] = []
+        self.in_use = 0
+        self.condition = threading.Condition()
+        self.metrics = {
+            'created': 0,
+            'closed': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'validation_failures': 0,
+            'reaped': 0,
+            'peak_in_use': 0,
+            'total_wait_ms': 0.0
+        }
+
+    @property
+    def size(self) -> int:
+        return self.in_use + len(self.idle)
+
+    def connect(self):
+        conn = psycopg2.connect(**self.connect_kwargs)
+        # Collectors only read catalogs; autocommit keeps pooled sessions from idling in a transaction.
+        # User-supplied SQL must go through PooledConnection.read_only() instead.
+        conn.autocommit = True
+        with self.condition:
+            self.metrics['created'] += 1
+        return conn
+
+    def validate(self, conn, last_used: float) -> bool:
+        """Cheap liveness check, only for connections that sat idle for a while"""
+        if conn.closed:
+            return False
+        if time.time() - last_used < self.validate_after:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except psycopg2.Error:
+            return False
+
+    def close_raw(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self.condition:
+            self.metrics['closed'] += 1
+
+    def getconn(self) -> PooledConnection:
+        """Check out a validated connection, opening a new one while below max_size"""
+        start_time = time.time()
+        deadline = start_time + self.checkout_timeout
+        waited = False
+
+        while True:
+            conn = None
+            with self.condition:
+                while not self.idle and self.size >= self.max_size:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        self.metrics['timeouts'] += 1
+                        raise PoolTimeout(
+                            f"No connection available in pool '{self.name}' after {self.checkout_timeout}s"
+                        )
+                    waited = True
+                    self.condition.wait(remaining)
+
+                if self.idle:
+                    # LIFO keeps the hottest connections in use and lets the rest age out
+                    conn, last_used = self.idle.pop()
+                self.in_use += 1
+
+            if conn is None:
+                try:
+                    conn = self.connect()
+                except Exception:
+                    with self.condition:
+                        self.in_use -= 1
+                        self.condition.notify()
+                    raise
+            elif not self.validate(conn, last_used):
+                with self.condition:
+                    self.metrics['validation_failures'] += 1
+                    self.in_use -= 1
+                    self.condition.notify()
+                self.close_raw(conn)
+                continue
+
+            with self.condition:
+                self.metrics['checkouts'] += 1
+                self.metrics['peak_in_use'] = max(self.metrics['peak_in_use'], self.in_use)
+                if waited:
+                    self.metrics['waits'] += 1
+                    self.metrics['total_wait_ms'] += (time.time() - start_time) * 1000
+            # A fresh wrapper per checkout, so a stale handle can never release someone else's checkout
+            return PooledConnection(self, conn)
+
+    def putconn(self, pooled: PooledConnection, discard: bool = False):
+        """Return a connection; broken or mid-transaction connections are reset or dropped"""
+        conn = pooled.raw
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if not conn.autocommit:
+                    conn.autocommit = True
+            except psycopg2.Error:
+                discard = True
+
+        if discard or conn.closed:
+            self.close_raw(conn)
+            with self.condition:
+                self.in_use -= 1
+                self.condition.notify()
+            return
+
+        with self.condition:
+            self.in_use -= 1
+            self.idle.append((conn, time.time()))
+            self.condition.notify()
+
+    def reap_idle(self):
+        """Close connections idle longer than max_idle, keeping at least min_size open"""
+        now = time.time()
+        reaped = []
+        with self.condition:
+            # Oldest idle connections sit at the front of the list
+            while (self.idle and self.size > self.min_size
+                   and now - self.idle[0][1] > self.max_idle):
+                reaped.append(self.idle.pop(0))
+            self.metrics['reaped'] += len(reaped)
+        for conn, _ in reaped:
+            self.close_raw(conn)
+
+    def closeall(self):
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for conn, _ in idle:
+            self.close_raw(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.condition:
+            stats = dict(self.metrics)
+            stats.update({
+                'name': self.name,
+                'size': self.size,
+                'in_use': self.in_use,
+                'idle': len(self.idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'avg_wait_ms': round(stats['total_wait_ms'] / stats['waits'], 2) if stats['waits'] else 0
+            })
+        return stats
+
+
+class PoolRegistry:
+    """Keeps one pool per target and reaps idle connections in the background"""
+
+    def __init__(self, reap_interval: float = 30):
+        self.pools: Dict[str, ConnectionPool] = {}
+        self.lock = threading.Lock()
+        self.reap_interval = reap_interval
+        self.reaper = None
+        self.defaults = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 1)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 8)),
+            'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 300))
+        }
+
+    def get_pool(self, name: str, **connect_kwargs) -> ConnectionPool:
+        with self.lock:
+            pool = self.pools.get(name)
+            if pool is None or pool.connect_kwargs != connect_kwargs:
+                if pool is not None:
+                    pool.closeall()
+                pool = self.pools[name] = ConnectionPool(name, connect_kwargs, **self.defaults)
+            if self.reaper is None:
+                self.reaper = threading.Thread(target=self.reap_loop, name='db-pool-reaper', daemon=True)
+                self.reaper.start()
+            return pool
+
+    def getconn(self, name: str, **connect_kwargs) -> PooledConnection:
+        return self.get_pool(name, **connect_kwargs).getconn()
+
+    def reap_loop(self):
+        while True:
+            time.sleep(self.reap_interval)
+            with self.lock:
+                pools = list(self.pools.values())
+            for pool in pools:
+                try:
+                    pool.reap_idle()
+                except Exception as e:
+                    logger.error(f"Error reaping pool {pool.name}: {e}")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            pools = list(self.pools.values())
+        return [pool.stats() for pool in pools]
+
+
+# Global pool registry
+pools = PoolRegistry()
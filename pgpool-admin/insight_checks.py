@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Performance Insight Checks
+OPENSEWAVE PgPool Admin Dashboard
+
+Registry of independent diagnostic checks behind the performance insights page. Each check is
+one query plus a function turning its rows into an insight; the runner executes them in parallel
+on pooled connections, each under its own statement_timeout, and returns whatever finished.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any
+import os
+import logging
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_MS = int(os.environ.get('INSIGHT_CHECK_TIMEOUT_MS', 5000))
+
+
+class InsightCheck:
+    def __init__(self, name: str, sql: str, evaluate: Callable[[List[Dict[str, Any]]], Optional[Dict[str, Any]]],
+                 timeout_ms: int = DEFAULT_TIMEOUT_MS, ttl: Optional[float] = None):
+        # ttl caches the rows through the runner's QueryCache; None reads live on every run
+        self.name = name
+        self.sql = sql
+        self.evaluate = evaluate
+        self.timeout_ms = int(os.environ.get(f'INSIGHT_{name.upper()}_TIMEOUT_MS', timeout_ms))
+        self.ttl = ttl
+
+
+CHECKS: Dict[str, InsightCheck] = {}
+
+
+def register_check(name: str, sql: str, timeout_ms: int = DEFAULT_TIMEOUT_MS, ttl: Optional[float] = None):
+    """Decorator registering evaluate(rows) -> insight or None as a check"""
+    def decorator(evaluate):
+        CHECKS[name] = InsightCheck(name, sql, evaluate, timeout_ms, ttl)
+        return evaluate
+    return decorator
+
+
+class InsightRunner:
+    def __init__(self, connect: Callable[[], Any], cache=None, max_workers: int = 4,
+                 checks: Optional[Dict[str, InsightCheck]] = None):
+        # connect returns a pooled connection; cache is a QueryCache for checks with a ttl
+        self.connect = connect
+        self.cache = cache
+        self.checks = CHECKS if checks is None else checks
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='insight')
+        if cache is not None:
+            for check in self.checks.values():
+                if check.ttl is not None:
+                    cache.register(f"insight_{check.name}", lambda check=check: self.query(check), check.ttl)
+
+    def query(self, check: InsightCheck, connect: Optional[Callable[[], Any]] = None) -> List[Dict[str, Any]]:
+        """Run a check's query under its statement_timeout"""
+        conn = (connect or self.connect)()
+        try:
+            cur = conn.cursor()
+            # Pooled sessions are in autocommit, so the timeout is set and reset around the query
+            cur.execute("SET statement_timeout = %s", (check.timeout_ms,))
+            try:
+                cur.execute(check.sql)
+                rows = cur.fetchall()
+            finally:
+                cur.execute("RESET statement_timeout")
+            cur.close()
+            return rows
+        finally:
+            conn.close()
+
+    def run_check(self, check: InsightCheck, connect: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+        start_time = time.time()
+        result = {'name': check.name, 'status': 'ok', 'insight': None, 'error': None,
+                  'cached': check.ttl is not None and self.cache is not None and connect is None}
+        try:
+            if result['cached']:
+                rows = self.cache.get(f"insight_{check.name}")
+            else:
+                rows = self.query(check, connect)
+            result['insight'] = check.evaluate(rows)
+        except psycopg2.extensions.QueryCanceledError:
+            result['status'] = 'timeout'
+            result['error'] = f"Exceeded statement_timeout of {check.timeout_ms}ms"
+        except Exception as e:
+            logger.error(f"Insight check {check.name} failed: {e}")
+            result['status'] = 'error'
+            result['error'] = str(e).strip()
+        result['duration_ms'] = round((time.time() - start_time) * 1000, 1)
+        return result
+
+    def run(self, connect: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+        """Run every check in parallel; failed or timed out checks are reported, not raised.
+        A connect other than the runner's own bypasses the cache, which holds its results only."""
+        start_time = time.time()
+        results = list(self.executor.map(lambda check: self.run_check(check, connect), self.checks.values()))
+        return {
+            'insights': [result['insight'] for result in results if result['insight']],
+            'checks': {
+                result['name']: {key: result[key] for key in ('status', 'duration_ms', 'cached', 'error')}
+                for result in results
+            },
+            'partial': any(result['status'] != 'ok' for result in results),
+            'duration_ms': round((time.time() - start_time) * 1000, 1)
+        }
+
+    def stop(self):
+        self.executor.shutdown(wait=False)
+
+
+@register_check('poor_correlation', """
+    SELECT
+        schemaname,
+        tablename,
+        attname,
+        n_distinct,
+        correlation
+    FROM pg_stats
+    WHERE schemaname NOT IN ('pg_catalog', 'information_schema')
+    AND n_distinct > 100
+    AND correlation < 0.1
+    LIMIT 10;
+""", ttl=600)
+def poor_correlation(rows):
+    """Check for missing indexes"""
+    if rows:
+        return {
+            'type': 'index',
+            'severity': 'medium',
+            'message': f'Found {len(rows)} columns with poor correlation that might benefit from indexes',
+            'details': rows
+        }
+
+
+@register_check('bloated_tables', """
+    SELECT
+        schemaname,
+        relname as tablename,
+        n_dead_tup,
+        n_live_tup,
+        round(n_dead_tup::numeric / NULLIF(n_live_tup, 0) * 100, 2) as dead_tuple_percent
+    FROM pg_stat_user_tables
+    WHERE n_dead_tup > 1000
+    AND n_dead_tup::float / NULLIF(n_live_tup, 0) > 0.2
+    ORDER BY n_dead_tup DESC
+    LIMIT 10;
+""", ttl=120)
+def bloated_tables(rows):
+    """Check for bloated tables"""
+    if rows:
+        return {
+            'type': 'maintenance',
+            'severity': 'high',
+            'message': f'Found {len(rows)} tables with significant bloat (>20% dead tuples)',
+            'details': rows,
+            'recommendation': 'Consider running VACUUM on these tables'
+        }
+
+
+@register_check('unused_indexes', """
+    SELECT
+        schemaname,
+        relname as tablename,
+        indexrelname,
+        pg_size_pretty(pg_relation_size(indexrelid)) as index_size,
+        idx_scan
+    FROM pg_stat_user_indexes
+    WHERE idx_scan = 0
+    AND indexrelname NOT LIKE '%_pkey'
+    ORDER BY pg_relation_size(indexrelid) DESC
+    LIMIT 10;
+""", ttl=600)
+def unused_indexes(rows):
+    """Check for unused indexes"""
+    if rows:
+        return {
+            'type': 'optimization',
+            'severity': 'low',
+            'message': f'Found {len(rows)} unused indexes that could be dropped',
+            'details': rows,
+            'recommendation': 'Consider dropping these unused indexes to save space and improve write performance'
+        }
+
+
+@register_check('long_running_queries', """
+    SELECT
+        pid,
+        usename,
+        EXTRACT(EPOCH FROM (now() - query_start)) as duration_seconds,
+        state,
+        LEFT(query, 100) as query_preview
+    FROM pg_stat_activity
+    WHERE state = 'active'
+    AND query_start < now() - interval '5 minutes'
+    AND query NOT LIKE '%pg_stat_activity%'
+    ORDER BY query_start;
+""", timeout_ms=2000)
+def long_running_queries(rows):
+    """Check for long-running queries; activity is always read live"""
+    if rows:
+        return {
+            'type': 'performance',
+            'severity': 'high',
+            'message': f'Found {len(rows)} queries running for over 5 minutes',
+            'details': rows,
+            'recommendation': 'Investigate these long-running queries for optimization opportunities'
+        }
+
+
+@register_check('cache_hit_ratio', """
+    SELECT
+        (sum(heap_blks_hit) / NULLIF(sum(heap_blks_hit) + sum(heap_blks_read), 0))::float * 100 as cache_hit_ratio
+    FROM pg_statio_user_tables;
+""", ttl=60)
+def cache_hit_ratio(rows):
+    """Check cache hit ratio"""
+    cache_ratio = rows[0]['cache_hit_ratio'] if rows and rows[0]['cache_hit_ratio'] else 0
+    if cache_ratio and cache_ratio < 90:
+        return {
+            'type': 'performance',
+            'severity': 'medium',
+            'message': f'Cache hit ratio is {cache_ratio:.1f}%, which is below optimal',
+            'recommendation': 'Consider increasing shared_buffers or adding more RAM'
+        }
+
+
+@register_check('tables_without_pk', """
+    SELECT
+        n.nspname as schema,
+        c.relname as table
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.relkind = 'r'
+    AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+    AND NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conrelid = c.oid
+        AND contype = 'p'
+    )
+    LIMIT 10;
+""", ttl=600)
+def tables_without_pk(rows):
+    """Check for tables without primary keys"""
+    if rows:
+        return {
+            'type': 'design',
+            'severity': 'medium',
+            'message': f'Found {len(rows)} tables without primary keys',
+            'details': rows,
+            'recommendation': 'Consider adding primary keys for better performance and replication'
+        }
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Fast JSON Serialization and Response Compression
+OPENSEWAVE PgPool Admin Dashboard
+
+orjson-backed Flask JSON provider with native handling of PostgreSQL result types,
+plus negotiated brotli/gzip compression for large API responses.
+orjson and brotli are optional; without them the standard library json and gzip are used.
+"""
+
+import json
+import gzip
+import uuid
+import decimal
+import ipaddress
+import dataclasses
+from datetime import date, datetime, time, timedelta
+from typing import Any, Optional
+import os
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+
+
+def default(o: Any) -> Any:
+    """Serialize types the JSON encoders do not handle natively"""
+    if isinstance(o, decimal.Decimal):
+        # numeric results, e.g. pg_wal_lsn_diff() byte lags and sum() aggregates
+        if o.is_finite() and o == o.to_integral_value():
+            return int(o)
+        return float(o)
+    if isinstance(o, timedelta):
+        return o.total_seconds()
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, (uuid.UUID, ipaddress.IPv4Address, ipaddress.IPv6Address,
+                      ipaddress.IPv4Network, ipaddress.IPv6Network)):
+        return str(o)
+    if isinstance(o, (bytes, memoryview)):
+        return bytes(o).hex()
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the standard library handles
+            pass
+    return json.dumps(obj, default=default, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by dumps_bytes"""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            kwargs.setdefault('default', default)
+            return json.dumps(obj, **kwargs)
+        return dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # Skip the str round trip: the encoded bytes go straight into the response
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """Best content coding the client accepts, or None"""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def compress_response(response, accept_encodings):
+    """Compress a response body in place when it is large enough and the client accepts it"""
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None or len(body) < COMPRESSION_MIN_SIZE:
+        return response
+
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
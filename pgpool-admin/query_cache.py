@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Query Result Cache
+OPENSEWAVE PgPool Admin Dashboard
+
+Bounded in-memory cache for expensive, slowly changing catalog queries. Each registered query
+has its own TTL; once a result expires it is still served while a background refresh runs
+(stale-while-revalidate), so only the very first caller waits on the database.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Any
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    def __init__(self, max_entries: int = 128, max_workers: int = 2, max_stale_factor: float = 4):
+        # A stale result is served for at most max_stale_factor * ttl before callers wait again
+        self.max_entries = max_entries
+        self.max_stale_factor = max_stale_factor
+        self.loaders: Dict[str, Dict[str, Any]] = {}
+        # Least recently used first, so eviction pops from the front
+        self.entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.in_flight: Dict[str, Future] = {}
+        self.counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'errors': 0, 'evictions': 0}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='query-cache')
+
+    def register(self, key: str, load: Callable[[], Any], ttl: float):
+        """Register a cached query; QUERY_CACHE_<KEY>_TTL overrides its TTL"""
+        ttl = float(os.environ.get(f'QUERY_CACHE_{key.upper()}_TTL', ttl))
+        self.loaders[key] = {'load': load, 'ttl': ttl}
+
+    def load(self, key: str, future: Future):
+        """Run the loader and store its result; concurrent callers share the same future"""
+        start_time = time.monotonic()
+        try:
+            value = self.loaders[key]['load']()
+        except Exception as e:
+            with self.lock:
+                self.counters['errors'] += 1
+                self.in_flight.pop(key, None)
+            future.set_exception(e)
+            return
+
+        with self.lock:
+            self.entries[key] = {
+                'value': value,
+                'loaded_at': time.monotonic(),
+                'duration_ms': round((time.monotonic() - start_time) * 1000, 1)
+            }
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.counters['evictions'] += 1
+            self.in_flight.pop(key, None)
+        future.set_result(value)
+
+    def refresh(self, key: str):
+        """Reload in the background unless a load is already running"""
+        with self.lock:
+            if key in self.in_flight:
+                return
+            future = self.in_flight[key] = Future()
+            self.counters['refreshes'] += 1
+        self.executor.submit(self.load, key, future)
+
+    def get(self, key: str) -> Any:
+        """Cached result of a registered query: fresh, stale while it refreshes, or loaded now"""
+        ttl = self.loaders[key]['ttl']
+        with self.lock:
+            entry = self.entries.get(key)
+            age = time.monotonic() - entry['loaded_at'] if entry else None
+            if entry and age < ttl:
+                self.counters['hits'] += 1
+                self.entries.move_to_end(key)
+                return entry['value']
+
+            serve_stale = entry is not None and age < ttl * self.max_stale_factor
+            if serve_stale:
+                self.counters['stale_hits'] += 1
+                self.entries.move_to_end(key)
+            else:
+                self.counters['misses'] += 1
+                future = self.in_flight.get(key)
+                owner = future is None
+                if owner:
+                    future = self.in_flight[key] = Future()
+
+        if serve_stale:
+            self.refresh(key)
+            return entry['value']
+
+        if owner:
+            self.load(key, future)
+        return future.result()
+
+    def invalidate(self, key: Optional[str] = None):
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self.lock:
+            lookups = self.counters['hits'] + self.counters['stale_hits'] + self.counters['misses']
+            return {
+                **self.counters,
+                'hit_ratio': round((self.counters['hits'] + self.counters['stale_hits']) / lookups * 100, 2) if lookups else None,
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'queries': {
+                    key: {
+                        'ttl': loader['ttl'],
+                        'age': round(now - self.entries[key]['loaded_at'], 1) if key in self.entries else None,
+                        'duration_ms': self.entries[key]['duration_ms'] if key in self.entries else None,
+                        'refreshing': key in self.in_flight
+                    }
+                    for key, loader in self.loaders.items()
+                }
+            }
+
+    def stop(self):
+        self.executor.shutdown(wait=False)
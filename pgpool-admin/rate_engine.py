@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Counter Rate Engine
+OPENSEWAVE PgPool Admin Dashboard
+
+Samples monotonic counters (transactions, tuples, statement calls, PgPool selects) at a fixed
+cadence into a ring buffer and derives per-second rates, windowed averages and daily totals.
+Counters summed over many parts (statements, backend nodes) are sampled per part, so a part
+that disappears or resets does not look like a reset of the whole sum.
+"""
+
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Hashable, List, Optional, Union, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RateEngine:
+    def __init__(self, sampler: Callable[[], Dict[str, Union[float, Dict[Hashable, float]]]],
+                 interval: float = 5, capacity: int = 720):
+        # sampler returns the current value of every counter it can read; missing ones are skipped.
+        # A counter given as {part: value} is an aggregate: its per-part increases are summed.
+        self.sampler = sampler
+        self.interval = interval
+        # Ring buffer of (monotonic time, {counter: value}); 720 samples at 5s covers one hour
+        self.samples = deque(maxlen=capacity)
+        # Last value seen per counter, so a sample missing a counter does not lose its increase
+        self.last_values: Dict[str, float] = {}
+        # Per-part values of aggregate counters, whose stored value is the running sum of increases
+        self.last_parts: Dict[str, Dict[Hashable, float]] = {}
+        self.daily_totals: Dict[str, float] = {}
+        self.daily_date = None
+        self.daily_since = None
+        self.resets: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+    @staticmethod
+    def delta(previous: float, current: float) -> float:
+        """Increase of a single counter between two samples; a drop means it was reset and restarted at 0"""
+        if current >= previous:
+            return current - previous
+        return current
+
+    def accumulate(self, name: str, parts: Dict[Hashable, float]) -> float:
+        """Monotonic value of an aggregate counter: its last value plus every part's own increase.
+        Parts that vanish add nothing; new parts count in full. Call with the lock held."""
+        previous_parts = self.last_parts.get(name)
+        self.last_parts[name] = parts
+        if previous_parts is None or name not in self.last_values:
+            return float(sum(parts.values()))
+
+        increase = 0.0
+        for part, value in parts.items():
+            previous = previous_parts.get(part)
+            if previous is None:
+                increase += value
+                continue
+            if value < previous:
+                self.resets[name] = self.resets.get(name, 0) + 1
+            increase += self.delta(previous, value)
+        return self.last_values[name] + increase
+
+    def record(self, counters: Dict[str, Union[float, Dict[Hashable, float]]], now: Optional[float] = None):
+        """Append one sample and fold its increase into today's totals"""
+        now = time.monotonic() if now is None else now
+        today = datetime.now().date()
+
+        with self.lock:
+            if self.daily_date != today:
+                self.daily_date = today
+                self.daily_since = datetime.now().isoformat()
+                self.daily_totals = {}
+
+            counters = {
+                name: self.accumulate(name, value) if isinstance(value, dict) else value
+                for name, value in counters.items()
+            }
+            for name, value in counters.items():
+                if name in self.last_values:
+                    previous = self.last_values[name]
+                    if value < previous:
+                        self.resets[name] = self.resets.get(name, 0) + 1
+                        logger.info(f"Counter {name} reset ({previous} -> {value})")
+                    self.daily_totals[name] = self.daily_totals.get(name, 0) + self.delta(previous, value)
+                self.last_values[name] = value
+
+            self.samples.append((now, dict(counters)))
+
+    def sample(self):
+        try:
+            self.record(self.sampler())
+        except Exception as e:
+            logger.error(f"Error sampling counters: {e}")
+
+    def rate(self, name: str, window: Optional[float] = None) -> Optional[float]:
+        """Per-second rate of a counter over the last window seconds, or between the last two samples"""
+        with self.lock:
+            samples = [(ts, counters[name]) for ts, counters in self.samples if name in counters]
+        if len(samples) < 2:
+            return None
+
+        end_time = samples[-1][0]
+        if window is None:
+            selected = samples[-2:]
+        else:
+            selected = [sample for sample in samples if sample[0] >= end_time - window]
+            if len(selected) < 2:
+                selected = samples[-2:]
+
+        # Sum per-step deltas so a reset inside the window only loses the pre-reset remainder
+        increase = sum(self.delta(previous[1], current[1]) for previous, current in zip(selected, selected[1:]))
+        elapsed = selected[-1][0] - selected[0][0]
+        return increase / elapsed if elapsed > 0 else None
+
+    def rates(self, names: List[str], windows: Dict[str, float]) -> Dict[str, Dict[str, Optional[float]]]:
+        result = {}
+        for name in names:
+            result[name] = {'current': self.rate(name)}
+            for label, seconds in windows.items():
+                result[name][label] = self.rate(name, seconds)
+        return result
+
+    def has(self, name: str) -> bool:
+        with self.lock:
+            return name in self.last_values
+
+    def names(self, prefix: str = '') -> List[str]:
+        with self.lock:
+            return sorted(name for name in self.last_values if name.startswith(prefix))
+
+    def today(self, name: str) -> float:
+        with self.lock:
+            return self.daily_totals.get(name, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            span = self.samples[-1][0] - self.samples[0][0] if len(self.samples) > 1 else 0
+            return {
+                'interval': self.interval,
+                'samples': len(self.samples),
+                'capacity': self.samples.maxlen,
+                'span_seconds': round(span, 1),
+                'daily_since': self.daily_since,
+                'resets': dict(self.resets)
+            }
+
+    def start(self):
+        """Sample counters at a fixed cadence in the background"""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+
+        def sample_loop():
+            next_run = time.monotonic()
+            while self.running:
+                self.sample()
+                # Fixed cadence: sampling time does not accumulate as drift
+                next_run = max(next_run + self.interval, time.monotonic())
+                time.sleep(max(0, next_run - time.monotonic()))
+
+        self.thread = threading.Thread(target=sample_loop, name='rate-engine', daemon=True)
+        self.thread.start()
+        logger.info(f"Rate engine started with a {self.interval}s sampling interval")
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=5)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Host Resource Collector
+OPENSEWAVE PgPool Admin Dashboard
+
+Reads CPU, memory, disk and network counters from /proc on the admin host.
+Cumulative counters are sampled through a RateEngine so utilisation comes from deltas
+between samples; memory is a gauge and is read on demand.
+"""
+
+from typing import Dict, Optional, Any
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROC_ROOT = os.environ.get('HOST_PROC', '/proc')
+SYS_BLOCK = os.environ.get('HOST_SYS_BLOCK', '/sys/block')
+
+# Virtual block devices that would skew disk utilisation
+IGNORED_DISK_PREFIXES = ('loop', 'ram', 'zram', 'sr', 'fd')
+SECTOR_BYTES = 512
+
+
+def read_cpu_counters(proc_root: str = PROC_ROOT) -> Dict[str, float]:
+    """Aggregate CPU time in jiffies from /proc/stat"""
+    with open(os.path.join(proc_root, 'stat')) as f:
+        for line in f:
+            if line.startswith('cpu '):
+                # user nice system idle iowait irq softirq steal (guest time is already in user)
+                values = [float(value) for value in line.split()[1:9]]
+                idle, iowait = values[3], values[4]
+                total = sum(values)
+                return {
+                    'cpu_total': total,
+                    'cpu_busy': total - idle - iowait,
+                    'cpu_iowait': iowait
+                }
+    return {}
+
+
+def read_disk_counters(proc_root: str = PROC_ROOT, sys_block: str = SYS_BLOCK) -> Dict[str, float]:
+    """Per-disk busy time and bytes transferred from /proc/diskstats, whole disks only"""
+    whole_disks = set(os.listdir(sys_block)) if os.path.isdir(sys_block) else None
+    counters = {}
+    with open(os.path.join(proc_root, 'diskstats')) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 14:
+                continue
+            name = parts[2]
+            if name.startswith(IGNORED_DISK_PREFIXES) or (whole_disks is not None and name not in whole_disks):
+                continue
+            counters[f"disk_io_ms:{name}"] = float(parts[12])
+            counters['disk_read_bytes'] = counters.get('disk_read_bytes', 0) + float(parts[5]) * SECTOR_BYTES
+            counters['disk_write_bytes'] = counters.get('disk_write_bytes', 0) + float(parts[9]) * SECTOR_BYTES
+    return counters
+
+
+def read_network_counters(proc_root: str = PROC_ROOT) -> Dict[str, float]:
+    """Bytes received and sent on all interfaces except loopback, from /proc/net/dev"""
+    rx, tx = 0.0, 0.0
+    with open(os.path.join(proc_root, 'net', 'dev')) as f:
+        for line in f:
+            if ':' not in line:
+                continue
+            interface, data = line.split(':', 1)
+            if interface.strip() == 'lo':
+                continue
+            fields = data.split()
+            rx += float(fields[0])
+            tx += float(fields[8])
+    return {'net_rx_bytes': rx, 'net_tx_bytes': tx}
+
+
+def read_host_counters() -> Dict[str, float]:
+    """Every cumulative host counter that can be read; sources that are unavailable are skipped"""
+    counters = {}
+    for reader in (read_cpu_counters, read_disk_counters, read_network_counters):
+        try:
+            counters.update(reader())
+        except (OSError, ValueError, IndexError) as e:
+            logger.debug(f"Skipping {reader.__name__}: {e}")
+    return counters
+
+
+def read_memory(proc_root: str = PROC_ROOT) -> Dict[str, float]:
+    """Total and available memory in bytes from /proc/meminfo"""
+    values = {}
+    with open(os.path.join(proc_root, 'meminfo')) as f:
+        for line in f:
+            name, _, rest = line.partition(':')
+            if name in ('MemTotal', 'MemAvailable', 'MemFree'):
+                values[name] = float(rest.split()[0]) * 1024
+    available = values.get('MemAvailable', values.get('MemFree', 0))
+    return {'total': values.get('MemTotal', 0), 'available': available}
+
+
+def percent(part: Optional[float], whole: Optional[float]) -> Optional[float]:
+    if part is None or not whole:
+        return None
+    return round(min(100.0, max(0.0, part / whole * 100)), 2)
+
+
+def rounded(value: Optional[float], scale: float = 1) -> Optional[float]:
+    return round(value * scale, 2) if value is not None else None
+
+
+def host_resources(engine) -> Dict[str, Any]:
+    """Current host utilisation derived from the rates between the engine's last two samples"""
+    cpu_total = engine.rate('cpu_total')
+    disk_rates = [engine.rate(name) for name in engine.names('disk_io_ms:')]
+    disk_rates = [rate for rate in disk_rates if rate is not None]
+    rx, tx = engine.rate('net_rx_bytes'), engine.rate('net_tx_bytes')
+
+    try:
+        memory = read_memory()
+    except (OSError, ValueError, IndexError):
+        memory = {'total': 0, 'available': 0}
+
+    return {
+        'cpu_percent': percent(engine.rate('cpu_busy'), cpu_total),
+        'cpu_iowait_percent': percent(engine.rate('cpu_iowait'), cpu_total),
+        'memory_percent': percent(memory['total'] - memory['available'], memory['total']),
+        'memory_total_bytes': memory['total'],
+        'memory_available_bytes': memory['available'],
+        # io_ticks count milliseconds the busiest disk spent with I/O in flight
+        'disk_io_percent': percent(max(disk_rates), 1000) if disk_rates else None,
+        'disk_read_bytes_per_sec': rounded(engine.rate('disk_read_bytes')),
+        'disk_write_bytes_per_sec': rounded(engine.rate('disk_write_bytes')),
+        'network_io_mbps': rounded((rx + tx) if rx is not None and tx is not None else None, 8 / 1e6),
+        'network_rx_bytes_per_sec': rounded(rx),
+        'network_tx_bytes_per_sec': rounded(tx)
+    }
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Background Snapshot Collector
+OPENSEWAVE PgPool Admin Dashboard
+
+Gathers each dashboard data set once per interval into an in-memory, versioned snapshot,
+so database load does not grow with the number of open dashboards. Slow data sets (backend
+fan-outs, insight runs) collect on their own workers so they never delay the fast ones.
+"""
+
+import time
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotCollector:
+    def __init__(self, context_factory: Optional[Callable[[], Any]] = None, max_workers: int = 4,
+                 slow_workers: int = 2, idle_timeout: float = 120):
+        # context_factory wraps each collection, e.g. Flask's app.app_context
+        self.context_factory = context_factory
+        self.idle_timeout = idle_timeout
+        self.datasets: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='snapshot')
+        self.slow_executor = ThreadPoolExecutor(max_workers=slow_workers, thread_name_prefix='snapshot-slow')
+        self.running = False
+        self.thread = None
+
+    def register(self, name: str, collect: Callable[[], Any], interval: float, slow: bool = False):
+        """Register a data set; SNAPSHOT_<NAME>_INTERVAL overrides its refresh interval.
+        slow data sets run on the separate slow executor."""
+        interval = float(os.environ.get(f'SNAPSHOT_{name.upper()}_INTERVAL', interval))
+        self.datasets[name] = {
+            'collect': collect,
+            'interval': interval,
+            'slow': slow,
+            'version': 0,
+            'digest': None,
+            'data': None,
+            'error': None,
+            'collected_at': None,
+            'duration_ms': 0,
+            'next_due': 0.0,
+            'last_read': 0.0,
+            'in_flight': None
+        }
+
+    def collect(self, name: str):
+        """Run one collection and publish it, bumping the version only when the data changed"""
+        dataset = self.datasets[name]
+        start_time = time.time()
+        data, error = None, None
+        try:
+            if self.context_factory:
+                with self.context_factory():
+                    data = dataset['collect']()
+            else:
+                data = dataset['collect']()
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Snapshot collection for {name} failed: {error}")
+
+        digest = None
+        if error is None:
+            digest = hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+        with self.changed:
+            if error != dataset['error'] or (error is None and digest != dataset['digest']):
+                dataset['version'] += 1
+            if error is None:
+                dataset['digest'] = digest
+            dataset['data'] = data if error is None else dataset['data']
+            dataset['error'] = error
+            dataset['collected_at'] = datetime.utcnow().isoformat()
+            dataset['duration_ms'] = int((time.time() - start_time) * 1000)
+            dataset['next_due'] = time.time() + dataset['interval']
+            dataset['in_flight'] = None
+            self.changed.notify_all()
+
+    def schedule(self, name: str):
+        """Start a collection in the background unless one is already running"""
+        with self.lock:
+            dataset = self.datasets[name]
+            if dataset['in_flight'] is None:
+                executor = self.slow_executor if dataset['slow'] else self.executor
+                dataset['in_flight'] = executor.submit(self.collect, name)
+            return dataset['in_flight']
+
+    def refresh(self, name: str):
+        """Mark a data set as read and start a collection if it is due; returns the pending one or None"""
+        if not self.running:
+            self.start()
+        dataset = self.datasets[name]
+        dataset['last_read'] = time.time()
+
+        # Data sets nobody watched for a while are not refreshed; catch up on demand
+        if dataset['collected_at'] is None or time.time() >= dataset['next_due']:
+            return self.schedule(name)
+        return None
+
+    def get(self, name: str, timeout: float = 30) -> Dict[str, Any]:
+        """Latest snapshot of a data set; the first read waits for an initial collection"""
+        future = self.refresh(name)
+        if future is not None and self.datasets[name]['collected_at'] is None:
+            future.result(timeout=timeout)
+        return self.snapshot(name)
+
+    def get_many(self, names: List[str], timeout: float = 30) -> Dict[str, Dict[str, Any]]:
+        """Snapshots of several data sets, running any initial collections concurrently"""
+        futures = {name: self.refresh(name) for name in names}
+        deadline = time.time() + timeout
+        for name, future in futures.items():
+            if future is not None and self.datasets[name]['collected_at'] is None:
+                future.result(timeout=max(0, deadline - time.time()))
+        return {name: self.snapshot(name) for name in names}
+
+    def wait_for_change(self, known: Dict[str, int], timeout: float) -> List[str]:
+        """Block until any data set moves past its known version; returns the changed names"""
+        def changed():
+            return [name for name, version in known.items() if self.datasets[name]['version'] != version]
+
+        with self.changed:
+            self.changed.wait_for(changed, timeout)
+            return changed()
+
+    def snapshot(self, name: str) -> Dict[str, Any]:
+        with self.lock:
+            dataset = self.datasets[name]
+            return {
+                'name': name,
+                'version': dataset['version'],
+                'digest': dataset['digest'],
+                'data': dataset['data'],
+                'error': dataset['error'],
+                'collected_at': dataset['collected_at'],
+                'duration_ms': dataset['duration_ms']
+            }
+
+    def start(self):
+        """Refresh every recently read data set in the background"""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+
+        def collector_loop():
+            while self.running:
+                now = time.time()
+                for name, dataset in self.datasets.items():
+                    watched = now - dataset['last_read'] < self.idle_timeout
+                    if watched and now >= dataset['next_due'] and dataset['in_flight'] is None:
+                        self.schedule(name)
+                time.sleep(0.5)
+
+        self.thread = threading.Thread(target=collector_loop, name='snapshot-collector', daemon=True)
+        self.thread.start()
+        logger.info(f"Snapshot collector started for {len(self.datasets)} data sets")
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [{
+                'name': name,
+                'interval': dataset['interval'],
+                'slow': dataset['slow'],
+                'version': dataset['version'],
+                'collected_at': dataset['collected_at'],
+                'duration_ms': dataset['duration_ms'],
+                'error': dataset['error'],
+                'watched': time.time() - dataset['last_read'] < self.idle_timeout
+            } for name, dataset in self.datasets.items()]
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Statement History
+OPENSEWAVE PgPool Admin Dashboard
+
+Periodically snapshots pg_stat_statements counters per queryid and keeps only the increase
+between consecutive snapshots, packed into arrays. Top queries over any recent window or
+custom time range are aggregated from these stored deltas without touching the database.
+"""
+
+import re
+import time
+import heapq
+import threading
+from array import array
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cumulative pg_stat_statements counters tracked per queryid, in storage order
+COUNTERS = ('calls', 'total_exec_time', 'rows', 'shared_blks_hit', 'shared_blks_read')
+WIDTH = len(COUNTERS)
+
+WINDOW_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_window(value: str) -> float:
+    """Window length in seconds from '300', '5m', '1h' or '2d'"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*', str(value))
+    if not match:
+        raise ValueError(f"Invalid window: {value}")
+    return float(match.group(1)) * WINDOW_UNITS[match.group(2) or 's']
+
+
+def parse_time(value: str) -> float:
+    """Epoch seconds from a number or an ISO 8601 timestamp"""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+class StatementHistory:
+    def __init__(self, sampler: Callable[[], Iterable[Dict[str, Any]]], interval: float = 60,
+                 retention: float = 21600):
+        # sampler returns one row per queryid with the query text and the COUNTERS columns
+        self.sampler = sampler
+        self.interval = interval
+        self.retention = retention
+        # Ring buffer of (start, end, queryids, deltas): deltas holds WIDTH values per queryid
+        self.intervals = deque(maxlen=max(1, int(retention // interval)))
+        self.previous: Dict[int, tuple] = {}
+        self.previous_at = None
+        self.texts: Dict[int, str] = {}
+        self.resets = 0
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+    def record(self, rows: Iterable[Dict[str, Any]], now: Optional[float] = None):
+        """Store the increase of every statement that ran since the previous snapshot"""
+        now = time.time() if now is None else now
+        current = {}
+        texts = {}
+        for row in rows:
+            queryid = row['queryid']
+            if queryid is None:
+                continue
+            current[queryid] = tuple(float(row[name] or 0) for name in COUNTERS)
+            texts[queryid] = row.get('query')
+
+        queryids, deltas = array('q'), array('d')
+        resets = 0
+        # The first snapshot only sets the baseline
+        for queryid, values in (current.items() if self.previous_at is not None else ()):
+            previous = self.previous.get(queryid)
+            if previous is None:
+                # New since the previous snapshot, so all of its counts fall in this interval
+                step = values
+            elif values[0] < previous[0]:
+                # Entry was reset or evicted and re-added; it restarted from 0
+                resets += 1
+                step = values
+            else:
+                step = tuple(max(0.0, value - before) for value, before in zip(values, previous))
+            if step[0] > 0:
+                queryids.append(queryid)
+                deltas.extend(step)
+
+        with self.lock:
+            if self.previous_at is not None:
+                self.intervals.append((self.previous_at, now, queryids, deltas))
+            self.previous = current
+            self.previous_at = now
+            self.texts.update(texts)
+            self.resets += resets
+            # Forget texts of statements that no longer appear and have aged out of the buffer
+            if len(self.texts) > 2 * len(current):
+                retained = set(current)
+                for _, _, ids, _ in self.intervals:
+                    retained.update(ids)
+                self.texts = {queryid: text for queryid, text in self.texts.items() if queryid in retained}
+
+    def sample(self):
+        try:
+            self.record(self.sampler())
+        except Exception as e:
+            logger.error(f"Error sampling pg_stat_statements: {e}")
+
+    def aggregate(self, start: float, end: float):
+        """Summed deltas per queryid over the stored intervals ending within (start, end]"""
+        with self.lock:
+            selected = [entry for entry in self.intervals if start < entry[1] <= end]
+        totals: Dict[int, List[float]] = {}
+        for _, _, queryids, deltas in selected:
+            # Unrolled over the COUNTERS columns; this loop dominates wide windows
+            columns = [deltas[position::WIDTH] for position in range(WIDTH)]
+            for queryid, calls, total_time, rows, hits, reads in zip(queryids, *columns):
+                total = totals.get(queryid)
+                if total is None:
+                    totals[queryid] = [calls, total_time, rows, hits, reads]
+                else:
+                    total[0] += calls
+                    total[1] += total_time
+                    total[2] += rows
+                    total[3] += hits
+                    total[4] += reads
+        covered = (selected[0][0], selected[-1][1]) if selected else (None, None)
+        return totals, covered
+
+    def top(self, window: Optional[float] = None, start: Optional[float] = None, end: Optional[float] = None,
+            order_by: str = 'total_exec_time', limit: int = 20) -> Dict[str, Any]:
+        """Top statements by a counter (or mean_exec_time / calls_per_sec) over a window or time range"""
+        end = time.time() if end is None else end
+        if start is None:
+            start = end - (window if window is not None else self.interval)
+
+        totals, (covered_start, covered_end) = self.aggregate(start, end)
+        elapsed = (covered_end - covered_start) if covered_start is not None else 0
+
+        def metrics(values):
+            calls, total_time, rows, hits, reads = values
+            return {
+                'calls': int(calls),
+                'calls_per_sec': round(calls / elapsed, 3) if elapsed else None,
+                'total_exec_time': round(total_time, 3),
+                'mean_exec_time': round(total_time / calls, 3) if calls else None,
+                'rows': int(rows),
+                'shared_blks_hit': int(hits),
+                'shared_blks_read': int(reads),
+                'cache_hit_ratio': round(hits / (hits + reads) * 100, 2) if hits + reads else None
+            }
+
+        if order_by in COUNTERS:
+            position = COUNTERS.index(order_by)
+            key = lambda item: item[1][position]
+        elif order_by == 'mean_exec_time':
+            key = lambda item: item[1][1] / item[1][0] if item[1][0] else 0
+        elif order_by == 'calls_per_sec':
+            key = lambda item: item[1][0]
+        else:
+            raise ValueError(f"Cannot order by {order_by}")
+
+        with self.lock:
+            texts = self.texts
+        queries = []
+        for queryid, values in heapq.nlargest(limit, totals.items(), key=key):
+            queries.append({'queryid': queryid, 'query': texts.get(queryid), **metrics(values)})
+
+        return {
+            'start': datetime.fromtimestamp(covered_start).isoformat() if covered_start is not None else None,
+            'end': datetime.fromtimestamp(covered_end).isoformat() if covered_end is not None else None,
+            'seconds': round(elapsed, 1),
+            'order_by': order_by,
+            'statements': len(totals),
+            'totals': metrics([sum(values[position] for values in totals.values()) for position in range(WIDTH)]),
+            'queries': queries
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'interval': self.interval,
+                'retention': self.retention,
+                'intervals': len(self.intervals),
+                'stored_deltas': sum(len(entry[2]) for entry in self.intervals),
+                'tracked_statements': len(self.previous),
+                'oldest': datetime.fromtimestamp(self.intervals[0][0]).isoformat() if self.intervals else None,
+                'resets': self.resets
+            }
+
+    def start(self):
+        """Snapshot pg_stat_statements at a fixed cadence in the background"""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+
+        def sample_loop():
+            next_run = time.monotonic()
+            while self.running:
+                self.sample()
+                next_run = max(next_run + self.interval, time.monotonic())
+                time.sleep(max(0, next_run - time.monotonic()))
+
+        self.thread = threading.Thread(target=sample_loop, name='statement-history', daemon=True)
+        self.thread.start()
+        logger.info(f"Statement history started with a {self.interval}s snapshot interval")
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=5)
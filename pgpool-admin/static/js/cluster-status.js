@@ -6,9 +6,10 @@ class ClusterStatusMonitor {
         this.charts = {};
         this.currentTimeRange = 1; // hours
         this.currentEventFilter = 'all';
-        this.updateInterval = 30000; // 30 seconds
+        this.updateInterval = 30000; // 30 seconds between history reloads
         this.monitoring = false;
-        this.monitoringInterval = null;
+        this.updateStream = null;
+        this.historyLoadedAt = 0;
     }
 
     async initialize() {
@@ -17,13 +18,10 @@ class ClusterStatusMonitor {
         // Initialize charts
         this.initializeCharts();
         
-        // Load initial data
-        await this.loadClusterStatus();
-        
         // Setup event listeners
         this.setupEventListeners();
         
-        // Start monitoring
+        // Start monitoring; the stream delivers the initial status as well
         this.startMonitoring();
     }
 
@@ -142,21 +140,24 @@ class ClusterStatusMonitor {
             }
             
             const data = await response.json();
-            
-            if (data.status === 'success') {
-                this.updateClusterOverview(data.data);
-                this.updateComponentsGrid(data.data.components);
-                this.updateRecentEvents(data.data.recent_events);
-                this.updateLastCheckTime(data.data.summary.last_check);
-            } else {
-                throw new Error(data.message || 'Failed to load cluster status');
-            }
+            this.renderClusterStatus(data);
         } catch (error) {
             console.error('Failed to load cluster status:', error);
             this.showNotification('Failed to load cluster status', 'error');
         }
     }
 
+    renderClusterStatus(data) {
+        if (data.status !== 'success') {
+            throw new Error(data.message || 'Failed to load cluster status');
+        }
+        
+        this.updateClusterOverview(data.data);
+        this.updateComponentsGrid(data.data.components);
+        this.updateRecentEvents(data.data.recent_events);
+        this.updateLastCheckTime(data.data.summary.last_check);
+    }
+
     updateClusterOverview(data) {
         // Update health score
         const healthScore = Math.round(data.cluster_health);
@@ -253,6 +254,16 @@ class ClusterStatusMonitor {
                         <span class="metric-value">${component.metadata.is_in_recovery ? 'Replica' : 'Master'}</span>
                     </div>
                 ` : ''}
+                ${component.metadata.pool_node ? `
+                    <div class="component-metric">
+                        <span class="metric-label">PgPool Status:</span>
+                        <span class="metric-value">${component.metadata.pool_node.status} (weight ${component.metadata.pool_node.lb_weight})</span>
+                    </div>
+                    <div class="component-metric">
+                        <span class="metric-label">Replication Delay:</span>
+                        <span class="metric-value">${component.metadata.pool_node.replication_delay ?? 0}</span>
+                    </div>
+                ` : ''}
             </div>
             ${component.error_message ? `
                 <div class="component-error">
@@ -389,13 +400,15 @@ class ClusterStatusMonitor {
     }
 
     updateHistoricalCharts(historyData) {
-        // Process data for charts
+        // Process data for charts; backends are discovered from PgPool, so components come from the data
         const timePoints = [];
-        const componentData = {
-            'pg-master': { response_times: [], availability: 0 },
-            'pg-replica': { response_times: [], availability: 0 },
-            'pgpool': { response_times: [], availability: 0 }
-        };
+        const componentData = {};
+        historyData.forEach(record => {
+            if (!componentData[record.component]) {
+                componentData[record.component] = { response_times: [], availability: 0 };
+            }
+        });
+        const componentNames = Object.keys(componentData).sort();
         
         // Group data by timestamp
         const dataByTime = {};
@@ -411,7 +424,7 @@ class ClusterStatusMonitor {
         Object.entries(dataByTime).forEach(([timestamp, components]) => {
             timePoints.push(timestamp);
             
-            Object.keys(componentData).forEach(componentName => {
+            componentNames.forEach(componentName => {
                 const record = components[componentName];
                 if (record) {
                     componentData[componentName].response_times.push(record.response_time_ms);
@@ -422,28 +435,40 @@ class ClusterStatusMonitor {
         });
         
         // Update response time chart
+        const palette = ['#3b82f6', '#10b981', '#f59e0b', '#8b5cf6', '#ef4444', '#06b6d4', '#ec4899', '#84cc16'];
         const responseChart = this.charts.responseTime;
         responseChart.data.labels = timePoints.slice(-20); // Last 20 points
-        responseChart.data.datasets[0].data = componentData['pg-master'].response_times.slice(-20);
-        responseChart.data.datasets[1].data = componentData['pg-replica'].response_times.slice(-20);
-        responseChart.data.datasets[2].data = componentData['pgpool'].response_times.slice(-20);
+        responseChart.data.datasets = componentNames.map((componentName, index) => ({
+            label: componentName,
+            data: componentData[componentName].response_times.slice(-20),
+            borderColor: palette[index % palette.length],
+            backgroundColor: palette[index % palette.length] + '1a',
+            tension: 0.4,
+            fill: true
+        }));
         responseChart.update();
         
         // Calculate availability percentages
-        Object.keys(componentData).forEach((componentName, index) => {
+        componentNames.forEach(componentName => {
             const records = historyData.filter(r => r.component === componentName);
-            const onlineCount = records.filter(r => r.status === 'online').length;
-            const availability = records.length > 0 ? (onlineCount / records.length) * 100 : 100;
+            // Rolled-up points carry a sample count and up ratio; raw points count as one sample each
+            let samples = 0;
+            let onlineCount = 0;
+            records.forEach(r => {
+                const weight = r.samples || 1;
+                samples += weight;
+                onlineCount += r.up_ratio !== undefined ? r.up_ratio * weight : (r.status === 'online' ? weight : 0);
+            });
+            const availability = samples > 0 ? (onlineCount / samples) * 100 : 100;
             componentData[componentName].availability = Math.round(availability);
         });
         
         // Update availability chart
         const availabilityChart = this.charts.availability;
-        availabilityChart.data.datasets[0].data = [
-            componentData['pg-master'].availability,
-            componentData['pg-replica'].availability,
-            componentData['pgpool'].availability
-        ];
+        availabilityChart.data.labels = componentNames;
+        availabilityChart.data.datasets[0].data = componentNames.map(name => componentData[name].availability);
+        availabilityChart.data.datasets[0].backgroundColor = componentNames.map((_, index) => palette[index % palette.length]);
+        availabilityChart.data.datasets[0].borderColor = componentNames.map((_, index) => palette[index % palette.length]);
         availabilityChart.update();
     }
 
@@ -576,10 +601,20 @@ class ClusterStatusMonitor {
         if (this.monitoring) return;
         
         this.monitoring = true;
-        this.monitoringInterval = setInterval(() => {
-            this.loadClusterStatus();
-            this.loadHistoricalData(this.currentTimeRange);
-        }, this.updateInterval);
+        // Status is pushed on every change; history charts reload at most once per updateInterval
+        this.updateStream = subscribeStream(['cluster_status'], latest => {
+            try {
+                this.renderClusterStatus(latest.cluster_status);
+            } catch (error) {
+                console.error('Failed to load cluster status:', error);
+                this.showNotification('Failed to load cluster status', 'error');
+            }
+            
+            if (Date.now() - this.historyLoadedAt >= this.updateInterval) {
+                this.historyLoadedAt = Date.now();
+                this.loadHistoricalData(this.currentTimeRange);
+            }
+        });
         
         console.log('Cluster status monitoring started');
     }
@@ -588,9 +623,9 @@ class ClusterStatusMonitor {
         if (!this.monitoring) return;
         
         this.monitoring = false;
-        if (this.monitoringInterval) {
-            clearInterval(this.monitoringInterval);
-            this.monitoringInterval = null;
+        if (this.updateStream) {
+            this.updateStream.close();
+            this.updateStream = null;
         }
         
         console.log('Cluster status monitoring stopped');
@@ -36,19 +36,64 @@ function truncateText(text, maxLength = 50) {
 }
 
 // API helper functions
+
+// Last response per endpoint with its ETag, reused when the server answers 304 Not Modified
+const apiResponseCache = new Map();
+
 async function fetchAPI(endpoint) {
     try {
-        const response = await fetch(endpoint);
+        const cached = apiResponseCache.get(endpoint);
+        const headers = cached ? { 'If-None-Match': cached.etag } : {};
+        const response = await fetch(endpoint, { headers });
+        if (response.status === 304 && cached) {
+            return cached.data;
+        }
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
-        return await response.json();
+        
+        const data = await response.json();
+        const etag = response.headers.get('ETag');
+        if (etag) {
+            apiResponseCache.set(endpoint, { etag, data });
+        } else {
+            apiResponseCache.delete(endpoint);
+        }
+        return data;
     } catch (error) {
         console.error('API fetch error:', error);
         throw error;
     }
 }
 
+// Subscribe to server-pushed updates for the given topics (see /api/stream).
+// onUpdate receives the latest payload per topic, once per burst of changes,
+// and only after every topic has delivered its first snapshot.
+function subscribeStream(topics, onUpdate) {
+    const latest = {};
+    let renderTimer = null;
+    const source = new EventSource(`/api/stream?topics=${topics.join(',')}`);
+
+    topics.forEach(topic => {
+        source.addEventListener(topic, event => {
+            latest[topic] = JSON.parse(event.data);
+            clearTimeout(renderTimer);
+            renderTimer = setTimeout(() => {
+                if (!topics.every(name => latest[name])) return;
+                try {
+                    onUpdate(latest);
+                } catch (error) {
+                    console.error('Stream update error:', error);
+                }
+            }, 50);
+        });
+    });
+
+    // EventSource reconnects on its own after network errors
+    source.onerror = () => console.warn('Update stream interrupted, reconnecting...');
+    return source;
+}
+
 // Chart.js default configuration
 Chart.defaults.color = '#94a3b8';
 Chart.defaults.borderColor = '#334155';
@@ -75,11 +75,12 @@ async function executeQuery() {
         const databaseSelect = document.getElementById('databaseSelect');
         const selectedDatabase = databaseSelect ? databaseSelect.value : 'pgpool';
         
-        // Send query to backend
+        // Send query to backend; results stream back as NDJSON and render as they arrive
         const response = await fetch('/api/execute_query', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'Accept': 'application/x-ndjson'
             },
             body: JSON.stringify({ 
                 query: query,
@@ -87,11 +88,14 @@ async function executeQuery() {
             })
         });
         
+        const contentType = response.headers.get('Content-Type') || '';
+        const result = contentType.includes('application/x-ndjson')
+            ? await readResultStream(response)
+            : await response.json();
+        
         const endTime = Date.now();
         const executionTime = endTime - startTime;
         
-        const result = await response.json();
-        
         if (result.status === 'success') {
             // Display results
             displayResults(result.data, executionTime);
@@ -123,6 +127,56 @@ async function executeQuery() {
     }
 }
 
+// Read an NDJSON result stream, appending each chunk of rows to the table as it arrives
+async function readResultStream(response) {
+    const resultsContent = document.getElementById('resultsContent');
+    const resultCount = document.getElementById('resultCount');
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const data = { columns: null, row_count: 0 };
+    let tbody = null;
+    let buffer = '';
+    
+    const handleEvent = event => {
+        if (event.type === 'columns') {
+            data.columns = event.columns;
+            const table = createResultsTable(event.columns, []);
+            tbody = table.querySelector('tbody');
+            resultsContent.innerHTML = '';
+            resultsContent.appendChild(table);
+        } else if (event.type === 'rows') {
+            appendResultRows(tbody, data.columns, event.rows);
+            data.row_count += event.rows.length;
+            if (resultCount) {
+                resultCount.textContent = `${formatNumber(data.row_count)} rows...`;
+            }
+        } else if (event.type === 'end') {
+            Object.assign(data, event);
+        } else if (event.type === 'error') {
+            throw new Error(event.message);
+        }
+    };
+    
+    try {
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.filter(line => line.trim()).forEach(line => handleEvent(JSON.parse(line)));
+        }
+        if (buffer.trim()) {
+            handleEvent(JSON.parse(buffer));
+        }
+    } catch (error) {
+        reader.cancel();
+        return { status: 'error', message: error.message };
+    }
+    
+    return { status: 'success', data: data };
+}
+
 // Display query results
 function displayResults(data, executionTime) {
     const resultsContent = document.getElementById('resultsContent');
@@ -150,6 +204,11 @@ function displayResults(data, executionTime) {
     // Update result count and show export button
     if (resultCount) {
         resultCount.textContent = data.row_count ? `${data.row_count} rows` : 'Query completed';
+        if (data.truncated) {
+            const limit = data.truncated_reason === 'byte_limit' ? 'size' : 'row';
+            resultCount.textContent += ` (stopped at the ${limit} limit)`;
+            showNotification(`Result truncated at the ${limit} limit; add a LIMIT or narrower filter`, 'warning');
+        }
         resultCount.className = 'result-count-badge';
     }
     
@@ -164,6 +223,8 @@ function displayResults(data, executionTime) {
         const table = createResultsTable(data.columns, data.rows);
         resultsContent.innerHTML = '';
         resultsContent.appendChild(table);
+    } else if (data.columns) {
+        // Streamed results are already in the table
     } else {
         // Display success message
         resultsContent.innerHTML = `
@@ -218,6 +279,17 @@ function createResultsTable(columns, rows) {
     
     // Create body
     const tbody = document.createElement('tbody');
+    appendResultRows(tbody, columns, rows);
+    
+    table.appendChild(tbody);
+    tableContainer.appendChild(table);
+    
+    return tableContainer;
+}
+
+// Append rows to a results table body in one DOM update
+function appendResultRows(tbody, columns, rows) {
+    const fragment = document.createDocumentFragment();
     
     rows.forEach(row => {
         const tr = document.createElement('tr');
@@ -237,13 +309,10 @@ function createResultsTable(columns, rows) {
             tr.appendChild(td);
         });
         
-        tbody.appendChild(tr);
+        fragment.appendChild(tr);
     });
     
-    table.appendChild(tbody);
-    tableContainer.appendChild(table);
-    
-    return tableContainer;
+    tbody.appendChild(fragment);
 }
 
 // Detect query type
@@ -1,7 +1,7 @@
 // Dashboard page JavaScript - Enterprise Edition
 
 let performanceChart;
-let updateInterval;
+let updateStream;
 let timeRange = '1h';
 
 // Initialize dashboard
@@ -11,11 +11,13 @@ async function initDashboard() {
     initPerformanceChart();
     initActivityHeatmap();
     
-    // Load initial data
-    await updateDashboard();
-    
-    // Start auto-refresh
-    updateInterval = setInterval(updateDashboard, 5000);
+    // Live updates: the server pushes pool snapshots whenever they change
+    updateStream = subscribeStream(['pool_nodes', 'pool_processes'], latest => {
+        renderDashboard({
+            pool_nodes: latest.pool_nodes.data,
+            pool_processes: latest.pool_processes.data
+        });
+    });
     
     // Initialize sparkline
     initSparkline();
@@ -184,19 +186,23 @@ async function updateDashboard() {
         const response = await fetch('/api/stats');
         const stats = await response.json();
         
-        // Update all components
-        updateMetrics(stats);
-        updateCharts(stats);
-        updateTopology(stats);
-        updateResources();
-        updateAlerts();
-        updateActivityHeatmap();
+        renderDashboard(stats);
         
     } catch (error) {
         console.error('Failed to update dashboard:', error);
     }
 }
 
+// Render all components from combined pool stats
+function renderDashboard(stats) {
+    updateMetrics(stats);
+    updateCharts(stats);
+    updateTopology(stats);
+    updateResources();
+    updateAlerts();
+    updateActivityHeatmap();
+}
+
 // Update metric cards
 function updateMetrics(stats) {
     // Update cluster uptime
@@ -438,8 +444,8 @@ function showNotification(message, type = 'info') {
 
 // Cleanup on page unload
 window.addEventListener('beforeunload', () => {
-    if (updateInterval) {
-        clearInterval(updateInterval);
+    if (updateStream) {
+        updateStream.close();
     }
 });
 
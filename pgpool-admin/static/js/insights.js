@@ -1,18 +1,17 @@
 // Performance Insights page JavaScript
 
 let insightCharts = {};
-let updateInterval;
+let updateStream;
 
 // Initialize insights page
 async function initInsights() {
     // Initialize charts
     initInsightCharts();
     
-    // Load initial data
-    await updateInsightsData();
-    
-    // Start auto-refresh
-    updateInterval = setInterval(updateInsightsData, 15000);
+    // Live updates: the server pushes each data set whenever it changes
+    updateStream = subscribeStream(['performance_insights', 'query_statistics', 'database_statistics'], latest => {
+        renderInsightsData(latest.performance_insights, latest.query_statistics, latest.database_statistics);
+    });
 }
 
 // Initialize charts
@@ -106,35 +105,31 @@ function initInsightCharts() {
     }
 }
 
-// Update insights data
-async function updateInsightsData() {
-    try {
-        // Fetch multiple data sources
-        const [performanceInsights, queryStats, dbStats] = await Promise.all([
-            fetchAPI('/api/performance_insights'),
-            fetchAPI('/api/query_statistics'),
-            fetchAPI('/api/database_statistics')
-        ]);
-        
-        // Update metrics
-        updateInsightMetrics(performanceInsights.data || []);
-        
-        // Update issues
-        updatePerformanceIssues(performanceInsights.data || []);
-        
-        // Update optimization table
-        updateOptimizationTable(queryStats.data);
-        
-        // Update charts
-        updateInsightCharts();
-        
-        // Update recommendations
-        updateRecommendations(performanceInsights.data || []);
-        
-    } catch (error) {
-        console.error('Failed to update insights data:', error);
-        showNotification('Failed to update insights data', 'error');
+// Render insights from API responses
+function renderInsightsData(performanceInsights, queryStats, dbStats) {
+    // Checks that failed or timed out are left out; the rest still render
+    const insights = performanceInsights.data ? performanceInsights.data.insights : [];
+    if (performanceInsights.data && performanceInsights.data.partial) {
+        const failed = Object.entries(performanceInsights.data.checks)
+            .filter(([, check]) => check.status !== 'ok')
+            .map(([name, check]) => `${name} (${check.status})`);
+        console.warn('Some insight checks did not complete:', failed.join(', '));
     }
+    
+    // Update metrics
+    updateInsightMetrics(insights);
+    
+    // Update issues
+    updatePerformanceIssues(insights);
+    
+    // Update optimization table
+    updateOptimizationTable(queryStats.data);
+    
+    // Update charts
+    updateInsightCharts();
+    
+    // Update recommendations
+    updateRecommendations(insights);
 }
 
 // Update insight metrics
@@ -455,8 +450,8 @@ function executeRecommendation(id) {
 
 // Cleanup on page unload
 window.addEventListener('beforeunload', () => {
-    if (updateInterval) {
-        clearInterval(updateInterval);
+    if (updateStream) {
+        updateStream.close();
     }
 });
 
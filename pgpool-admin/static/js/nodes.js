@@ -1,6 +1,6 @@
 // Pool Nodes Management JavaScript
 let nodeCharts = {};
-let autoRefreshInterval;
+let autoRefreshStream;
 let autoRefreshEnabled = true;
 
 // Initialize page
@@ -8,10 +8,7 @@ async function initNodes() {
     // Initialize charts
     initNodeCharts();
     
-    // Load initial data
-    await refreshNodeData();
-    
-    // Start auto-refresh
+    // Start auto-refresh; the stream delivers the initial data as well
     startAutoRefresh();
     
     // Setup event listeners
@@ -135,34 +132,10 @@ async function refreshNodeData() {
         // Show loading state
         updateLoadingState(true);
         
-        // Fetch node status
-        const [nodesResponse, processesResponse, statsResponse] = await Promise.all([
-            fetch('/api/pool_nodes'),
-            fetch('/api/pool_processes'),
-            fetch('/api/stats')
-        ]);
-
-        const nodesData = await nodesResponse.json();
-        const processesData = await processesResponse.json();
-        const statsData = await statsResponse.json();
-
-        // Update metrics
-        updateMetrics(nodesData, processesData, statsData);
-        
-        // Update node cards
-        updateNodeCards(nodesData);
-        
-        // Update charts
-        updateCharts(nodesData, statsData);
-        
-        // Update processes table
-        updateProcessesTable(processesData);
-        
-        // Update last update time
-        document.getElementById('lastUpdateTime').textContent = 'Just now';
-        
-        // Hide loading state
-        updateLoadingState(false);
+        // Fetch node status in one round trip
+        const batch = await fetchAPI('/api/batch?r=pool_nodes,pool_processes,stats');
+
+        renderNodeData(batch.data.pool_nodes, batch.data.pool_processes, batch.data.stats);
         
     } catch (error) {
         console.error('Failed to refresh node data:', error);
@@ -170,6 +143,27 @@ async function refreshNodeData() {
     }
 }
 
+// Render node data from API responses
+function renderNodeData(nodesData, processesData, statsData) {
+    // Update metrics
+    updateMetrics(nodesData, processesData, statsData);
+    
+    // Update node cards
+    updateNodeCards(nodesData);
+    
+    // Update charts
+    updateCharts(nodesData, statsData);
+    
+    // Update processes table
+    updateProcessesTable(processesData);
+    
+    // Update last update time
+    document.getElementById('lastUpdateTime').textContent = 'Just now';
+    
+    // Hide loading state
+    updateLoadingState(false);
+}
+
 // Update metrics dashboard
 function updateMetrics(nodesData, processesData, statsData) {
     // Total nodes
@@ -394,20 +388,24 @@ function toggleAutoRefresh() {
 
 // Start auto-refresh
 function startAutoRefresh() {
-    if (autoRefreshInterval) {
-        clearInterval(autoRefreshInterval);
-    }
+    stopAutoRefresh();
     
     if (autoRefreshEnabled) {
-        autoRefreshInterval = setInterval(refreshNodeData, 5000);
+        // Server pushes pool snapshots whenever they change
+        autoRefreshStream = subscribeStream(['pool_nodes', 'pool_processes'], latest => {
+            renderNodeData(latest.pool_nodes, latest.pool_processes, {
+                pool_nodes: latest.pool_nodes.data,
+                pool_processes: latest.pool_processes.data
+            });
+        });
     }
 }
 
 // Stop auto-refresh
 function stopAutoRefresh() {
-    if (autoRefreshInterval) {
-        clearInterval(autoRefreshInterval);
-        autoRefreshInterval = null;
+    if (autoRefreshStream) {
+        autoRefreshStream.close();
+        autoRefreshStream = null;
     }
 }
 
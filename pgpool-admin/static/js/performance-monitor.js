@@ -6,7 +6,7 @@ class PerformanceMonitor {
         this.charts = {};
         this.metrics = {};
         this.alerts = [];
-        this.updateInterval = 5000; // 5 seconds
+        this.updateStream = null;
         this.historyLimit = 100;
         this.thresholds = {
             cpu: { warning: 70, critical: 90 },
@@ -26,12 +26,8 @@ class PerformanceMonitor {
         this.initializeCharts();
         this.initializeMetrics();
         this.initializeAlerts();
-        this.initializeWebSocket();
         
-        // Load initial data
-        await this.loadDashboardData();
-        
-        // Start monitoring
+        // Start monitoring; the stream delivers the initial data as well
         this.startMonitoring();
         
         // Setup event listeners
@@ -320,31 +316,18 @@ class PerformanceMonitor {
         this.alertContainer = document.getElementById('performanceAlerts');
     }
 
-    initializeWebSocket() {
-        // In production, use WebSocket for real-time updates
-        // For now, we'll use polling
-        console.log('WebSocket initialization skipped - using polling');
-    }
-
     async loadDashboardData() {
         try {
-            // Fetch comprehensive performance metrics
-            const metricsResponse = await this.fetchAPI('/api/performance_metrics');
+            // Fetch metrics and pool data in one round trip
+            const batch = await this.fetchAPI('/api/batch?r=performance_metrics,stats,pool_processes');
+            const metricsResponse = batch && batch.data.performance_metrics;
             
             if (metricsResponse && metricsResponse.status === 'success') {
-                const metrics = metricsResponse.data;
-                
-                // Also fetch additional data for completeness
-                const [stats, poolProcesses] = await Promise.all([
-                    this.fetchAPI('/api/stats'),
-                    this.fetchAPI('/api/pool_processes')
-                ]);
-                
                 // Process all data
                 this.processPerformanceData({
-                    metrics,
-                    stats,
-                    poolProcesses
+                    metrics: metricsResponse.data,
+                    stats: batch.data.stats,
+                    poolProcesses: batch.data.pool_processes
                 });
             } else {
                 throw new Error('Failed to fetch performance metrics');
@@ -357,13 +340,9 @@ class PerformanceMonitor {
     }
 
     async fetchAPI(endpoint) {
+        // Shares the conditional GET cache of the common fetchAPI helper
         try {
-            const response = await fetch(endpoint);
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            const data = await response.json();
-            return data;
+            return await fetchAPI(endpoint);
         } catch (error) {
             console.error(`API fetch error for ${endpoint}:`, error);
             return null;
@@ -440,9 +419,12 @@ class PerformanceMonitor {
             // Process resource utilization
             if (metrics.resources) {
                 const resources = metrics.resources;
-                const cpu = Math.round(resources.cpu_percent);
-                const memory = Math.round(resources.memory_percent);
-                const diskIO = Math.round(resources.disk_io_percent);
+                // Readings the collector could not take arrive as null; keep them null
+                // so they show as N/A and leave a gap in the chart instead of 0%.
+                const round = value => (value === null || value === undefined) ? null : Math.round(value);
+                const cpu = round(resources.cpu_percent);
+                const memory = round(resources.memory_percent);
+                const diskIO = round(resources.disk_io_percent);
                 
                 this.updateResourceChart(timestamp, cpu, memory, diskIO);
                 this.updateMetric('cpuUsage', cpu);
@@ -468,6 +450,10 @@ class PerformanceMonitor {
             if (metrics.summary) {
                 const summary = metrics.summary;
                 this.updateMetric('qps', summary.queries_per_second);
+                this.updateMetric('qps5m', summary.queries_per_second_5m);
+                this.updateMetric('tps', summary.transactions_per_second);
+                this.updateMetric('rowsRead', summary.rows_read_per_second);
+                this.updateMetric('rowsWritten', summary.rows_written_per_second);
                 this.updateMetric('totalQueries', summary.total_queries_today);
                 
                 // Update QPS chart
@@ -578,9 +564,11 @@ class PerformanceMonitor {
         this.metrics[name] = value;
         const element = document.getElementById(`metric-${name}`);
         if (element) {
-            if (name === 'avgResponseTime') {
+            if (value === null || value === undefined) {
+                element.textContent = 'N/A';
+            } else if (name === 'avgResponseTime') {
                 element.textContent = value + 'ms';
-            } else if (name === 'qps' || name === 'totalQueries') {
+            } else if (['qps', 'qps5m', 'tps', 'rowsRead', 'rowsWritten', 'totalQueries'].includes(name)) {
                 element.textContent = this.formatNumber(value);
             } else if (name === 'cacheHitRate' || name === 'cpuUsage' || name === 'memoryUsage') {
                 element.textContent = value + '%';
@@ -597,7 +585,7 @@ class PerformanceMonitor {
     updateResourceBar(resourceType, percentage) {
         const barElement = document.getElementById(`${resourceType}Bar`);
         if (barElement) {
-            barElement.style.width = percentage + '%';
+            barElement.style.width = (percentage === null ? 0 : percentage) + '%';
         }
     }
 
@@ -703,7 +691,7 @@ class PerformanceMonitor {
 
     checkThreshold(metric, value) {
         const threshold = this.thresholds[metric];
-        if (!threshold) return;
+        if (!threshold || value === null) return;
         
         let level = 'normal';
         let message = '';
@@ -782,14 +770,28 @@ class PerformanceMonitor {
     }
 
     startMonitoring() {
-        this.monitoringInterval = setInterval(() => {
-            this.loadDashboardData();
-        }, this.updateInterval);
+        // Server pushes each snapshot whenever it changes
+        this.updateStream = subscribeStream(['performance_metrics', 'pool_nodes', 'pool_processes'], latest => {
+            if (latest.performance_metrics.status !== 'success') {
+                this.showAlert('Failed to load performance data', 'error');
+                return;
+            }
+            
+            this.processPerformanceData({
+                metrics: latest.performance_metrics.data,
+                stats: {
+                    pool_nodes: latest.pool_nodes.data,
+                    pool_processes: latest.pool_processes.data
+                },
+                poolProcesses: latest.pool_processes
+            });
+        });
     }
 
     stopMonitoring() {
-        if (this.monitoringInterval) {
-            clearInterval(this.monitoringInterval);
+        if (this.updateStream) {
+            this.updateStream.close();
+            this.updateStream = null;
         }
     }
 
@@ -1,18 +1,17 @@
 // Query Analysis page JavaScript
 
 let queryCharts = {};
-let updateInterval;
+let updateStream;
 
 // Initialize queries page
 async function initQueries() {
     // Initialize charts
     initQueryCharts();
     
-    // Load initial data
-    await updateQueriesData();
-    
-    // Start auto-refresh
-    updateInterval = setInterval(updateQueriesData, 10000);
+    // Live updates: the server pushes query statistics whenever they change
+    updateStream = subscribeStream(['query_statistics'], latest => {
+        renderQueriesData(latest.query_statistics);
+    });
 }
 
 // Initialize charts
@@ -118,25 +117,21 @@ function initQueryCharts() {
     }
 }
 
-// Update queries data
-async function updateQueriesData() {
-    try {
-        // Fetch query statistics
-        const queryStats = await fetchAPI('/api/query_statistics');
-        
-        // Update metrics
-        updateQueryMetrics(queryStats.data);
-        
-        // Update tables
-        updateQueryTables(queryStats.data);
-        
-        // Update charts
-        updateQueryCharts(queryStats.data);
-        
-    } catch (error) {
-        console.error('Failed to update queries data:', error);
+// Render query statistics response
+function renderQueriesData(queryStats) {
+    if (queryStats.status !== 'success') {
         showNotification('Failed to update query data', 'error');
+        return;
     }
+    
+    // Update metrics
+    updateQueryMetrics(queryStats.data);
+    
+    // Update tables
+    updateQueryTables(queryStats.data);
+    
+    // Update charts
+    updateQueryCharts(queryStats.data);
 }
 
 // Update query metrics
@@ -383,8 +378,8 @@ document.addEventListener('DOMContentLoaded', () => {
 
 // Cleanup on page unload
 window.addEventListener('beforeunload', () => {
-    if (updateInterval) {
-        clearInterval(updateInterval);
+    if (updateStream) {
+        updateStream.close();
     }
 });
 
@@ -36,8 +36,17 @@ def test_api_endpoints(cookies):
         "/api/pool_processes",
         "/api/pool_pools",
         "/api/query_statistics",
+        "/api/query_statistics/window?window=1h",
         "/api/database_statistics",
         "/api/performance_insights",
+        "/api/cluster_query_statistics",
+        "/api/cluster_database_statistics",
+        "/api/cluster_performance_insights",
+        "/api/cluster_retention",
+        "/api/connection_pools",
+        "/api/snapshots",
+        "/api/query_cache",
+        "/api/batch?r=pool_nodes,pool_processes,stats",
         "/api/health_check"
     ]
     